@@ -4,32 +4,72 @@
 FastAPI のルーティング設定とエンドポイント定義を管理します。
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import FileResponse
+from typing import Any, Awaitable, Callable, Optional, Tuple
 
 from ..models.schemas import (
     Character,
+    CharacterListResponse,
+    CharacterQuery,
+    CharacterSearchResponse,
+    CharacterSort,
+    CalculationDetailLevel,
     DamageCalculationRequest,
     DamageCalculationResult,
+    BatchDamageCalculationRequest,
+    BatchDamageCalculationResult,
+    DamageSweepRequest,
+    DamageSweepResult,
+    BattleSimulationRequest,
+    BattleSimulationResult,
+    SweepJobRequest,
+    SweepJobStatus,
+    DamageCoefficientsResponse,
+    CacheStatsResponse,
+    ProfileInfoResponse,
+    ProfileListResponse,
     ApiError,
-    HealthCheckResponse
+    HealthCheckResponse,
+    ReadinessResponse
+)
+from ..services.damage_calculator import DamageCalculatorService, get_damage_calculator_service
+from ..services.character_service import CharacterService, get_character_service
+from ..services.character_index import InvalidCursorError
+from ..services.sweep_jobs import (
+    ChunkNotReadyError,
+    JobLimitError,
+    JobNotFoundError,
+    SweepJob,
+    SweepJobManager,
+    get_sweep_job_manager
 )
-from ..services.damage_calculator import DamageCalculatorService
-from ..services.character_service import CharacterService
+from ..services.warmup import WarmupState, get_warmup_state
+from ..core.admin import is_admin_authorized
 from ..core.config import get_settings, Settings
+from ..core.http_cache import (
+    encode_body,
+    encoded_response,
+    etag_matches,
+    get_response_cache,
+    make_etag,
+    not_modified_response
+)
+from ..core.json_response import FastJSONResponse, dumps
+from ..core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, MetricsRoute, cache_metrics
+from ..core.profiling import ProfileNotFoundError, ProfilingRoute, RequestProfiler, get_request_profiler
 
-# APIルーターの初期化
-api_router = APIRouter(prefix="/api", tags=["api"])
-
-# サービス依存関係の設定
-def get_damage_calculator_service() -> DamageCalculatorService:
-    """ダメージ計算サービスのインスタンスを取得"""
-    return DamageCalculatorService()
-
-def get_character_service() -> CharacterService:
-    """キャラクターサービスのインスタンスを取得"""
-    return CharacterService()
-
+# APIルーターの初期化（計算・カタログ系のレスポンスは orjson でシリアライズ）
+# 全てのルーターで MetricsRoute によりルートごとの処理時間・件数を計測する
+# API ルーターは ProfilingRoute により、選ばれたリクエストを cProfile で計測する
+api_router = APIRouter(
+    prefix="/api",
+    tags=["api"],
+    default_response_class=FastJSONResponse,
+    route_class=ProfilingRoute
+)
 
 @api_router.post(
     "/calculate-damage",
@@ -39,14 +79,22 @@ def get_character_service() -> CharacterService:
 )
 async def calculate_damage(
     request: DamageCalculationRequest,
+    detail: CalculationDetailLevel = Query(
+        "full",
+        description="結果の詳細度（none: ダメージのみ / summary: 修正値の概要 / full: パッシブスキル一覧と説明文を含む）"
+    ),
     calculator_service: DamageCalculatorService = Depends(get_damage_calculator_service),
     character_service: CharacterService = Depends(get_character_service)
 ) -> DamageCalculationResult:
     """
     ダメージ計算エンドポイント
     
+    結果は response_model による再検証を行わずに orjson で直接シリアライズします。
+    detail が full 未満の場合は値のない項目（null）を省略します。
+    
     Args:
         request: ダメージ計算リクエストデータ
+        detail: 結果の詳細度
         calculator_service: ダメージ計算サービス
         character_service: キャラクターサービス
         
@@ -70,8 +118,10 @@ async def calculate_damage(
             )
         
         # ダメージ計算の実行
-        result = await calculator_service.calculate_damage(request, character)
-        return result
+        result = await calculator_service.calculate_damage(
+            request, character, character_service.get_coefficients(character), detail
+        )
+        return FastJSONResponse(result.model_dump(exclude_none=detail != "full"))
         
     except HTTPException:
         raise
@@ -86,31 +136,357 @@ async def calculate_damage(
         )
 
 
-@api_router.get(
-    "/characters",
-    response_model=List[Character],
-    summary="キャラクター一覧取得",
-    description="利用可能なキャラクターの一覧を取得します"
+@api_router.post(
+    "/calculate-damage/batch",
+    response_model=BatchDamageCalculationResult,
+    summary="一括ダメージ計算",
+    description="複数のダメージ計算リクエストをまとめてベクトル化計算します"
 )
-async def get_characters(
-    character_service: CharacterService = Depends(get_character_service)
-) -> List[Character]:
+async def calculate_damage_batch(
+    request: BatchDamageCalculationRequest,
+    calculator_service: DamageCalculatorService = Depends(get_damage_calculator_service),
+    character_service: CharacterService = Depends(get_character_service),
+    settings: Settings = Depends(get_settings)
+) -> BatchDamageCalculationResult:
     """
-    キャラクター一覧取得エンドポイント
+    一括ダメージ計算エンドポイント
+    
+    Args:
+        request: 一括ダメージ計算リクエストデータ
+        calculator_service: ダメージ計算サービス
+        character_service: キャラクターサービス
+        settings: アプリケーション設定
+        
+    Returns:
+        BatchDamageCalculationResult: 各行の計算結果
+        
+    Raises:
+        HTTPException: 行数超過、キャラクターが見つからない場合や計算エラーの場合
+    """
+    if len(request.requests) > settings.batch_max_rows:
+        raise HTTPException(
+            status_code=413,
+            detail={
+                "code": "BATCH_TOO_LARGE",
+                "message": f"一括計算の行数が上限（{settings.batch_max_rows}件）を超えています",
+                "details": f"リクエスト行数: {len(request.requests)}"
+            }
+        )
+    
+    try:
+        # キャラクター情報の取得（重複IDは1回のみ）
+        coefficients = {}
+        missing_ids = []
+        for character_id in dict.fromkeys(row.character_id for row in request.requests):
+            character = await character_service.get_character(character_id)
+            if character:
+                coefficients[character_id] = character_service.get_coefficients(character)
+            else:
+                missing_ids.append(character_id)
+        
+        if missing_ids:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "code": "CHARACTER_NOT_FOUND",
+                    "message": f"キャラクターID {missing_ids} が見つかりません",
+                    "details": "有効なキャラクターIDを指定してください"
+                }
+            )
+        
+        # 一括ダメージ計算の実行
+        result = await calculator_service.calculate_damage_batch(request.requests, coefficients)
+        return FastJSONResponse(result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "code": "CALCULATION_ERROR",
+                "message": "一括ダメージ計算中にエラーが発生しました",
+                "details": str(e)
+            }
+        )
+
+
+@api_router.post(
+    "/calculate-damage/sweep",
+    response_model=DamageSweepResult,
+    responses={
+        200: {
+            "content": {"application/octet-stream": {}},
+            "description": "format=binary の場合は float32 リトルエンディアンのグリッドを返します"
+        }
+    },
+    summary="ダメージグリッドスイープ",
+    description="DEF × 敵攻撃値 × リーダースキル倍率のグリッド全体のダメージを一括計算します"
+)
+async def calculate_damage_sweep(
+    request: DamageSweepRequest,
+    calculator_service: DamageCalculatorService = Depends(get_damage_calculator_service),
+    character_service: CharacterService = Depends(get_character_service),
+    settings: Settings = Depends(get_settings)
+):
+    """
+    ダメージグリッドスイープエンドポイント
+    
+    format=binary の場合、グリッドを C 順（リーダースキル倍率, DEF, 敵攻撃値）の
+    float32 リトルエンディアン配列として返します。形状と軸の範囲は
+    X-Sweep-* レスポンスヘッダーで通知します。
+    
+    Args:
+        request: グリッドスイープリクエストデータ
+        calculator_service: ダメージ計算サービス
+        character_service: キャラクターサービス
+        settings: アプリケーション設定
+        
+    Returns:
+        Response | DamageSweepResult: バイナリまたは JSON のグリッド
+        
+    Raises:
+        HTTPException: グリッドが大きすぎる場合、キャラクターが見つからない場合や計算エラーの場合
+    """
+    shape = (
+        request.leader_skill_multiplier.count(),
+        request.def_stat.count(),
+        request.enemy_attack.count()
+    )
+    cells = shape[0] * shape[1] * shape[2]
+    max_cells = settings.sweep_json_max_cells if request.format == "json" else settings.sweep_max_cells
+    if cells > max_cells:
+        raise HTTPException(
+            status_code=413,
+            detail={
+                "code": "SWEEP_TOO_LARGE",
+                "message": f"グリッドのセル数が上限（{max_cells}）を超えています",
+                "details": f"形状: {shape}, セル数: {cells}"
+            }
+        )
+    
+    try:
+        character = await character_service.get_character(request.character_id)
+        if not character:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "code": "CHARACTER_NOT_FOUND",
+                    "message": f"キャラクターID '{request.character_id}' が見つかりません",
+                    "details": "有効なキャラクターIDを指定してください"
+                }
+            )
+        
+        grid = await calculator_service.calculate_damage_sweep(
+            request, character, character_service.get_coefficients(character)
+        )
+        
+        if request.format == "json":
+            # DamageSweepResult の形式（NumPy 配列は orjson がリストに変換せず直接シリアライズ）
+            return FastJSONResponse({
+                "shape": list(shape),
+                "leader_skill_multiplier": grid["leader_skill_multiplier"],
+                "def_stat": grid["def_stat"],
+                "enemy_attack": grid["enemy_attack"],
+                "damage_received": grid["damage_received"]
+            })
+        
+        return Response(
+            content=grid["damage_received"].astype("<f4").tobytes(),
+            media_type="application/octet-stream",
+            headers={
+                "X-Sweep-Shape": ",".join(str(n) for n in shape),
+                "X-Sweep-Axes": "leader_skill_multiplier,def_stat,enemy_attack",
+                "X-Sweep-Dtype": "float32-le",
+                "X-Sweep-Leader-Skill-Multiplier": _format_sweep_range(request.leader_skill_multiplier),
+                "X-Sweep-Def-Stat": _format_sweep_range(request.def_stat),
+                "X-Sweep-Enemy-Attack": _format_sweep_range(request.enemy_attack)
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "code": "CALCULATION_ERROR",
+                "message": "グリッドスイープ計算中にエラーが発生しました",
+                "details": str(e)
+            }
+        )
+
+
+@api_router.post(
+    "/calculate-damage/simulation",
+    response_model=BattleSimulationResult,
+    summary="バトルシミュレーション",
+    description="1ターン内の複数回の敵の攻撃を、攻撃値の分布・発生確率・ガード発動確率を与えてモンテカルロ試行します"
+)
+async def simulate_battle(
+    request: BattleSimulationRequest,
+    calculator_service: DamageCalculatorService = Depends(get_damage_calculator_service),
+    character_service: CharacterService = Depends(get_character_service),
+    settings: Settings = Depends(get_settings)
+) -> BattleSimulationResult:
+    """
+    バトルシミュレーションエンドポイント
+    
+    試行ごとに1ターンで受けるダメージの合計を求め、平均・標準偏差・パーセンタイルと
+    HP 以上のダメージを受ける確率を返します。seed を指定すると同じ結果を再現できます。
     
     Args:
+        request: バトルシミュレーションリクエストデータ
+        calculator_service: ダメージ計算サービス
         character_service: キャラクターサービス
+        settings: アプリケーション設定
         
     Returns:
-        List[Character]: キャラクター一覧
+        BattleSimulationResult: シミュレーション結果
         
     Raises:
-        HTTPException: 外部API接続エラーの場合
+        HTTPException: 試行が多すぎる場合、キャラクターが見つからない場合や計算エラーの場合
     """
+    samples = request.trials * len(request.attacks)
+    if samples > settings.simulation_max_samples:
+        raise HTTPException(
+            status_code=413,
+            detail={
+                "code": "SIMULATION_TOO_LARGE",
+                "message": f"試行回数 × 攻撃数が上限（{settings.simulation_max_samples}）を超えています",
+                "details": f"試行回数: {request.trials}, 攻撃数: {len(request.attacks)}, サンプル数: {samples}"
+            }
+        )
+    
     try:
-        characters = await character_service.get_characters()
-        return characters
+        character = await character_service.get_character(request.character_id)
+        if not character:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "code": "CHARACTER_NOT_FOUND",
+                    "message": f"キャラクターID '{request.character_id}' が見つかりません",
+                    "details": "有効なキャラクターIDを指定してください"
+                }
+            )
+        
+        return await calculator_service.simulate_battle(
+            request, character, character_service.get_coefficients(character)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "code": "CALCULATION_ERROR",
+                "message": "バトルシミュレーション中にエラーが発生しました",
+                "details": str(e)
+            }
+        )
+
+
+def _format_sweep_range(sweep_range) -> str:
+    """スイープ範囲をレスポンスヘッダー用の "start:stop:step" 形式に変換"""
+    return f"{sweep_range.start}:{sweep_range.stop}:{sweep_range.step}"
+
+
+def _sweep_job_status(job: SweepJob) -> dict:
+    """スイープジョブの状態をレスポンス（SweepJobStatus の形式）に変換"""
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "shape": list(job.shape),
+        "character_ids": job.character_ids,
+        "chunk_count": job.chunk_count,
+        "chunk_rows": job.chunk_rows,
+        "completed_chunks": job.completed_chunks,
+        "progress": job.completed_chunks / job.chunk_count if job.chunk_count else 1.0,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+def _get_sweep_job(job_manager: SweepJobManager, job_id: str) -> SweepJob:
+    """
+    スイープジョブを取得する
+    
+    Raises:
+        HTTPException: ジョブが存在しない場合
+    """
+    try:
+        return job_manager.get(job_id)
+    except JobNotFoundError:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "JOB_NOT_FOUND",
+                "message": f"ジョブID '{job_id}' が見つかりません",
+                "details": "終了したジョブは保持期間を過ぎると削除されます"
+            }
+        )
+
+
+@api_router.post(
+    "/sweep-jobs",
+    response_model=SweepJobStatus,
+    status_code=202,
+    summary="スイープジョブの登録",
+    description="キャラクター × リーダースキル倍率 × DEF × 敵攻撃値の大規模グリッドをバックグラウンドで計算します"
+)
+async def submit_sweep_job(
+    request: SweepJobRequest,
+    character_service: CharacterService = Depends(get_character_service),
+    job_manager: SweepJobManager = Depends(get_sweep_job_manager),
+    settings: Settings = Depends(get_settings)
+) -> SweepJobStatus:
+    """
+    スイープジョブ登録エンドポイント
+    
+    グリッドをチャンクに分割してプロセスプールで計算し、結果をローカルファイルに保存します。
+    計算はイベントループ外で行われるため、実行中も他のエンドポイントの応答は妨げられません。
+    
+    Args:
+        request: スイープジョブの登録リクエスト
+        character_service: キャラクターサービス
+        job_manager: スイープジョブ管理
+        settings: アプリケーション設定
         
+    Returns:
+        SweepJobStatus: 登録したジョブの状態
+        
+    Raises:
+        HTTPException: グリッドが大きすぎる場合、キャラクターが見つからない場合、ジョブ数が上限の場合
+    """
+    try:
+        if request.character_ids is None:
+            # 全キャラクターの場合は Character を生成せずに係数のみを取得する
+            coefficients = await character_service.get_all_coefficients()
+        else:
+            characters = []
+            missing_ids = []
+            for character_id in dict.fromkeys(request.character_ids):
+                character = await character_service.get_character(character_id)
+                if character:
+                    characters.append(character)
+                else:
+                    missing_ids.append(character_id)
+            
+            if missing_ids:
+                raise HTTPException(
+                    status_code=404,
+                    detail={
+                        "code": "CHARACTER_NOT_FOUND",
+                        "message": f"キャラクターID {missing_ids} が見つかりません",
+                        "details": "有効なキャラクターIDを指定してください"
+                    }
+                )
+            coefficients = [character_service.get_coefficients(character) for character in characters]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=503,
@@ -120,6 +496,389 @@ async def get_characters(
                 "details": str(e)
             }
         )
+    
+    shape = (
+        len(coefficients),
+        request.leader_skill_multiplier.count(),
+        request.def_stat.count(),
+        request.enemy_attack.count()
+    )
+    cells = shape[0] * shape[1] * shape[2] * shape[3]
+    if cells > settings.sweep_job_max_cells:
+        raise HTTPException(
+            status_code=413,
+            detail={
+                "code": "SWEEP_TOO_LARGE",
+                "message": f"グリッドのセル数が上限（{settings.sweep_job_max_cells}）を超えています",
+                "details": f"形状: {shape}, セル数: {cells}"
+            }
+        )
+    
+    try:
+        job = job_manager.submit(
+            [c.character_id for c in coefficients],
+            coefficients,
+            request.leader_skill_multiplier,
+            request.def_stat,
+            request.enemy_attack,
+            request.attack_count or 0
+        )
+    except JobLimitError as e:
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "code": "TOO_MANY_JOBS",
+                "message": "実行中のジョブが多すぎます",
+                "details": str(e)
+            }
+        )
+    
+    return FastJSONResponse(_sweep_job_status(job), status_code=202)
+
+
+@api_router.get(
+    "/sweep-jobs/{job_id}",
+    response_model=SweepJobStatus,
+    summary="スイープジョブの状態取得",
+    description="スイープジョブの状態と進捗を返します"
+)
+async def get_sweep_job(
+    job_id: str,
+    job_manager: SweepJobManager = Depends(get_sweep_job_manager)
+) -> SweepJobStatus:
+    """
+    スイープジョブ状態取得エンドポイント
+    
+    Args:
+        job_id: ジョブID
+        job_manager: スイープジョブ管理
+        
+    Returns:
+        SweepJobStatus: ジョブの状態
+        
+    Raises:
+        HTTPException: ジョブが存在しない場合
+    """
+    return FastJSONResponse(_sweep_job_status(_get_sweep_job(job_manager, job_id)))
+
+
+@api_router.get(
+    "/sweep-jobs/{job_id}/chunks/{index}",
+    responses={
+        200: {
+            "content": {"application/octet-stream": {}},
+            "description": "チャンクの結果（float32 リトルエンディアン、行数 × 敵攻撃値の点の数）"
+        }
+    },
+    summary="スイープジョブの結果取得（チャンク単位）",
+    description="計算が完了したチャンクの結果をバイナリで返します（ジョブの実行中も取得可能）"
+)
+async def get_sweep_job_chunk(
+    job_id: str,
+    index: int,
+    job_manager: SweepJobManager = Depends(get_sweep_job_manager)
+) -> Response:
+    """
+    スイープジョブ結果取得エンドポイント
+    
+    チャンクが含む行の範囲は X-Sweep-Rows ヘッダー（"開始:終了"、終了は含まない）で通知します。
+    
+    Args:
+        job_id: ジョブID
+        index: チャンク番号（0始まり）
+        job_manager: スイープジョブ管理
+        
+    Returns:
+        Response: チャンクの結果
+        
+    Raises:
+        HTTPException: ジョブ・チャンクが存在しない場合や計算が完了していない場合
+    """
+    job = _get_sweep_job(job_manager, job_id)
+    try:
+        content = await job_manager.read_chunk(job_id, index)
+    except IndexError as e:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "CHUNK_NOT_FOUND",
+                "message": f"チャンク {index} は存在しません",
+                "details": str(e)
+            }
+        )
+    except ChunkNotReadyError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "code": "CHUNK_NOT_READY",
+                "message": f"チャンク {index} の結果はまだ取得できません",
+                "details": str(e)
+            }
+        )
+    
+    row_start, row_stop = job.chunk_range(index)
+    return Response(
+        content=content,
+        media_type="application/octet-stream",
+        headers={
+            "X-Sweep-Shape": ",".join(str(n) for n in job.shape),
+            "X-Sweep-Axes": "character,leader_skill_multiplier,def_stat,enemy_attack",
+            "X-Sweep-Dtype": "float32-le",
+            "X-Sweep-Rows": f"{row_start}:{row_stop}"
+        }
+    )
+
+
+@api_router.delete(
+    "/sweep-jobs/{job_id}",
+    response_model=SweepJobStatus,
+    summary="スイープジョブのキャンセル",
+    description="実行中・待機中のスイープジョブをキャンセルし、結果ファイルを削除します"
+)
+async def cancel_sweep_job(
+    job_id: str,
+    job_manager: SweepJobManager = Depends(get_sweep_job_manager)
+) -> SweepJobStatus:
+    """
+    スイープジョブキャンセルエンドポイント
+    
+    終了済みのジョブはそのままの状態を返します。
+    
+    Args:
+        job_id: ジョブID
+        job_manager: スイープジョブ管理
+        
+    Returns:
+        SweepJobStatus: ジョブの状態
+        
+    Raises:
+        HTTPException: ジョブが存在しない場合
+    """
+    _get_sweep_job(job_manager, job_id)
+    return FastJSONResponse(_sweep_job_status(job_manager.cancel(job_id)))
+
+
+async def _cached_catalog_response(
+    request: Request,
+    character_service: CharacterService,
+    key: str,
+    build: Callable[[], Awaitable[Tuple[Any, bool]]],
+    settings: Settings
+) -> Response:
+    """
+    カタログ系レスポンスを ETag・シリアライズ済みキャッシュ付きで返す
+    
+    - カタログバージョンとキーに対応するシリアライズ・圧縮済みのボディがあればそれを使う
+    - なければ build() でレスポンスを生成してシリアライズ・圧縮し、キャッシュに保存する
+      （存在しないリソース・不正なパラメータは build() が送出するエラーをそのまま返す）
+    - build() がキャッシュ不可と報告したボディ（カタログ外の個別取得・モックデータへの
+      フォールバック）は ETag を付けず、キャッシュせずに返す
+    - If-None-Match が現在の ETag に一致すれば 304 を返す
+    
+    304 はリソースが存在する（キャッシュ済み、または build() が成功した）場合のみ返すため、
+    存在しない ID に If-None-Match: * や推測した ETag を指定しても 404 になります。
+    
+    カタログを取得できない（フォールバック中の）場合はキャッシュせずに返します。
+    
+    Args:
+        request: リクエスト
+        character_service: キャラクターサービス
+        key: リソースのキー（パスと正規化したクエリパラメータ）
+        build: レスポンスのボディ（JSON にシリアライズする値）と、カタログのバージョンに
+            対応する（キャッシュしてよい）かどうかを返す関数
+        settings: アプリケーション設定
+        
+    Returns:
+        Response: レスポンス
+    """
+    version = await character_service.get_catalog_version()
+    if version is None:
+        body, _ = await build()
+        return FastJSONResponse(body)
+    
+    etag = make_etag(version, key)
+    response_cache = get_response_cache()
+    encoded = response_cache.get(version, key)
+    if encoded is None:
+        body, cacheable = await build()
+        if not cacheable:
+            return FastJSONResponse(body)
+        encoded = encode_body(
+            dumps(body),
+            etag,
+            settings.response_cache_min_compress_size
+        )
+        # 生成中にカタログが更新された場合は古いバージョンとして保存しない
+        if character_service.catalog_version == version:
+            response_cache.set(version, key, encoded)
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified_response(etag)
+    return encoded_response(encoded, request.headers.get("accept-encoding"))
+
+
+# fields で指定できるキャラクターの項目
+CHARACTER_FIELDS = frozenset(Character.model_fields)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[set]:
+    """
+    fields パラメータ（カンマ区切り）を項目の集合に変換する（id は常に含める）
+    
+    Raises:
+        HTTPException: 存在しない項目が指定された場合
+    """
+    if not fields:
+        return None
+    
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected - CHARACTER_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "code": "INVALID_FIELDS",
+                "message": "指定できない項目が含まれています",
+                "details": f"不明な項目: {sorted(unknown)}, 指定可能な項目: {sorted(CHARACTER_FIELDS)}"
+            }
+        )
+    return selected | {"id"}
+
+
+@api_router.get(
+    "/characters",
+    response_model=CharacterListResponse,
+    summary="キャラクター一覧取得",
+    description="キャラクターの一覧を絞り込み・並び替え・カーソルページングして取得します"
+)
+async def get_characters(
+    request: Request,
+    type: Optional[str] = Query(None, description="属性タイプ（AGL, TEQ, INT, STR, PHY）"),
+    rarity: Optional[int] = Query(None, ge=1, le=6, description="レアリティ"),
+    guard_ability: Optional[bool] = Query(None, description="ガード能力の有無"),
+    infinite_defense_stacking: Optional[bool] = Query(None, description="DEF無限上昇能力の有無"),
+    skill_type: Optional[str] = Query(None, description="保有するパッシブスキルのタイプ"),
+    sort: CharacterSort = Query("id", description="並び替え（defense_multiplier / damage_reduction、- 始まりは降順）"),
+    limit: Optional[int] = Query(None, ge=1, description="ページサイズ（省略時は既定値）"),
+    cursor: Optional[str] = Query(None, description="前のページで返された next_cursor"),
+    fields: Optional[str] = Query(None, description="返す項目（カンマ区切り、省略時は全項目）"),
+    character_service: CharacterService = Depends(get_character_service),
+    settings: Settings = Depends(get_settings)
+) -> CharacterListResponse:
+    """
+    キャラクター一覧取得エンドポイント
+    
+    絞り込み・並び替えはカタログ更新時に構築した二次索引で処理します。
+    レスポンスはカタログバージョンごとにシリアライズ済みのものを再利用し、
+    ETag による条件付き GET に対応します。
+    
+    Args:
+        request: リクエスト
+        type: 属性タイプ
+        rarity: レアリティ
+        guard_ability: ガード能力の有無
+        infinite_defense_stacking: DEF無限上昇能力の有無
+        skill_type: 保有するパッシブスキルのタイプ
+        sort: 並び替えの種類
+        limit: ページサイズ
+        cursor: ページングカーソル
+        fields: 返す項目
+        character_service: キャラクターサービス
+        settings: アプリケーション設定
+        
+    Returns:
+        CharacterListResponse: キャラクター一覧（1ページ分）
+        
+    Raises:
+        HTTPException: パラメータ不正・外部API接続エラーの場合
+    """
+    try:
+        query = CharacterQuery(
+            type=type,
+            rarity=rarity,
+            guard_ability=guard_ability,
+            infinite_defense_stacking=infinite_defense_stacking,
+            skill_type=skill_type,
+            sort=sort
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "code": "INVALID_QUERY",
+                "message": "絞り込み条件が不正です",
+                "details": str(e)
+            }
+        )
+    
+    include = _parse_fields(fields)
+    page_size = min(limit or settings.character_page_default_limit, settings.character_page_max_limit)
+    
+    async def build() -> Tuple[dict, bool]:
+        try:
+            characters, total, next_cursor = await character_service.find_characters(query, page_size, cursor)
+            # CharacterListResponse の形式（項目の辞書は検証済みのため再検証しない）
+            return {
+                "items": [character.model_dump(include=include) for character in characters],
+                "total": total,
+                "next_cursor": next_cursor
+            }, True
+            
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "code": "INVALID_CURSOR",
+                    "message": "カーソルが不正です",
+                    "details": str(e)
+                }
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=503,
+                detail={
+                    "code": "EXTERNAL_API_ERROR",
+                    "message": "キャラクターデータの取得に失敗しました",
+                    "details": str(e)
+                }
+            )
+    
+    key = (
+        f"characters?{query.model_dump_json()}&limit={page_size}&cursor={cursor or ''}"
+        f"&fields={','.join(sorted(include)) if include else ''}"
+    )
+    return await _cached_catalog_response(request, character_service, key, build, settings)
+
+
+@api_router.get(
+    "/characters/search",
+    response_model=CharacterSearchResponse,
+    summary="キャラクター名検索",
+    description="キャラクター名で検索します（全角・半角、ひらがな・カタカナ、括弧の有無を区別しません）"
+)
+async def search_characters(
+    q: str = Query(..., min_length=1, max_length=100, description="検索文字列"),
+    limit: int = Query(10, ge=1, le=50, description="最大件数"),
+    character_service: CharacterService = Depends(get_character_service)
+) -> CharacterSearchResponse:
+    """
+    キャラクター名検索エンドポイント
+    
+    /characters/{character_id} より先に登録する必要があります。
+    
+    Args:
+        q: 検索文字列
+        limit: 最大件数
+        character_service: キャラクターサービス
+        
+    Returns:
+        CharacterSearchResponse: 検索結果
+    """
+    hits = await character_service.search_characters(q, limit)
+    # CharacterSearchResponse の形式
+    return FastJSONResponse({
+        "items": [{**hit.entry._asdict(), "match": hit.match} for hit in hits]
+    })
 
 
 @api_router.get(
@@ -130,14 +889,20 @@ async def get_characters(
 )
 async def get_character(
     character_id: str,
-    character_service: CharacterService = Depends(get_character_service)
+    request: Request,
+    character_service: CharacterService = Depends(get_character_service),
+    settings: Settings = Depends(get_settings)
 ) -> Character:
     """
     キャラクター詳細取得エンドポイント
     
+    一覧と同様に ETag による条件付き GET とシリアライズ済みキャッシュに対応します。
+    
     Args:
         character_id: キャラクターID
+        request: リクエスト
         character_service: キャラクターサービス
+        settings: アプリケーション設定
         
     Returns:
         Character: キャラクター詳細情報
@@ -145,35 +910,234 @@ async def get_character(
     Raises:
         HTTPException: キャラクターが見つからない場合
     """
-    try:
-        character = await character_service.get_character(character_id)
-        if not character:
+    async def build() -> Tuple[Character, bool]:
+        try:
+            character, catalogued = await character_service.lookup_character(character_id)
+            if not character:
+                raise HTTPException(
+                    status_code=404,
+                    detail={
+                        "code": "CHARACTER_NOT_FOUND",
+                        "message": f"キャラクターID '{character_id}' が見つかりません",
+                        "details": "有効なキャラクターIDを指定してください"
+                    }
+                )
+            
+            return character, catalogued
+            
+        except HTTPException:
+            raise
+        except Exception as e:
             raise HTTPException(
-                status_code=404,
+                status_code=503,
                 detail={
-                    "code": "CHARACTER_NOT_FOUND",
-                    "message": f"キャラクターID '{character_id}' が見つかりません",
-                    "details": "有効なキャラクターIDを指定してください"
+                    "code": "EXTERNAL_API_ERROR",
+                    "message": "キャラクターデータの取得に失敗しました",
+                    "details": str(e)
                 }
             )
+    
+    return await _cached_catalog_response(
+        request, character_service, f"characters/{character_id}", build, settings
+    )
+
+
+# 管理者用APIルーター
+def require_admin(
+    x_admin_token: Optional[str] = Header(default=None),
+    settings: Settings = Depends(get_settings)
+) -> None:
+    """
+    管理者用エンドポイントへのアクセスを検証する
+    
+    admin_api_token が設定されている場合は X-Admin-Token ヘッダーの一致を要求し、
+    未設定の場合はデバッグモードでのみアクセスを許可します。
+    
+    Raises:
+        HTTPException: アクセスが許可されない場合
+    """
+    if is_admin_authorized(x_admin_token, settings):
+        return
+    
+    raise HTTPException(
+        status_code=403,
+        detail={
+            "code": "ADMIN_FORBIDDEN",
+            "message": "管理者用エンドポイントへのアクセスが許可されていません",
+            "details": "X-Admin-Token ヘッダーに管理者トークンを指定してください"
+        }
+    )
+
+
+admin_router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+    route_class=MetricsRoute
+)
+
+
+@admin_router.get(
+    "/characters/{character_id}/coefficients",
+    response_model=DamageCoefficientsResponse,
+    summary="ダメージ計算係数の確認",
+    description="キャラクターのコンパイル済みダメージ計算係数とパッシブスキル一覧を返します（デバッグ用）"
+)
+async def get_character_coefficients(
+    character_id: str,
+    character_service: CharacterService = Depends(get_character_service)
+) -> DamageCoefficientsResponse:
+    """
+    ダメージ計算係数確認エンドポイント
+    
+    Args:
+        character_id: キャラクターID
+        character_service: キャラクターサービス
         
-        return character
+    Returns:
+        DamageCoefficientsResponse: コンパイル済みの係数と元のパッシブスキル一覧
         
-    except HTTPException:
-        raise
-    except Exception as e:
+    Raises:
+        HTTPException: キャラクターが見つからない場合
+    """
+    character = await character_service.get_character(character_id)
+    if not character:
         raise HTTPException(
-            status_code=503,
+            status_code=404,
             detail={
-                "code": "EXTERNAL_API_ERROR",
-                "message": "キャラクターデータの取得に失敗しました",
+                "code": "CHARACTER_NOT_FOUND",
+                "message": f"キャラクターID '{character_id}' が見つかりません",
+                "details": "有効なキャラクターIDを指定してください"
+            }
+        )
+    
+    coefficients = character_service.get_coefficients(character)
+    return DamageCoefficientsResponse(
+        character_id=coefficients.character_id,
+        defense_boost_percent=coefficients.defense_boost_percent,
+        stacking_rate_per_attack=coefficients.stacking_rate_per_attack,
+        damage_reduction=coefficients.damage_reduction,
+        guard_factor=coefficients.guard_factor,
+        damage_factor=coefficients.damage_factor,
+        passive_skills=character.passive_skills
+    )
+
+
+@admin_router.get(
+    "/cache/stats",
+    response_model=CacheStatsResponse,
+    summary="キャッシュ統計情報",
+    description="キャラクターキャッシュの使用状況とヒット/ミス/削除/期限切れ件数を返します"
+)
+async def get_cache_stats(
+    character_service: CharacterService = Depends(get_character_service)
+) -> CacheStatsResponse:
+    """
+    キャッシュ統計情報エンドポイント
+    
+    Args:
+        character_service: キャラクターサービス
+        
+    Returns:
+        CacheStatsResponse: キャッシュ統計情報
+    """
+    return CacheStatsResponse(**character_service.cache_stats())
+
+
+@admin_router.get(
+    "/calculation-memo/stats",
+    response_model=CacheStatsResponse,
+    summary="計算結果メモの統計情報",
+    description="ダメージ計算結果のメモの使用状況とヒット/ミス/削除件数・ヒット率を返します"
+)
+async def get_calculation_memo_stats(
+    calculator_service: DamageCalculatorService = Depends(get_damage_calculator_service)
+) -> CacheStatsResponse:
+    """
+    計算結果メモの統計情報エンドポイント
+    
+    Args:
+        calculator_service: ダメージ計算サービス
+        
+    Returns:
+        CacheStatsResponse: メモの統計情報（メモ無効時は全て0）
+    """
+    return CacheStatsResponse(**calculator_service.memo_stats())
+
+
+@admin_router.get(
+    "/profiles",
+    response_model=ProfileListResponse,
+    summary="プロファイル一覧",
+    description="X-Profile ヘッダーまたはサンプリングで保存したリクエストのプロファイル一覧を返します"
+)
+async def list_profiles(
+    profiler: RequestProfiler = Depends(get_request_profiler)
+) -> ProfileListResponse:
+    """
+    プロファイル一覧エンドポイント
+    
+    Args:
+        profiler: リクエストプロファイラー
+        
+    Returns:
+        ProfileListResponse: 保存済みのプロファイル一覧（新しい順）
+    """
+    profiles = await asyncio.to_thread(profiler.store.list)
+    return ProfileListResponse(
+        items=[
+            ProfileInfoResponse(name=info.name, size=info.size, created_at=info.created_at)
+            for info in profiles
+        ],
+        max_profiles=profiler.store.max_profiles
+    )
+
+
+@admin_router.get(
+    "/profiles/{name}",
+    response_class=FileResponse,
+    responses={
+        200: {
+            "content": {"application/octet-stream": {}},
+            "description": "pstats 形式のプロファイル（python -m pstats や snakeviz で読み込み可能）"
+        }
+    },
+    summary="プロファイルのダウンロード",
+    description="保存済みのプロファイルを pstats 形式のファイルとして返します"
+)
+async def download_profile(
+    name: str,
+    profiler: RequestProfiler = Depends(get_request_profiler)
+) -> FileResponse:
+    """
+    プロファイルダウンロードエンドポイント
+    
+    Args:
+        name: プロファイル名
+        profiler: リクエストプロファイラー
+        
+    Returns:
+        FileResponse: プロファイルのファイル
+        
+    Raises:
+        HTTPException: プロファイルが存在しない場合
+    """
+    try:
+        path = profiler.store.path(name)
+    except ProfileNotFoundError as e:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "PROFILE_NOT_FOUND",
+                "message": f"プロファイル '{name}' が見つかりません",
                 "details": str(e)
             }
         )
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
 
 
 # ヘルスチェックエンドポイント（ルートレベル）
-health_router = APIRouter(tags=["health"])
+health_router = APIRouter(tags=["health"], route_class=MetricsRoute)
 
 @health_router.get(
     "/health",
@@ -182,23 +1146,116 @@ health_router = APIRouter(tags=["health"])
     description="APIサーバーの稼働状況を確認します"
 )
 async def health_check(
-    settings: Settings = Depends(get_settings)
+    settings: Settings = Depends(get_settings),
+    character_service: CharacterService = Depends(get_character_service)
 ) -> HealthCheckResponse:
     """
     ヘルスチェックエンドポイント
     
+    外部キャラクターAPIへの呼び出しを遮断中の場合は status を degraded とします
+    （キャラクターはキャッシュ・データベース・モックデータから提供を継続します）。
+    
     Args:
         settings: アプリケーション設定
+        character_service: キャラクターサービス
         
     Returns:
         HealthCheckResponse: サーバー稼働状況
     """
+    upstream = character_service.upstream_status()
     return HealthCheckResponse(
-        status="healthy",
-        service="dokkan-damage-calculator-api"
+        status="degraded" if upstream["state"] == "open" else "healthy",
+        service="dokkan-damage-calculator-api",
+        upstream=upstream
     )
 
 
+@health_router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse, "description": "ウォームアップ未完了"}},
+    summary="レディネスチェック",
+    description="起動時のウォームアップが終了し、トラフィックを受け付けられるかを確認します"
+)
+async def readiness_check(
+    response: Response,
+    warmup_state: WarmupState = Depends(get_warmup_state),
+    character_service: CharacterService = Depends(get_character_service)
+) -> ReadinessResponse:
+    """
+    レディネスチェックエンドポイント
+    
+    ウォームアップが終了するまでは 503 を返します。/health（稼働確認）とは異なり、
+    ロードバランサーがトラフィックを振り分けてよいかの判定に使用します。
+    ウォームアップが失敗した場合（外部APIの障害など）も、全インスタンスが
+    受け付けを停止しないよう ready とし、warmup と catalog_loaded で状態を示します。
+    
+    Args:
+        response: レスポンス（ステータスコードの設定用）
+        warmup_state: ウォームアップの進行状況
+        character_service: キャラクターサービス
+        
+    Returns:
+        ReadinessResponse: 受け付け可否とウォームアップの状態
+    """
+    ready = warmup_state.finished
+    if not ready:
+        response.status_code = 503
+    return ReadinessResponse(
+        status="ready" if ready else "not_ready",
+        warmup=warmup_state.status,
+        warmup_seconds=warmup_state.duration,
+        warmup_error=warmup_state.error,
+        catalog_loaded=character_service.catalog_loaded
+    )
+
+
+@health_router.get(
+    "/metrics",
+    response_class=Response,
+    summary="メトリクス",
+    description="ルートごとのレイテンシ・外部API・キャッシュ・計算件数のメトリクスを Prometheus テキスト形式で返します"
+)
+async def get_metrics(
+    settings: Settings = Depends(get_settings),
+    character_service: CharacterService = Depends(get_character_service),
+    calculator_service: DamageCalculatorService = Depends(get_damage_calculator_service)
+) -> Response:
+    """
+    メトリクスエンドポイント
+    
+    常に集計しているカウンター・ヒストグラムに加え、各キャッシュの統計情報を
+    出力時に取り込みます。
+    
+    Args:
+        settings: アプリケーション設定
+        character_service: キャラクターサービス
+        calculator_service: ダメージ計算サービス
+        
+    Returns:
+        Response: Prometheus テキスト形式のメトリクス
+        
+    Raises:
+        HTTPException: メトリクスの公開が無効な場合
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "METRICS_DISABLED",
+                "message": "メトリクスの公開は無効です",
+                "details": "METRICS_ENABLED=true で有効化してください"
+            }
+        )
+    
+    body = REGISTRY.render(cache_metrics({
+        "character": character_service.cache_stats(),
+        "calculation_memo": calculator_service.memo_stats(),
+        "response": get_response_cache().stats()
+    }))
+    return Response(content=body, media_type=METRICS_CONTENT_TYPE)
+
+
 @health_router.get(
     "/",
     summary="ルートエンドポイント",
@@ -0,0 +1,32 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - 管理者権限の判定
+
+管理者用エンドポイントや管理者向けのリクエストヘッダー（プロファイリング等）で共通の
+アクセス可否の判定を提供します。
+"""
+
+import secrets
+from typing import Optional
+
+from .config import Settings
+
+
+def is_admin_authorized(admin_token: Optional[str], settings: Settings) -> bool:
+    """
+    管理者としてのアクセスを許可するかどうか
+
+    admin_api_token が設定されている場合はトークンの一致を要求し、
+    未設定の場合はデバッグモードでのみ許可します。
+
+    Args:
+        admin_token: リクエストの X-Admin-Token ヘッダーの値
+        settings: アプリケーション設定
+
+    Returns:
+        bool: 許可する場合は True
+    """
+    if settings.admin_api_token:
+        return admin_token is not None and secrets.compare_digest(
+            admin_token.encode("utf-8"), settings.admin_api_token.encode("utf-8")
+        )
+    return settings.debug
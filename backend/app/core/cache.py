@@ -0,0 +1,236 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - LRU + TTL キャッシュ
+
+エントリ数とバイト数の上限、キーごとの有効期限を持つ汎用キャッシュを提供します。
+"""
+
+import heapq
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+@dataclass
+class CacheStats:
+    """
+    キャッシュの統計情報
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """ヒット率（参照がない場合は0.0）"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+    """キャッシュエントリ"""
+    value: Any
+    expires_at: float
+    size: int
+
+
+def estimate_size(value: Any) -> int:
+    """
+    オブジェクトのおおよそのメモリ使用量（バイト）を見積もる
+
+    コンテナと Pydantic モデルは再帰的に辿り、同一オブジェクトは一度だけ数えます。
+
+    Args:
+        value: 見積もり対象のオブジェクト
+
+    Returns:
+        int: 見積もりバイト数
+    """
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, BaseModel):
+            stack.extend(obj.__dict__.values())
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class TTLCache:
+    """
+    LRU + TTL キャッシュクラス
+
+    - エントリ数・合計バイト数の上限を超えると最も長く参照されていないものから削除
+    - キーごとに有効期限を設定可能（単調増加クロックで判定）
+    - 期限切れエントリは参照の有無に関わらず get / set のたびに回収
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        default_ttl: float,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: 最大エントリ数
+            default_ttl: 既定の有効期限（秒）
+            max_bytes: 合計サイズの上限（バイト、None で無制限）
+            sizeof: エントリのサイズ見積もり関数
+            clock: 時刻取得関数（単調増加であること）
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, Hashable]] = []
+        self._heap_counter = 0
+        self._bytes = 0
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > self._clock()
+
+    @property
+    def current_bytes(self) -> int:
+        """現在の合計サイズ（見積もりバイト数）"""
+        return self._bytes
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        キャッシュから値を取得する
+
+        Args:
+            key: キャッシュキー
+            default: 存在しない・期限切れの場合に返す値
+
+        Returns:
+            Any: キャッシュされた値または default
+        """
+        self._purge_expired(self._clock())
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        値をキャッシュに保存する
+
+        Args:
+            key: キャッシュキー
+            value: 保存する値
+            ttl: 有効期限（秒、省略時は default_ttl）
+        """
+        now = self._clock()
+        self._purge_expired(now)
+
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            # 単体で上限を超える値は保存しない
+            self.delete(key)
+            return
+
+        self.delete(key)
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        self._entries[key] = _Entry(value=value, expires_at=expires_at, size=size)
+        self._bytes += size
+
+        self._heap_counter += 1
+        heapq.heappush(self._expiry_heap, (expires_at, self._heap_counter, key))
+        self._compact_heap()
+
+        self._evict_over_budget()
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        キャッシュからエントリを削除する
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            bool: 削除したかどうか
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def clear(self) -> None:
+        """全エントリを削除する（統計情報は保持）"""
+        self._entries.clear()
+        self._expiry_heap.clear()
+        self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """
+        期限切れエントリを回収する
+
+        Returns:
+            int: 回収したエントリ数
+        """
+        return self._purge_expired(self._clock())
+
+    def _purge_expired(self, now: float) -> int:
+        """有効期限ヒープの先頭から期限切れエントリを回収する"""
+        purged = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # 再保存で有効期限が更新されたキーのヒープ要素は読み捨てる
+            if entry is not None and entry.expires_at == expires_at:
+                self.delete(key)
+                self.stats.expirations += 1
+                purged += 1
+        return purged
+
+    def _evict_over_budget(self) -> None:
+        """上限を超えている間、最も長く参照されていないエントリから削除する"""
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self.delete(key)
+            self.stats.evictions += 1
+
+    def _compact_heap(self) -> None:
+        """削除済みキーのヒープ要素が溜まりすぎた場合にヒープを作り直す"""
+        if len(self._expiry_heap) <= 2 * len(self._entries) + 64:
+            return
+        self._expiry_heap = [
+            item for item in self._expiry_heap
+            if (entry := self._entries.get(item[2])) is not None and entry.expires_at == item[0]
+        ]
+        heapq.heapify(self._expiry_heap)
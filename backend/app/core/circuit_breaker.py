@@ -0,0 +1,158 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - サーキットブレーカー
+
+連続して失敗している依存先への呼び出しを一定時間遮断し、
+即座に失敗させる機能を提供します。
+"""
+
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+
+class CircuitState(str, Enum):
+    """
+    サーキットブレーカーの状態
+    """
+    CLOSED = "closed"        # 通常（呼び出しを通す）
+    OPEN = "open"            # 遮断中（呼び出しを即座に失敗させる）
+    HALF_OPEN = "half_open"  # 試行中（限られた数の呼び出しで回復を確認する）
+
+
+class CircuitOpenError(Exception):
+    """遮断中のため呼び出しを行わなかったことを表す例外"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} への呼び出しを遮断中です（再試行まで {retry_after:.1f}秒）")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    サーキットブレーカークラス
+
+    - CLOSED: 失敗が failure_threshold 回連続すると OPEN に移行
+    - OPEN: recovery_timeout 秒経過するまで呼び出しを拒否し、経過後は HALF_OPEN に移行
+    - HALF_OPEN: half_open_max_calls 件まで試行を通し、成功すれば CLOSED、
+      失敗すれば再び OPEN に戻る
+
+    呼び出し側は before_call() で許可を得てから処理を行い、
+    結果を record_success() / record_failure() で報告します。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold は1以上を指定してください")
+        if half_open_max_calls <= 0:
+            raise ValueError("half_open_max_calls は1以上を指定してください")
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open_calls = 0
+
+        # 統計情報
+        self._total_failures = 0
+        self._total_rejections = 0
+        self._open_count = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """現在の状態（遮断時間が経過していれば HALF_OPEN）"""
+        if self._state is CircuitState.OPEN and self._retry_after() <= 0:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        呼び出しの許可を得る
+
+        Raises:
+            CircuitOpenError: 遮断中、または HALF_OPEN の試行枠が埋まっている場合
+        """
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if state is CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return
+
+        self._total_rejections += 1
+        raise CircuitOpenError(self.name, max(0.0, self._retry_after()))
+
+    def record_success(self) -> None:
+        """呼び出しの成功を記録する（HALF_OPEN であれば CLOSED に戻す）"""
+        self._consecutive_failures = 0
+        if self._state is not CircuitState.CLOSED:
+            self._state = CircuitState.CLOSED
+            self._opened_at = None
+            self._half_open_calls = 0
+
+    def release(self) -> None:
+        """結果を報告せずに試行枠を返却する（呼び出しがキャンセルされた場合など）"""
+        if self._state is CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_failure(self) -> None:
+        """呼び出しの失敗を記録する（しきい値到達時・HALF_OPEN での失敗時は OPEN に移行）"""
+        self._consecutive_failures += 1
+        self._total_failures += 1
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def reset(self) -> None:
+        """状態を CLOSED に戻す"""
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._half_open_calls = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        現在の状態と統計情報を取得する
+
+        Returns:
+            Dict[str, Any]: 状態・連続失敗回数・再試行までの秒数・累計件数
+        """
+        state = self.state
+        return {
+            "name": self.name,
+            "state": state.value,
+            "consecutive_failures": self._consecutive_failures,
+            "retry_after": max(0.0, self._retry_after()) if state is CircuitState.OPEN else None,
+            "total_failures": self._total_failures,
+            "total_rejections": self._total_rejections,
+            "open_count": self._open_count,
+        }
+
+    def _open(self) -> None:
+        """OPEN に移行する"""
+        if self._state is not CircuitState.OPEN:
+            self._open_count += 1
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._half_open_calls = 0
+
+    def _retry_after(self) -> float:
+        """HALF_OPEN へ移行するまでの秒数"""
+        if self._opened_at is None:
+            return 0.0
+        return self._opened_at + self.recovery_timeout - self._clock()
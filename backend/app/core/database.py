@@ -0,0 +1,80 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - データベース接続管理
+
+設定の database_url から SQLAlchemy のエンジンとセッションファクトリを生成します。
+"""
+
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from .config import get_settings
+from ..models.orm import Base
+
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+
+
+def create_database_engine(database_url: str) -> Engine:
+    """
+    データベースエンジンを生成する
+
+    SQLite の場合はワーカースレッドからの利用と外部キー制約を有効にします。
+
+    Args:
+        database_url: データベース接続URL
+
+    Returns:
+        Engine: データベースエンジン
+    """
+    if database_url.startswith("sqlite"):
+        engine = create_engine(database_url, connect_args={"check_same_thread": False})
+
+        @event.listens_for(engine, "connect")
+        def _enable_sqlite_foreign_keys(dbapi_connection, _):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.close()
+
+        return engine
+
+    return create_engine(database_url, pool_pre_ping=True)
+
+
+def get_engine() -> Engine:
+    """
+    プロセス共有のデータベースエンジンを取得する（初回呼び出し時にテーブルを作成）
+
+    Returns:
+        Engine: データベースエンジン
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_database_engine(get_settings().database_url)
+        Base.metadata.create_all(_engine)
+    return _engine
+
+
+def get_session_factory() -> sessionmaker:
+    """
+    プロセス共有のセッションファクトリを取得する
+
+    Returns:
+        sessionmaker: セッションファクトリ
+    """
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(bind=get_engine(), class_=Session, expire_on_commit=False)
+    return _session_factory
+
+
+def dispose_engine() -> None:
+    """データベースエンジンの接続プールを破棄する"""
+    global _engine, _session_factory
+    if _engine is not None:
+        _engine.dispose()
+    _engine = None
+    _session_factory = None
@@ -0,0 +1,236 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - HTTP キャッシュ
+
+カタログバージョンごとにシリアライズ済みのレスポンス（非圧縮・gzip・brotli）を
+保持し、ETag による条件付き GET（304 Not Modified）に応答する機能を提供します。
+"""
+
+import gzip
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+from fastapi import Response
+
+from .cache import TTLCache
+from .config import get_settings
+
+try:
+    import brotli
+except ImportError:  # brotli は任意の依存関係（未インストール時は gzip のみ）
+    brotli = None
+
+# 圧縮レベル（レスポンス生成時に一度だけ圧縮するため、速度より圧縮率を優先）
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    """
+    シリアライズ・圧縮済みのレスポンスボディ
+    """
+    etag: str
+    identity: bytes
+    gzip: Optional[bytes] = None
+    br: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        """保持しているバイト数の合計"""
+        return len(self.identity) + len(self.gzip or b"") + len(self.br or b"")
+
+
+def make_etag(version: str, key: str) -> str:
+    """
+    カタログバージョンとリソースのキーから ETag を生成する
+
+    ボディを生成せずに計算できるため、304 の判定にシリアライズは不要です。
+
+    Args:
+        version: カタログバージョン
+        key: リソースのキー（パスと正規化したクエリパラメータ）
+
+    Returns:
+        str: 強い ETag（ダブルクォート付き）
+    """
+    digest = hashlib.sha256(f"{version}:{key}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match ヘッダーが ETag に一致するかどうか
+
+    Args:
+        if_none_match: If-None-Match ヘッダーの値
+        etag: 現在の ETag
+
+    Returns:
+        bool: 一致する（304 を返せる）かどうか
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    # 弱い比較（W/ 付きの ETag も一致とみなす）
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def encode_body(body: bytes, etag: str, min_compress_size: int) -> EncodedBody:
+    """
+    レスポンスボディの圧縮版を生成する
+
+    Args:
+        body: シリアライズ済みのボディ
+        etag: ETag
+        min_compress_size: 圧縮版を生成する最小サイズ（バイト）
+
+    Returns:
+        EncodedBody: 非圧縮・圧縮版のボディ
+    """
+    if len(body) < min_compress_size:
+        return EncodedBody(etag=etag, identity=body)
+    return EncodedBody(
+        etag=etag,
+        identity=body,
+        gzip=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+        br=brotli.compress(body, quality=BROTLI_QUALITY) if brotli is not None else None,
+    )
+
+
+def negotiate_encoding(accept_encoding: Optional[str], encoded: EncodedBody) -> Optional[str]:
+    """
+    Accept-Encoding に応じて返す圧縮形式を選ぶ（brotli > gzip > 非圧縮）
+
+    Args:
+        accept_encoding: Accept-Encoding ヘッダーの値
+        encoded: 圧縮済みのボディ
+
+    Returns:
+        Optional[str]: "br" / "gzip"（非圧縮の場合はNone）
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+
+    if encoded.br is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if encoded.gzip is not None and ("gzip" in accepted or "*" in accepted):
+        return "gzip"
+    return None
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """カタログ系レスポンスに付与するキャッシュ関連ヘッダー"""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={get_settings().http_cache_max_age}",
+        "Vary": "Accept-Encoding",
+    }
+
+
+def not_modified_response(etag: str) -> Response:
+    """304 Not Modified レスポンスを生成する"""
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+def encoded_response(encoded: EncodedBody, accept_encoding: Optional[str]) -> Response:
+    """
+    圧縮済みボディから JSON レスポンスを生成する（ボディはコピーのみ）
+
+    Args:
+        encoded: 圧縮済みのボディ
+        accept_encoding: Accept-Encoding ヘッダーの値
+
+    Returns:
+        Response: JSON レスポンス
+    """
+    headers = cache_headers(encoded.etag)
+    coding = negotiate_encoding(accept_encoding, encoded)
+    if coding is None:
+        content = encoded.identity
+    else:
+        content = encoded.br if coding == "br" else encoded.gzip
+        headers["Content-Encoding"] = coding
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """
+    シリアライズ済みレスポンスのキャッシュクラス
+
+    キーにカタログバージョンを含めるため、カタログが更新されると古い
+    レスポンスは参照されなくなり、LRU / TTL により順次削除されます。
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, max_entries: int = 10000):
+        self._cache = TTLCache(
+            max_entries=max_entries,
+            default_ttl=ttl,
+            max_bytes=max_bytes,
+            sizeof=lambda encoded: encoded.size,
+        )
+
+    def get(self, version: str, key: Hashable) -> Optional[EncodedBody]:
+        """カタログバージョンとキーに対応するレスポンスを取得する"""
+        return self._cache.get((version, key))
+
+    def set(self, version: str, key: Hashable, encoded: EncodedBody) -> None:
+        """カタログバージョンとキーに対応するレスポンスを保存する"""
+        self._cache.set((version, key), encoded)
+
+    def clear(self) -> None:
+        """全てのレスポンスを削除する"""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        キャッシュの使用状況と統計情報を取得する
+
+        Returns:
+            Dict[str, Any]: エントリ数・サイズ・ヒット/ミス/削除/期限切れ件数
+        """
+        stats = self._cache.stats
+        return {
+            "entries": len(self._cache),
+            "bytes": self._cache.current_bytes,
+            "max_entries": self._cache.max_entries,
+            "max_bytes": self._cache.max_bytes,
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "evictions": stats.evictions,
+            "expirations": stats.expirations,
+            "hit_ratio": stats.hit_ratio
+        }
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# プロセス共有のレスポンスキャッシュ
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    プロセス共有のレスポンスキャッシュを取得する
+
+    Returns:
+        ResponseCache: レスポンスキャッシュ
+    """
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = ResponseCache(
+            max_bytes=settings.response_cache_max_bytes,
+            ttl=settings.cache_ttl,
+        )
+    return _response_cache
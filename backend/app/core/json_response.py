@@ -0,0 +1,49 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - JSON レスポンス
+
+orjson による高速な JSON シリアライズと、それを使用するレスポンスクラスを提供します。
+"""
+
+from typing import Any
+
+import numpy as np
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# NumPy 配列・数値と、文字列以外のキーを持つ辞書もそのままシリアライズする
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """orjson が直接扱えない値の変換（Pydantic モデル・非連続の NumPy 配列）"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"JSON にシリアライズできない型です: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    値を JSON（UTF-8 バイト列）にシリアライズする
+
+    Args:
+        content: シリアライズする値（辞書・リスト・Pydantic モデル・NumPy 配列など）
+
+    Returns:
+        bytes: JSON
+    """
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson でシリアライズする JSON レスポンスクラス
+
+    エンドポイントが直接返す場合は response_model による再検証も行われないため、
+    ボディは組み立て済みの辞書（またはモデル）をそのまま渡します。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
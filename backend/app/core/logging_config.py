@@ -0,0 +1,183 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - ログ設定
+
+構造化ログ（テキストの key=value 形式 / JSON 形式）のフォーマッター、
+リクエスト単位のログのサンプリング、QueueHandler によるログ出力の
+バックグラウンドスレッド化を提供します。
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, TextIO
+
+# 構造化ログの項目を LogRecord に載せる属性名
+FIELDS_ATTR = "fields"
+
+_TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def log_fields(**fields: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    ログ呼び出しの extra に渡す構造化ログの項目を生成する
+
+    値の文字列化はフォーマッター（リスナースレッド）で行われます。
+
+    例:
+        logger.info("ダメージ計算完了", extra=log_fields(character_id=..., damage_received=...))
+
+    Args:
+        **fields: 項目名と値
+
+    Returns:
+        Dict[str, Dict[str, Any]]: extra に渡す辞書
+    """
+    return {FIELDS_ATTR: fields}
+
+
+class StructuredTextFormatter(logging.Formatter):
+    """
+    従来のテキスト形式に構造化ログの項目を key=value で付加するフォーマッター
+    """
+
+    def __init__(self):
+        super().__init__(_TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, FIELDS_ATTR, None)
+        if fields:
+            text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    1レコードを1行の JSON として出力するフォーマッター
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, FIELDS_ATTR, None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class RequestLogSampler:
+    """
+    リクエスト単位のログ（計算・キャッシュヒット等）のサンプリングクラス
+
+    rate の割合のリクエストについてのみログを出力します（1.0 で全件、0.0 で出力しない）。
+    """
+
+    def __init__(self, rate: float = 1.0, rng: Callable[[], float] = random.random):
+        self.rate = rate
+        self._rng = rng
+
+    def __call__(self) -> bool:
+        """今回のリクエストのログを出力するかどうか"""
+        if self.rate >= 1.0:
+            return True
+        return self.rate > 0.0 and self._rng() < self.rate
+
+
+# プロセス共有のリクエストログのサンプラー（configure_logging で割合を設定）
+request_log_sampler = RequestLogSampler()
+
+
+def should_log_request(logger: logging.Logger, level: int = logging.INFO) -> bool:
+    """
+    リクエスト単位のログを出力するかどうか
+
+    レベルが無効、またはサンプリングで外れた場合は False を返すため、
+    呼び出し側はログの項目の組み立てごと省略できます。
+
+    Args:
+        logger: 出力先のロガー
+        level: ログレベル
+
+    Returns:
+        bool: 出力するかどうか
+    """
+    return logger.isEnabledFor(level) and request_log_sampler()
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    メッセージの整形をリスナースレッドに任せる QueueHandler
+
+    標準の QueueHandler は別プロセスへ渡せるよう呼び出し元でメッセージを整形しますが、
+    同一プロセス内のキューではレコードをそのまま渡せるため、整形も含めて
+    呼び出し元（イベントループ）から外します。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    log_format: str = "text",
+    request_sample_rate: float = 1.0,
+    use_queue: bool = True,
+    stream: Optional[TextIO] = None
+) -> None:
+    """
+    ルートロガーを設定する
+
+    use_queue の場合、ルートロガーには QueueHandler のみを設定し、
+    整形と出力はリスナースレッドで行います。
+
+    Args:
+        level: ログレベル
+        log_format: 出力形式（text / json）
+        request_sample_rate: リクエスト単位のログを出力する割合（0.0〜1.0）
+        use_queue: ログ出力をバックグラウンドスレッドで行うか
+        stream: 出力先（省略時は標準エラー出力）
+    """
+    global _listener
+    shutdown_logging()
+
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter() if log_format == "json" else StructuredTextFormatter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(getattr(logging, level.upper()))
+
+    if use_queue:
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        root.addHandler(_DeferredQueueHandler(log_queue))
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        root.addHandler(stream_handler)
+
+    request_log_sampler.rate = request_sample_rate
+
+
+def shutdown_logging() -> None:
+    """リスナースレッドを停止する（キューに残ったログは出力してから停止）"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,405 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - メトリクス
+
+Prometheus のテキスト形式（0.0.4）で出力できるカウンター・ゲージ・ヒストグラムと、
+ルートごとのレイテンシ・処理中リクエスト数を計測する APIRoute を提供します。
+外部ライブラリには依存せず、更新は辞書とリストの操作のみで行います
+（更新はイベントループ上から行う前提のため、ロックは取りません）。
+"""
+
+import math
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+# Prometheus テキスト形式の Content-Type（charset は Response が付加する）
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# レイテンシ用の既定のバケット（秒）
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# (名前の接尾辞, ラベル, 値)
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape_label_value(value: str) -> str:
+    """ラベル値をエスケープする"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """サンプルの値を文字列化する"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """
+    メトリクスの基底クラス
+
+    ラベル値のタプルごとに子（値を保持するオブジェクト）を持ちます。
+    頻繁に更新する箇所では labels() で取得した子を保持しておくと、
+    更新時のラベルの検索を省略できます。
+    """
+    type_name = "untyped"
+    # HELP / TYPE 行の名前の接尾辞（カウンターはサンプルと同じ _total 付きの名前を用いる）
+    header_suffix = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *labelvalues: str) -> Any:
+        """
+        ラベル値に対応する子を取得する（存在しない場合は生成する）
+
+        Args:
+            *labelvalues: ラベル値（labelnames の順）
+        """
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(
+                    f"メトリクス '{self.name}' のラベル数が一致しません: {len(labelvalues)} != {len(self.labelnames)}"
+                )
+            child = self._children[labelvalues] = self._new_child()
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _child_samples(self, child: Any, labels: Dict[str, str]) -> Iterator[Sample]:
+        raise NotImplementedError
+
+    def samples(self) -> Iterator[Sample]:
+        """出力するサンプルを列挙する"""
+        for labelvalues, child in sorted(self._children.items()):
+            yield from self._child_samples(child, dict(zip(self.labelnames, labelvalues)))
+
+    def render(self) -> List[str]:
+        """テキスト形式の行に変換する"""
+        lines = [
+            f"# HELP {self.name}{self.header_suffix} {self.documentation}",
+            f"# TYPE {self.name}{self.header_suffix} {self.type_name}",
+        ]
+        for suffix, labels, value in self.samples():
+            if labels:
+                label_text = ",".join(
+                    f'{key}="{_escape_label_value(str(label))}"' for key, label in labels.items()
+                )
+                lines.append(f"{self.name}{suffix}{{{label_text}}} {_format_value(value)}")
+            else:
+                lines.append(f"{self.name}{suffix} {_format_value(value)}")
+        return lines
+
+
+class _Value:
+    """カウンター・ゲージの子（1系列分の値）"""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """
+    単調増加するカウンター
+    """
+    type_name = "counter"
+    header_suffix = "_total"
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """
+        カウンターを増やす
+
+        Args:
+            *labelvalues: ラベル値（labelnames の順）
+            amount: 増分
+        """
+        self.labels(*labelvalues).value += amount
+
+    def set_total(self, *labelvalues: str, value: float) -> None:
+        """累積値を直接設定する（他の統計情報から取り込む場合）"""
+        self.labels(*labelvalues).value = value
+
+    def value(self, *labelvalues: str) -> float:
+        """現在の値を取得する"""
+        child = self._children.get(labelvalues)
+        return child.value if child is not None else 0.0
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def _child_samples(self, child: _Value, labels: Dict[str, str]) -> Iterator[Sample]:
+        yield "_total", labels, child.value
+
+
+class Gauge(_Metric):
+    """
+    増減する値（処理中のリクエスト数など）
+    """
+    type_name = "gauge"
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """値を増やす"""
+        self.labels(*labelvalues).value += amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """値を減らす"""
+        self.labels(*labelvalues).value -= amount
+
+    def set(self, *labelvalues: str, value: float) -> None:
+        """値を設定する"""
+        self.labels(*labelvalues).value = value
+
+    def value(self, *labelvalues: str) -> float:
+        """現在の値を取得する"""
+        child = self._children.get(labelvalues)
+        return child.value if child is not None else 0.0
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def _child_samples(self, child: _Value, labels: Dict[str, str]) -> Iterator[Sample]:
+        yield "", labels, child.value
+
+
+class _HistogramValue:
+    """ヒストグラムの子（1系列分のバケットごとの件数と合計）"""
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # 最後の要素は +Inf のバケット
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    """
+    値の分布（レイテンシなど）を固定のバケットで集計するヒストグラム
+
+    観測時は該当する1バケットのみを加算し、累積は出力時に計算します。
+    """
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """
+        値を観測する
+
+        Args:
+            value: 観測値
+            *labelvalues: ラベル値（labelnames の順）
+        """
+        self.labels(*labelvalues).observe(value)
+
+    def count(self, *labelvalues: str) -> int:
+        """観測回数を取得する"""
+        child = self._children.get(labelvalues)
+        return sum(child.counts) if child is not None else 0
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def _child_samples(self, child: _HistogramValue, labels: Dict[str, str]) -> Iterator[Sample]:
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), child.counts):
+            cumulative += count
+            yield "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+        yield "_sum", labels, child.sum
+        yield "_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """
+    メトリクスの登録先クラス
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        メトリクスを登録する
+
+        Raises:
+            ValueError: 同じ名前のメトリクスが登録済みの場合
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"メトリクス '{metric.name}' は登録済みです")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self, extra: Iterable[_Metric] = ()) -> str:
+        """
+        登録済みのメトリクスをテキスト形式で出力する
+
+        Args:
+            extra: 出力時に追加するメトリクス（他の統計情報から生成したもの）
+
+        Returns:
+            str: Prometheus テキスト形式
+        """
+        lines: List[str] = []
+        for metric in list(self._metrics.values()) + list(extra):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# プロセス共有のメトリクス登録先
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """カウンターを生成して共有の登録先に登録する"""
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """ゲージを生成して共有の登録先に登録する"""
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+) -> Histogram:
+    """ヒストグラムを生成して共有の登録先に登録する"""
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def cache_metrics(caches: Dict[str, Dict[str, Any]]) -> List[_Metric]:
+    """
+    キャッシュの統計情報（cache_stats() 等の辞書）からメトリクスを生成する
+
+    統計情報は各キャッシュが常に集計しているため、出力時に取り込みます。
+
+    Args:
+        caches: キャッシュ名 → 統計情報の辞書
+
+    Returns:
+        List[_Metric]: cache ラベル付きのメトリクス
+    """
+    counters = {
+        key: Counter(f"dokkan_cache_{key}", documentation, ("cache",))
+        for key, documentation in (
+            ("hits", "キャッシュのヒット件数"),
+            ("misses", "キャッシュのミス件数"),
+            ("evictions", "上限超過によるキャッシュの削除件数"),
+            ("expirations", "期限切れによるキャッシュの削除件数"),
+        )
+    }
+    entries = Gauge("dokkan_cache_entries", "キャッシュのエントリ数", ("cache",))
+    size = Gauge("dokkan_cache_bytes", "キャッシュの合計サイズ（見積もりバイト数）", ("cache",))
+    hit_ratio = Gauge("dokkan_cache_hit_ratio", "キャッシュのヒット率（起動以降の累計）", ("cache",))
+
+    for cache_name, stats in caches.items():
+        for key, metric in counters.items():
+            metric.set_total(cache_name, value=stats[key])
+        entries.set(cache_name, value=stats["entries"])
+        size.set(cache_name, value=stats["bytes"])
+        hit_ratio.set(cache_name, value=stats["hit_ratio"])
+    return [*counters.values(), entries, size, hit_ratio]
+
+
+http_request_duration_seconds = histogram(
+    "dokkan_http_request_duration_seconds",
+    "ルートごとのリクエスト処理時間（秒、レスポンスボディの送信を除く）",
+    ("method", "route")
+)
+http_requests_total = counter(
+    "dokkan_http_requests",
+    "ルート・ステータスごとのリクエスト件数",
+    ("method", "route", "status")
+)
+http_requests_in_flight = gauge(
+    "dokkan_http_requests_in_flight",
+    "ルートごとの処理中のリクエスト数",
+    ("method", "route")
+)
+
+
+class MetricsRoute(APIRoute):
+    """
+    リクエスト処理時間・件数・処理中のリクエスト数を計測する APIRoute
+
+    ラベルにはパスパラメータを含まないルートのパス（/api/characters/{character_id} 等）を用いるため、
+    系列数はルート数に比例します。APIRouter(route_class=MetricsRoute) で使用します。
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+        route = self.path_format
+        # メソッドごとの系列（処理時間, 処理中のリクエスト数, ステータス → 件数）は初回のリクエストで取得して保持する
+        # （ルーターに登録した時点のルートはプレフィックスを含まないため、生成時には取得しない）
+        series: Dict[str, Tuple[_HistogramValue, _Value, Dict[int, _Value]]] = {}
+
+        async def instrumented_handler(request: Request) -> Response:
+            method = request.method
+            entry = series.get(method)
+            if entry is None:
+                entry = series[method] = (
+                    http_request_duration_seconds.labels(method, route),
+                    http_requests_in_flight.labels(method, route),
+                    {}
+                )
+            duration, in_flight, by_status = entry
+
+            status = 500
+            in_flight.value += 1
+            started = time.perf_counter()
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                duration.observe(time.perf_counter() - started)
+                in_flight.value -= 1
+                requests = by_status.get(status)
+                if requests is None:
+                    requests = by_status[status] = http_requests_total.labels(method, route, str(status))
+                requests.value += 1
+
+        return instrumented_handler
@@ -0,0 +1,267 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - リクエスト単位のプロファイリング
+
+管理者の X-Profile ヘッダー、または設定のサンプリング割合で選ばれたリクエストを
+cProfile で計測し、pstats 形式のファイルとしてローカルのディレクトリに保存します。
+保存数には上限があり、超えた分は古いものから削除します。
+"""
+
+import asyncio
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, List, Optional
+
+from fastapi import Request, Response
+
+from .admin import is_admin_authorized
+from .config import get_settings
+from .metrics import MetricsRoute
+
+logger = logging.getLogger(__name__)
+
+# プロファイリングを要求するリクエストヘッダー（管理者のみ有効）
+PROFILE_HEADER = "X-Profile"
+# 保存したプロファイル名を返すレスポンスヘッダー
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# プロファイルのファイル名（保存時刻で始まるため名前順が保存順になる）
+_PROFILE_NAME_PATTERN = re.compile(r"^\d{8}T\d{12}Z_[0-9A-Za-z-]+_[0-9a-f]{8}\.prof$")
+
+
+class ProfileNotFoundError(Exception):
+    """指定されたプロファイルが存在しないことを表す例外"""
+
+
+@dataclass
+class ProfileInfo:
+    """
+    保存済みプロファイルの情報
+    """
+    name: str
+    size: int
+    created_at: datetime
+
+
+class ProfileStore:
+    """
+    プロファイル（pstats 形式のファイル）の保存先クラス
+
+    ディレクトリ内のファイル名が規則に一致するものだけを扱い、
+    それ以外のファイルは一覧にも削除の対象にも含めません。
+    """
+
+    def __init__(self, directory: str, max_profiles: int = 50):
+        self.directory = directory
+        self.max_profiles = max(1, max_profiles)
+
+    def save(self, profiler: cProfile.Profile, label: str) -> str:
+        """
+        プロファイルを保存し、上限を超えた古いプロファイルを削除する
+
+        Args:
+            profiler: 計測を終えたプロファイラー
+            label: ファイル名に含める説明（メソッド・ルート・所要時間など）
+
+        Returns:
+            str: 保存したプロファイル名
+        """
+        slug = re.sub(r"[^0-9A-Za-z]+", "-", label).strip("-")[:80] or "request"
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        name = f"{timestamp}_{slug}_{uuid.uuid4().hex[:8]}.prof"
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        # 一覧に書き込み途中のファイルが現れないよう、一時ファイルから置き換える
+        temporary_path = f"{path}.tmp"
+        profiler.dump_stats(temporary_path)
+        os.replace(temporary_path, path)
+
+        self._prune()
+        return name
+
+    def list(self) -> List[ProfileInfo]:
+        """
+        保存済みのプロファイル一覧を取得する
+
+        Returns:
+            List[ProfileInfo]: 新しい順のプロファイル一覧
+        """
+        profiles = []
+        for name in self._names():
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            profiles.append(ProfileInfo(
+                name=name,
+                size=stat.st_size,
+                created_at=datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+            ))
+        return profiles[::-1]
+
+    def path(self, name: str) -> str:
+        """
+        プロファイルのファイルパスを取得する
+
+        Args:
+            name: プロファイル名
+
+        Returns:
+            str: ファイルパス
+
+        Raises:
+            ProfileNotFoundError: プロファイル名が不正、または存在しない場合
+        """
+        if not _PROFILE_NAME_PATTERN.match(name):
+            raise ProfileNotFoundError(f"プロファイル名が不正です: {name}")
+        path = os.path.join(self.directory, name)
+        if not os.path.isfile(path):
+            raise ProfileNotFoundError(f"プロファイルが存在しません: {name}")
+        return path
+
+    def _names(self) -> List[str]:
+        """規則に一致するファイル名を古い順に取得する"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if _PROFILE_NAME_PATTERN.match(name))
+
+    def _prune(self) -> None:
+        """上限を超えた古いプロファイルを削除する"""
+        names = self._names()
+        for name in names[:max(0, len(names) - self.max_profiles)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+
+class RequestProfiler:
+    """
+    リクエスト単位のプロファイラークラス
+
+    cProfile はスレッド単位で計測するため、同時に計測するリクエストは1件のみとし、
+    計測中に届いたリクエストは計測しません。また、計測中のリクエストが await で
+    待機している間にイベントループが処理した他のリクエストも計測結果に含まれます。
+    """
+
+    def __init__(
+        self,
+        store: ProfileStore,
+        sample_rate: float = 0.0,
+        rng: Callable[[], float] = random.random
+    ):
+        self.store = store
+        self.sample_rate = sample_rate
+        self._rng = rng
+        self._active = False
+
+    def should_profile(self, request: Request) -> bool:
+        """
+        リクエストを計測するかどうか
+
+        X-Profile ヘッダーは管理者（X-Admin-Token の一致、またはトークン未設定時のデバッグモード）
+        のみ有効で、それ以外の場合は無視します（リクエスト自体は通常どおり処理します）。
+
+        Args:
+            request: リクエスト
+
+        Returns:
+            bool: 計測する場合は True
+        """
+        if self._active:
+            return False
+        if PROFILE_HEADER.lower() in request.headers:
+            return is_admin_authorized(request.headers.get("x-admin-token"), get_settings())
+        return self.sample_rate > 0.0 and self._rng() < self.sample_rate
+
+    async def profile(
+        self,
+        handler: Callable[[Request], Awaitable[Response]],
+        request: Request,
+        route: str
+    ) -> Response:
+        """
+        ハンドラーを計測しながら実行し、プロファイルを保存する
+
+        保存したプロファイル名は X-Profile-Id ヘッダーで返します。
+        ハンドラーが例外を送出した場合（エラーレスポンス）は保存しません。
+
+        Args:
+            handler: ルートのハンドラー（依存関係の解決・レスポンスの生成を含む）
+            request: リクエスト
+            route: ルートのパス
+
+        Returns:
+            Response: ハンドラーのレスポンス
+        """
+        profiler = cProfile.Profile()
+        self._active = True
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = await handler(request)
+        finally:
+            profiler.disable()
+            self._active = False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        label = f"{request.method}_{route}_{elapsed_ms:.0f}ms"
+        try:
+            name = await asyncio.to_thread(self.store.save, profiler, label)
+        except OSError as e:
+            logger.error(f"プロファイルの保存に失敗: {str(e)}")
+            return response
+        logger.info(f"プロファイルを保存: {name}")
+        response.headers[PROFILE_ID_HEADER] = name
+        return response
+
+
+# プロセス共有のプロファイラー
+_request_profiler: Optional[RequestProfiler] = None
+
+
+def get_request_profiler() -> RequestProfiler:
+    """
+    プロセス共有のリクエストプロファイラーを取得する
+
+    Returns:
+        RequestProfiler: リクエストプロファイラー
+    """
+    global _request_profiler
+    if _request_profiler is None:
+        settings = get_settings()
+        _request_profiler = RequestProfiler(
+            ProfileStore(settings.profile_dir, settings.profile_max_files),
+            sample_rate=settings.profile_sample_rate
+        )
+    return _request_profiler
+
+
+class ProfilingRoute(MetricsRoute):
+    """
+    X-Profile ヘッダーまたはサンプリングで選ばれたリクエストを計測する APIRoute
+
+    計測範囲はリクエストボディの解析・依存関係の解決（サービスの取得）・エンドポイント・
+    レスポンスの生成を含みます。計測しないリクエストの追加の処理は判定のみです。
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+        route = self.path_format
+
+        async def profiling_handler(request: Request) -> Response:
+            profiler = get_request_profiler()
+            if not profiler.should_profile(request):
+                return await handler(request)
+            return await profiler.profile(handler, request, route)
+
+        return profiling_handler
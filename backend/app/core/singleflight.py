@@ -0,0 +1,65 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - シングルフライト
+
+同一キーに対する同時実行中の非同期処理を1つにまとめる機能を提供します。
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    シングルフライトクラス
+
+    同じキーで同時に呼び出された処理は最初の1回だけ実行し、
+    後続の呼び出しはその結果を共有して待ちます。
+    待機側がキャンセルされても共有の処理自体はキャンセルされません。
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """指定キーの処理が実行中かどうか"""
+        return key in self._inflight
+
+    def tasks(self) -> List["asyncio.Task[Any]"]:
+        """実行中の共有処理の一覧（終了時のキャンセル用）"""
+        return list(self._inflight.values())
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        キーに対応する処理を実行する（実行中であればその完了を待つ）
+
+        Args:
+            key: 処理をまとめる単位となるキー
+            factory: 実行する処理（コルーチンを返す関数）
+
+        Returns:
+            T: 処理結果
+
+        Raises:
+            Exception: 共有の処理で発生した例外（全待機者に伝播）
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        # shield により、待機側のキャンセルが共有処理へ伝播しないようにする
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        """完了した処理を実行中一覧から外す"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 全待機者がキャンセル済みの場合でも例外を回収済みにしておく
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,72 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - ORM モデル定義
+
+SQLAlchemy を使用したキャラクター・パッシブスキルのテーブル定義を提供します。
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+
+class Base(DeclarativeBase):
+    """ORM モデルの基底クラス"""
+
+
+class CharacterRecord(Base):
+    """
+    キャラクターテーブル
+    """
+    __tablename__ = "characters"
+
+    id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    name: Mapped[str] = mapped_column(String(256))
+    rarity: Mapped[int] = mapped_column(Integer, index=True)
+    type: Mapped[str] = mapped_column(String(8), index=True)
+    defense_multiplier: Mapped[Optional[float]] = mapped_column(Float, index=True)
+    damage_reduction: Mapped[Optional[float]] = mapped_column(Float, index=True)
+    guard_ability: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+    infinite_defense_stacking: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+    # 直近のカタログ同期時刻（同期に含まれなかったキャラクターの削除判定に使用）
+    synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+    passive_skills: Mapped[List["PassiveSkillRecord"]] = relationship(
+        back_populates="character",
+        order_by="PassiveSkillRecord.position",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+
+class PassiveSkillRecord(Base):
+    """
+    パッシブスキルテーブル
+    """
+    __tablename__ = "passive_skills"
+    __table_args__ = (
+        Index("ix_passive_skills_type_character_id", "type", "character_id"),
+    )
+
+    character_id: Mapped[str] = mapped_column(
+        ForeignKey("characters.id", ondelete="CASCADE"), primary_key=True
+    )
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+    skill_id: Mapped[str] = mapped_column(String(128))
+    type: Mapped[str] = mapped_column(String(32))
+    value: Mapped[float] = mapped_column(Float)
+    condition: Mapped[Optional[str]] = mapped_column(String(256))
+    stackable: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    character: Mapped[CharacterRecord] = relationship(back_populates="passive_skills")
+
+
+class CatalogMetadataRecord(Base):
+    """
+    カタログのメタデータテーブル（カタログバージョンなどのキー・値）
+    """
+    __tablename__ = "catalog_metadata"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str] = mapped_column(String(256))
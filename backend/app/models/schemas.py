@@ -4,7 +4,8 @@
 Pydantic を使用したデータモデルとバリデーション機能を提供します。
 """
 
-from typing import List, Optional, Literal
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Literal
 from pydantic import BaseModel, Field, validator
 
 
@@ -99,12 +100,19 @@ class DamageCalculationRequest(BaseModel):
         }
 
 
+# ダメージ計算結果の詳細度
+# - none: 実効防御力と受けるダメージのみ
+# - summary: 加えてリーダースキル倍率・スタッキングボーナス（パッシブスキル一覧と説明文は省略）
+# - full: 全項目（パッシブスキル一覧と計算詳細の説明文を含む）
+CalculationDetailLevel = Literal["none", "summary", "full"]
+
+
 class AppliedModifiers(BaseModel):
     """
     適用された修正値の詳細
     """
     leader_skill: float = Field(..., description="リーダースキル倍率")
-    passive_skills: List[PassiveSkill] = Field(default=[], description="適用されたパッシブスキル一覧")
+    passive_skills: Optional[List[PassiveSkill]] = Field(default=None, description="適用されたパッシブスキル一覧（detail=full のみ）")
     stacking_bonus: Optional[float] = Field(None, description="スタッキングボーナス（DEF無限上昇用）")
 
 
@@ -114,8 +122,8 @@ class DamageCalculationResult(BaseModel):
     """
     effective_defense: float = Field(..., ge=0, description="実効防御力")
     damage_received: float = Field(..., ge=0, description="受けるダメージ")
-    applied_modifiers: AppliedModifiers = Field(..., description="適用された修正値の詳細")
-    calculation_details: str = Field(..., description="計算詳細の説明文")
+    applied_modifiers: Optional[AppliedModifiers] = Field(None, description="適用された修正値の詳細（detail=summary 以上）")
+    calculation_details: Optional[str] = Field(None, description="計算詳細の説明文（detail=full のみ）")
 
     class Config:
         json_schema_extra = {
@@ -132,6 +140,410 @@ class DamageCalculationResult(BaseModel):
         }
 
 
+class BatchDamageCalculationRequest(BaseModel):
+    """
+    一括ダメージ計算リクエストのデータモデル
+    """
+    requests: List[DamageCalculationRequest] = Field(
+        ..., min_length=1, description="ダメージ計算リクエスト一覧（異なるキャラクターを混在可能）"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "requests": [
+                    {
+                        "def_stat": 15000,
+                        "leader_skill_multiplier": 1.7,
+                        "character_id": "goku_ui",
+                        "enemy_attack": 50000,
+                        "attack_count": 0
+                    },
+                    {
+                        "def_stat": 12000,
+                        "leader_skill_multiplier": 2.0,
+                        "character_id": "vegeta_evolution",
+                        "enemy_attack": 80000,
+                        "attack_count": 3
+                    }
+                ]
+            }
+        }
+
+
+class BatchDamageCalculationResult(BaseModel):
+    """
+    一括ダメージ計算結果のデータモデル
+
+    各リストの i 番目はリクエストの i 番目の行に対応します。
+    """
+    count: int = Field(..., ge=0, description="計算した行数")
+    effective_defense: List[float] = Field(..., description="各行の実効防御力")
+    damage_received: List[float] = Field(..., description="各行の受けるダメージ")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "count": 2,
+                "effective_defense": [94350.0, 76800.0],
+                "damage_received": [0.0, 2560.0]
+            }
+        }
+
+
+# スイープ軸1本あたりの点の数の上限（グリッド全体のセル数の上限はエンドポイントごとの設定値）
+SWEEP_AXIS_MAX_POINTS = 10**9
+
+
+class SweepRange(BaseModel):
+    """
+    スイープ軸の範囲指定（start から stop まで step 刻み、stop を含む）
+    """
+    start: float = Field(..., ge=0, allow_inf_nan=False, description="開始値")
+    stop: float = Field(..., ge=0, allow_inf_nan=False, description="終了値（刻みが割り切れる場合は含む）")
+    step: float = Field(..., gt=0, allow_inf_nan=False, description="刻み幅（0より大きい）")
+
+    @validator('stop')
+    def validate_stop(cls, v, values):
+        """終了値が開始値以上であることのバリデーション"""
+        if 'start' in values and v < values['start']:
+            raise ValueError('終了値は開始値以上である必要があります')
+        return v
+
+    @validator('step')
+    def validate_step(cls, v, values):
+        """軸上の点の数が上限以下であることのバリデーション（極端な範囲・刻み幅での桁あふれを防ぐ）"""
+        if 'start' in values and 'stop' in values:
+            intervals = (values['stop'] - values['start']) / v
+            if not intervals < SWEEP_AXIS_MAX_POINTS:
+                raise ValueError(f'軸上の点の数は{SWEEP_AXIS_MAX_POINTS}以下である必要があります')
+        return v
+
+    def count(self) -> int:
+        """軸上の点の数を返す"""
+        # 浮動小数点誤差で終端が欠けないよう僅かな余裕を持たせる
+        return int((self.stop - self.start) / self.step + 1e-9) + 1
+
+
+def _validate_leader_skill_range(v: SweepRange) -> SweepRange:
+    """リーダースキル倍率のスイープ範囲のバリデーション"""
+    if v.start < 1.0:
+        raise ValueError('リーダースキル倍率は1.0以上である必要があります')
+    if v.stop > 10.0:  # 現実的な上限値
+        raise ValueError('リーダースキル倍率は10.0以下である必要があります')
+    return v
+
+
+class DamageSweepRequest(BaseModel):
+    """
+    DEF × 敵攻撃値 × リーダースキル倍率のグリッドスイープリクエスト
+    """
+    character_id: str = Field(..., description="キャラクターのID")
+    def_stat: SweepRange = Field(..., description="DEFステータス値の範囲")
+    enemy_attack: SweepRange = Field(..., description="敵の攻撃値の範囲")
+    leader_skill_multiplier: SweepRange = Field(..., description="リーダースキル倍率の範囲")
+    attack_count: Optional[int] = Field(default=0, ge=0, description="攻撃回数（DEF無限上昇用、0以上）")
+    format: Literal["binary", "json"] = Field(
+        default="binary", description="出力形式（binary: float32 リトルエンディアン、json: 小規模グリッド用）"
+    )
+
+    @validator('leader_skill_multiplier')
+    def validate_leader_skill_multiplier(cls, v):
+        """リーダースキル倍率の範囲のバリデーション"""
+        return _validate_leader_skill_range(v)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "character_id": "goku_ui",
+                "def_stat": {"start": 10000, "stop": 20000, "step": 1000},
+                "enemy_attack": {"start": 0, "stop": 500000, "step": 10000},
+                "leader_skill_multiplier": {"start": 1.7, "stop": 2.0, "step": 0.3},
+                "attack_count": 0,
+                "format": "json"
+            }
+        }
+
+
+class DamageSweepResult(BaseModel):
+    """
+    グリッドスイープ結果のデータモデル（JSON 形式）
+
+    damage_received[i][j][k] はリーダースキル倍率 i、DEF j、敵攻撃値 k の
+    組み合わせで受けるダメージです。
+    """
+    shape: List[int] = Field(..., description="グリッドの形状（リーダースキル倍率, DEF, 敵攻撃値）")
+    leader_skill_multiplier: List[float] = Field(..., description="リーダースキル倍率の軸")
+    def_stat: List[float] = Field(..., description="DEFステータス値の軸")
+    enemy_attack: List[float] = Field(..., description="敵の攻撃値の軸")
+    damage_received: List[List[List[float]]] = Field(..., description="受けるダメージのグリッド")
+
+
+class SimulatedAttack(BaseModel):
+    """
+    バトルシミュレーションの1ターン内の敵の攻撃1回分
+    """
+    attack: float = Field(..., ge=0, description="敵の攻撃値（fixed: 固定値、uniform・normal: 分布の中心）")
+    distribution: Literal["fixed", "uniform", "normal"] = Field(
+        default="fixed", description="攻撃値の分布（fixed: 固定、uniform: attack ± spread の一様分布、normal: 正規分布）"
+    )
+    spread: float = Field(default=0.0, ge=0, description="分布の幅（uniform: 中心からの幅、normal: 標準偏差）")
+    probability: float = Field(default=1.0, ge=0, le=1, description="この攻撃が発生する確率（0.0〜1.0）")
+    guard_chance: Optional[float] = Field(
+        None, ge=0, le=1,
+        description="ガードが発動する確率（0.0〜1.0、省略時はキャラクターのガード能力に従い常に発動/発動しない）"
+    )
+
+
+class BattleSimulationRequest(BaseModel):
+    """
+    バトルシミュレーション（1ターン分の被ダメージのモンテカルロ試行）リクエストのデータモデル
+    """
+    character_id: str = Field(..., description="キャラクターのID")
+    def_stat: int = Field(..., ge=0, description="DEFステータス値（0以上）")
+    leader_skill_multiplier: float = Field(..., ge=1.0, description="リーダースキル倍率（1.0以上）")
+    hp: int = Field(..., gt=0, description="HP（1ターンの被ダメージの合計と比較）")
+    attacks: List[SimulatedAttack] = Field(
+        ..., min_length=1, max_length=20, description="ターン内の敵の攻撃（順に受ける、最大20回）"
+    )
+    attack_count: Optional[int] = Field(
+        default=0, ge=0, description="ターン開始時点で受けた攻撃回数（DEF無限上昇用、ターン内の攻撃ごとに増加）"
+    )
+    trials: int = Field(default=100000, ge=1, description="試行回数")
+    seed: Optional[int] = Field(None, ge=0, description="乱数シード（省略時は生成し、結果に含めて返す）")
+    percentiles: List[float] = Field(
+        default=[50.0, 90.0, 95.0, 99.0], min_length=1, max_length=20,
+        description="集計するパーセンタイル（0〜100）"
+    )
+
+    @validator('leader_skill_multiplier')
+    def validate_leader_skill_multiplier(cls, v):
+        """リーダースキル倍率のバリデーション"""
+        if v > 10.0:  # 現実的な上限値
+            raise ValueError('リーダースキル倍率は10.0以下である必要があります')
+        return v
+
+    @validator('percentiles')
+    def validate_percentiles(cls, v):
+        """パーセンタイルのバリデーション"""
+        if any(p < 0 or p > 100 for p in v):
+            raise ValueError('パーセンタイルは0〜100である必要があります')
+        return v
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "character_id": "goku_ui",
+                "def_stat": 15000,
+                "leader_skill_multiplier": 1.7,
+                "hp": 150000,
+                "attacks": [
+                    {"attack": 300000, "distribution": "normal", "spread": 30000},
+                    {"attack": 300000, "distribution": "normal", "spread": 30000, "guard_chance": 0.3},
+                    {"attack": 800000, "distribution": "uniform", "spread": 100000, "probability": 0.25}
+                ],
+                "attack_count": 0,
+                "trials": 1000000,
+                "seed": 42,
+                "percentiles": [50, 90, 95, 99]
+            }
+        }
+
+
+class BattleSimulationResult(BaseModel):
+    """
+    バトルシミュレーション結果のデータモデル
+
+    ダメージはいずれも1ターンで受けるダメージの合計です。
+    """
+    trials: int = Field(..., description="試行回数")
+    seed: int = Field(..., description="使用した乱数シード（同じリクエストとシードで同じ結果を再現可能）")
+    hp: int = Field(..., description="HP")
+    mean_damage: float = Field(..., description="被ダメージの平均")
+    std_damage: float = Field(..., description="被ダメージの標準偏差")
+    min_damage: float = Field(..., description="被ダメージの最小値")
+    max_damage: float = Field(..., description="被ダメージの最大値")
+    percentiles: Dict[str, float] = Field(..., description="被ダメージのパーセンタイル（キーは p50 などの形式）")
+    exceed_hp_probability: float = Field(..., description="被ダメージの合計が HP 以上になる確率")
+    attack_mean_damage: List[float] = Field(..., description="攻撃ごとの被ダメージの平均（発生しなかった試行は0として平均）")
+
+
+class SweepJobRequest(BaseModel):
+    """
+    スイープジョブの登録リクエスト（キャラクター × リーダースキル倍率 × DEF × 敵攻撃値）
+    """
+    character_ids: Optional[List[str]] = Field(
+        None, min_length=1, description="対象キャラクターのID一覧（省略時は全キャラクター）"
+    )
+    def_stat: SweepRange = Field(..., description="DEFステータス値の範囲")
+    enemy_attack: SweepRange = Field(..., description="敵の攻撃値の範囲")
+    leader_skill_multiplier: SweepRange = Field(..., description="リーダースキル倍率の範囲")
+    attack_count: Optional[int] = Field(default=0, ge=0, description="攻撃回数（DEF無限上昇用、0以上）")
+
+    @validator('leader_skill_multiplier')
+    def validate_leader_skill_multiplier(cls, v):
+        """リーダースキル倍率の範囲のバリデーション"""
+        return _validate_leader_skill_range(v)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "character_ids": None,
+                "def_stat": {"start": 15000, "stop": 15000, "step": 1},
+                "enemy_attack": {"start": 0, "stop": 9999990, "step": 10},
+                "leader_skill_multiplier": {"start": 1.7, "stop": 1.7, "step": 0.1},
+                "attack_count": 0
+            }
+        }
+
+
+class SweepJobStatus(BaseModel):
+    """
+    スイープジョブの状態のデータモデル
+
+    結果は形状 shape の C 順の float32 リトルエンディアン配列で、チャンク i は
+    行（敵攻撃値の軸1本分）の [i × chunk_rows, (i + 1) × chunk_rows) を含みます。
+    """
+    job_id: str = Field(..., description="ジョブID")
+    status: Literal["queued", "running", "completed", "failed", "cancelled"] = Field(..., description="ジョブの状態")
+    shape: List[int] = Field(..., description="結果の形状（キャラクター, リーダースキル倍率, DEF, 敵攻撃値）")
+    character_ids: List[str] = Field(..., description="結果の第1軸のキャラクターID")
+    chunk_count: int = Field(..., description="チャンク数")
+    chunk_rows: int = Field(..., description="1チャンクあたりの行数（最終チャンクは少ない場合あり）")
+    completed_chunks: int = Field(..., description="計算が完了したチャンク数")
+    progress: float = Field(..., ge=0, le=1, description="進捗（0〜1）")
+    error: Optional[str] = Field(None, description="失敗した場合のエラー内容")
+    created_at: datetime = Field(..., description="登録時刻")
+    started_at: Optional[datetime] = Field(None, description="実行開始時刻")
+    finished_at: Optional[datetime] = Field(None, description="終了時刻")
+
+
+class DamageCoefficientsResponse(BaseModel):
+    """
+    コンパイル済みダメージ計算係数のデータモデル（デバッグ用）
+    """
+    character_id: str = Field(..., description="キャラクターID")
+    defense_boost_percent: float = Field(..., description="防御力倍率と defense_boost スキルの合計（%）")
+    stacking_rate_per_attack: float = Field(..., description="攻撃1回あたりのDEF上昇率（%）")
+    damage_reduction: float = Field(..., description="ダメージ軽減率（%、クランプ済み）")
+    guard_factor: float = Field(..., description="ガード適用時の被ダメージ倍率")
+    damage_factor: float = Field(..., description="軽減率とガードを合成した被ダメージ倍率")
+    passive_skills: List[PassiveSkill] = Field(default=[], description="コンパイル元のパッシブスキル一覧")
+
+
+class CacheStatsResponse(BaseModel):
+    """
+    キャッシュ統計情報のデータモデル
+    """
+    entries: int = Field(..., ge=0, description="現在のエントリ数")
+    bytes: int = Field(..., ge=0, description="現在の合計サイズ（見積もりバイト数）")
+    max_entries: int = Field(..., description="最大エントリ数")
+    max_bytes: Optional[int] = Field(None, description="合計サイズ上限（バイト）")
+    hits: int = Field(..., ge=0, description="ヒット件数")
+    misses: int = Field(..., ge=0, description="ミス件数")
+    evictions: int = Field(..., ge=0, description="上限超過による削除件数")
+    expirations: int = Field(..., ge=0, description="期限切れによる削除件数")
+    hit_ratio: float = Field(..., ge=0, le=1, description="ヒット率")
+
+
+class ProfileInfoResponse(BaseModel):
+    """
+    保存済みプロファイルの情報のデータモデル
+    """
+    name: str = Field(..., description="プロファイル名（保存時刻_メソッド-ルート-所要時間_ID.prof）")
+    size: int = Field(..., ge=0, description="ファイルサイズ（バイト）")
+    created_at: datetime = Field(..., description="保存時刻")
+
+
+class ProfileListResponse(BaseModel):
+    """
+    保存済みプロファイル一覧のデータモデル
+    """
+    items: List[ProfileInfoResponse] = Field(..., description="プロファイル一覧（新しい順）")
+    max_profiles: int = Field(..., description="保存するプロファイルの最大数")
+
+
+# キャラクター一覧の並び替えの種類（"-" 始まりは降順、値なしのキャラクターは末尾）
+CharacterSort = Literal[
+    "id",
+    "defense_multiplier",
+    "-defense_multiplier",
+    "damage_reduction",
+    "-damage_reduction"
+]
+
+
+class CharacterQuery(BaseModel):
+    """
+    キャラクター一覧の絞り込み条件・並び替えのデータモデル
+    """
+    type: Optional[str] = Field(None, description="属性タイプ（AGL, TEQ, INT, STR, PHY）")
+    rarity: Optional[int] = Field(None, ge=1, le=6, description="レアリティ（1-6星）")
+    guard_ability: Optional[bool] = Field(None, description="ガード能力の有無")
+    infinite_defense_stacking: Optional[bool] = Field(None, description="DEF無限上昇能力の有無")
+    skill_type: Optional[Literal["defense_boost", "damage_reduction", "guard", "infinite_stacking"]] = Field(
+        None, description="保有するパッシブスキルのタイプ"
+    )
+    sort: CharacterSort = Field(default="id", description="並び替えの種類")
+
+    @validator('type')
+    def validate_type(cls, v):
+        """属性タイプのバリデーション"""
+        if v is None:
+            return v
+        valid_types = ['AGL', 'TEQ', 'INT', 'STR', 'PHY']
+        if v.upper() not in valid_types:
+            raise ValueError(f'属性タイプは {valid_types} のいずれかである必要があります')
+        return v.upper()
+
+
+class CharacterListResponse(BaseModel):
+    """
+    キャラクター一覧（ページ）レスポンスのデータモデル
+    """
+    items: List[Dict[str, Any]] = Field(..., description="キャラクター一覧（fields 指定時は指定項目のみ）")
+    total: int = Field(..., ge=0, description="条件に一致するキャラクターの総数")
+    next_cursor: Optional[str] = Field(None, description="次のページのカーソル（最終ページの場合はnull）")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {"id": "goku_ui", "name": "孫悟空（身勝手の極意）", "defense_multiplier": 150.0}
+                ],
+                "total": 2,
+                "next_cursor": "WyItZGVmZW5zZV9tdWx0aXBsaWVyIiwwLC0xNTAuMCwiZ29rdV91aSJd"
+            }
+        }
+
+
+class CharacterSearchHit(BaseModel):
+    """
+    キャラクター名検索の結果1件のデータモデル
+    """
+    id: str = Field(..., description="キャラクターの一意識別子")
+    name: str = Field(..., description="キャラクター名")
+    type: str = Field(..., description="属性タイプ")
+    rarity: int = Field(..., description="レアリティ")
+    match: Literal["exact", "prefix", "substring", "fuzzy"] = Field(..., description="一致の種類")
+
+
+class CharacterSearchResponse(BaseModel):
+    """
+    キャラクター名検索レスポンスのデータモデル
+    """
+    items: List[CharacterSearchHit] = Field(..., description="検索結果（上位順）")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {"id": "goku_ui", "name": "孫悟空（身勝手の極意）", "type": "AGL", "rarity": 6, "match": "prefix"}
+                ]
+            }
+        }
+
+
 class ApiError(BaseModel):
     """
     API エラーレスポンスのデータモデル
@@ -150,17 +562,62 @@ class ApiError(BaseModel):
         }
 
 
+class CircuitBreakerStatus(BaseModel):
+    """
+    サーキットブレーカー状態のデータモデル
+    """
+    name: str = Field(..., description="対象の依存先")
+    state: Literal["closed", "open", "half_open"] = Field(..., description="状態")
+    consecutive_failures: int = Field(..., description="連続失敗回数")
+    retry_after: Optional[float] = Field(None, description="遮断解除までの秒数（遮断中のみ）")
+    total_failures: int = Field(..., description="累計失敗回数")
+    total_rejections: int = Field(..., description="遮断により拒否した累計呼び出し数")
+    open_count: int = Field(..., description="遮断した累計回数")
+
+
 class HealthCheckResponse(BaseModel):
     """
     ヘルスチェックレスポンスのデータモデル
     """
     status: str = Field(..., description="サービスの状態")
     service: str = Field(..., description="サービス名")
+    upstream: Optional[CircuitBreakerStatus] = Field(None, description="外部キャラクターAPIのサーキットブレーカー状態")
 
     class Config:
         json_schema_extra = {
             "example": {
                 "status": "healthy",
-                "service": "dokkan-damage-calculator-api"
+                "service": "dokkan-damage-calculator-api",
+                "upstream": {
+                    "name": "character_api",
+                    "state": "closed",
+                    "consecutive_failures": 0,
+                    "retry_after": None,
+                    "total_failures": 0,
+                    "total_rejections": 0,
+                    "open_count": 0
+                }
+            }
+        }
+
+
+class ReadinessResponse(BaseModel):
+    """
+    レディネスチェックレスポンスのデータモデル
+    """
+    status: Literal["ready", "not_ready"] = Field(..., description="トラフィックを受け付けられるかどうか")
+    warmup: str = Field(..., description="ウォームアップの状態（pending, running, completed, failed, skipped）")
+    warmup_seconds: Optional[float] = Field(None, description="ウォームアップの所要時間（秒、未完了の場合はNone）")
+    warmup_error: Optional[str] = Field(None, description="ウォームアップが失敗した理由")
+    catalog_loaded: bool = Field(..., description="外部APIまたはデータベースのキャラクター一覧を保持しているかどうか")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "status": "ready",
+                "warmup": "completed",
+                "warmup_seconds": 0.42,
+                "warmup_error": None,
+                "catalog_loaded": True
             }
         }
\ No newline at end of file
@@ -0,0 +1 @@
+# リポジトリ層パッケージの初期化
\ No newline at end of file
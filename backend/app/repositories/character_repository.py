@@ -0,0 +1,350 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - キャラクターリポジトリ
+
+SQLAlchemy を使用してキャラクターとパッシブスキルを永続化・検索する
+リポジトリクラスです。メソッドは同期 I/O のため、非同期コードからは
+asyncio.to_thread 経由で呼び出してください。
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, case, delete, func, select, tuple_
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..models.orm import CatalogMetadataRecord, CharacterRecord, PassiveSkillRecord
+from ..models.schemas import Character, CharacterQuery, PassiveSkill
+
+# 1回の INSERT 文にまとめる行数（SQLite のバインド変数上限を考慮）
+UPSERT_CHUNK_SIZE = 100
+
+# カタログバージョンを保存するメタデータのキー
+CATALOG_VERSION_KEY = "catalog_version"
+
+
+def _chunks(items: Sequence, size: int) -> Iterator[Sequence]:
+    """シーケンスを指定サイズごとに分割する"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _record_to_character(record: CharacterRecord) -> Character:
+    """
+    テーブルの行をキャラクターに変換する
+
+    同期時に検証済みのデータのため、バリデーションを省略して生成します。
+    """
+    return Character.model_construct(
+        id=record.id,
+        name=record.name,
+        rarity=record.rarity,
+        type=record.type,
+        passive_skills=[
+            PassiveSkill.model_construct(
+                id=skill.skill_id,
+                type=skill.type,
+                value=skill.value,
+                condition=skill.condition,
+                stackable=skill.stackable,
+            )
+            for skill in record.passive_skills
+        ],
+        defense_multiplier=record.defense_multiplier,
+        damage_reduction=record.damage_reduction,
+        guard_ability=record.guard_ability,
+        infinite_defense_stacking=record.infinite_defense_stacking,
+    )
+
+
+class CharacterRepository:
+    """
+    キャラクターリポジトリクラス
+
+    外部APIから取得したカタログの一括同期と、ID・属性タイプ・レアリティ・
+    パッシブスキルタイプによる索引付き検索を提供します。
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        self._session_factory = session_factory
+
+    def sync_catalog(
+        self,
+        characters: Sequence[Character],
+        prune: bool = True,
+        catalog_version: Optional[str] = None
+    ) -> int:
+        """
+        カタログを一括で upsert する
+
+        Args:
+            characters: 外部APIから取得したキャラクター一覧
+            prune: 今回の一覧に含まれないキャラクターを削除するかどうか
+            catalog_version: 同じトランザクションで保存するカタログバージョン
+
+        Returns:
+            int: 同期したキャラクター数
+        """
+        synced_at = datetime.now(timezone.utc)
+
+        with self._session_factory.begin() as session:
+            insert = self._dialect_insert(session)
+            for chunk in _chunks(characters, UPSERT_CHUNK_SIZE):
+                rows = [
+                    {
+                        "id": c.id,
+                        "name": c.name,
+                        "rarity": c.rarity,
+                        "type": c.type,
+                        "defense_multiplier": c.defense_multiplier,
+                        "damage_reduction": c.damage_reduction,
+                        "guard_ability": bool(c.guard_ability),
+                        "infinite_defense_stacking": bool(c.infinite_defense_stacking),
+                        "synced_at": synced_at,
+                    }
+                    for c in chunk
+                ]
+                statement = insert(CharacterRecord).values(rows)
+                session.execute(statement.on_conflict_do_update(
+                    index_elements=[CharacterRecord.id],
+                    set_={
+                        column: statement.excluded[column]
+                        for column in rows[0] if column != "id"
+                    },
+                ))
+
+                # パッシブスキルはキャラクター単位で置き換える
+                session.execute(
+                    delete(PassiveSkillRecord)
+                    .where(PassiveSkillRecord.character_id.in_([c.id for c in chunk]))
+                )
+                skill_rows = [
+                    {
+                        "character_id": c.id,
+                        "position": position,
+                        "skill_id": skill.id,
+                        "type": skill.type,
+                        "value": skill.value,
+                        "condition": skill.condition,
+                        "stackable": skill.stackable,
+                    }
+                    for c in chunk
+                    for position, skill in enumerate(c.passive_skills)
+                ]
+                if skill_rows:
+                    session.execute(insert(PassiveSkillRecord), skill_rows)
+
+            if prune:
+                stale_ids = select(CharacterRecord.id).where(CharacterRecord.synced_at < synced_at)
+                session.execute(
+                    delete(PassiveSkillRecord).where(PassiveSkillRecord.character_id.in_(stale_ids))
+                )
+                session.execute(delete(CharacterRecord).where(CharacterRecord.synced_at < synced_at))
+
+            if catalog_version is not None:
+                session.merge(CatalogMetadataRecord(key=CATALOG_VERSION_KEY, value=catalog_version))
+
+        return len(characters)
+
+    def get(self, character_id: str) -> Optional[Character]:
+        """
+        ID でキャラクターを取得する（主キー検索）
+
+        Args:
+            character_id: キャラクターID
+
+        Returns:
+            Optional[Character]: キャラクター（存在しない場合はNone）
+        """
+        with self._session_factory() as session:
+            record = session.get(CharacterRecord, character_id)
+            return _record_to_character(record) if record is not None else None
+
+    def get_many(self, character_ids: Sequence[str]) -> Dict[str, Character]:
+        """
+        複数の ID でキャラクターを取得する
+
+        Args:
+            character_ids: キャラクターID一覧
+
+        Returns:
+            Dict[str, Character]: ID をキーとするキャラクター（存在しない ID は含まない）
+        """
+        found: Dict[str, Character] = {}
+        with self._session_factory() as session:
+            for chunk in _chunks(list(character_ids), UPSERT_CHUNK_SIZE * 5):
+                records = session.scalars(
+                    select(CharacterRecord).where(CharacterRecord.id.in_(chunk))
+                )
+                for record in records:
+                    found[record.id] = _record_to_character(record)
+        return found
+
+    def find(
+        self,
+        type: Optional[str] = None,
+        rarity: Optional[int] = None,
+        skill_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Character]:
+        """
+        条件に一致するキャラクターを ID 順に検索する（各条件は索引を使用）
+
+        Args:
+            type: 属性タイプ
+            rarity: レアリティ
+            skill_type: 保有するパッシブスキルのタイプ
+            limit: 最大件数（None で無制限）
+            offset: 読み飛ばす件数
+
+        Returns:
+            List[Character]: 条件に一致するキャラクター一覧
+        """
+        statement = select(CharacterRecord).order_by(CharacterRecord.id)
+        if type is not None:
+            statement = statement.where(CharacterRecord.type == type.upper())
+        if rarity is not None:
+            statement = statement.where(CharacterRecord.rarity == rarity)
+        if skill_type is not None:
+            statement = statement.where(CharacterRecord.id.in_(
+                select(PassiveSkillRecord.character_id).where(PassiveSkillRecord.type == skill_type)
+            ))
+        if limit is not None:
+            statement = statement.limit(limit)
+        if offset:
+            statement = statement.offset(offset)
+
+        with self._session_factory() as session:
+            return [_record_to_character(record) for record in session.scalars(statement)]
+
+    def search(
+        self,
+        query: CharacterQuery,
+        limit: int,
+        after: Optional[Tuple[int, float, str]] = None
+    ) -> Tuple[List[Character], int]:
+        """
+        条件に一致するキャラクターを並び順に検索する（キーセットページング）
+
+        並び替えキーは services.character_index.sort_key と同じ
+        （値なしフラグ, 値（降順は符号反転）, ID）の順序です。
+
+        Args:
+            query: 絞り込み条件と並び替えの種類
+            limit: 最大件数
+            after: この並び替えキーより後のキャラクターから取得する
+
+        Returns:
+            Tuple[List[Character], int]: キャラクター一覧と、条件に一致する総件数
+        """
+        filtered = self._filter(select(CharacterRecord), query)
+
+        if query.sort == "id":
+            sort_columns = (CharacterRecord.id,)
+            after_values = None if after is None else (after[2],)
+        else:
+            column = getattr(CharacterRecord, query.sort.lstrip("-"))
+            value = func.coalesce(column, 0.0)
+            sort_columns = (
+                case((column.is_(None), 1), else_=0),
+                -value if query.sort.startswith("-") else value,
+                CharacterRecord.id,
+            )
+            after_values = after
+
+        statement = filtered.order_by(*sort_columns).limit(limit)
+        if after_values is not None:
+            statement = statement.where(tuple_(*sort_columns) > tuple_(*after_values))
+
+        with self._session_factory() as session:
+            total = session.scalar(select(func.count()).select_from(filtered.subquery())) or 0
+            characters = [_record_to_character(record) for record in session.scalars(statement)]
+        return characters, total
+
+    def list_all(self) -> List[Character]:
+        """
+        全キャラクターを ID 順に取得する
+
+        Returns:
+            List[Character]: キャラクター一覧
+        """
+        return self.find()
+
+    def list_name_entries(self) -> List[Tuple[str, str, str, int]]:
+        """
+        全キャラクターの ID・名前・属性タイプ・レアリティを取得する（名前索引の構築用）
+
+        Returns:
+            List[Tuple[str, str, str, int]]: (ID, 名前, 属性タイプ, レアリティ) の一覧
+        """
+        statement = select(
+            CharacterRecord.id, CharacterRecord.name, CharacterRecord.type, CharacterRecord.rarity
+        ).order_by(CharacterRecord.id)
+        with self._session_factory() as session:
+            return [tuple(row) for row in session.execute(statement)]
+
+    def count(self) -> int:
+        """
+        保存されているキャラクター数を取得する
+
+        Returns:
+            int: キャラクター数
+        """
+        with self._session_factory() as session:
+            return session.scalar(select(func.count()).select_from(CharacterRecord)) or 0
+
+    def catalog_version(self) -> Optional[str]:
+        """
+        直近に同期したカタログのバージョンを取得する
+
+        Returns:
+            Optional[str]: カタログバージョン（未保存の場合はNone）
+        """
+        with self._session_factory() as session:
+            record = session.get(CatalogMetadataRecord, CATALOG_VERSION_KEY)
+            return record.value if record is not None else None
+
+    def last_synced_at(self) -> Optional[datetime]:
+        """
+        直近のカタログ同期時刻を取得する
+
+        Returns:
+            Optional[datetime]: 同期時刻（UTC、未同期の場合はNone）
+        """
+        with self._session_factory() as session:
+            synced_at = session.scalar(select(func.max(CharacterRecord.synced_at)))
+        if synced_at is not None and synced_at.tzinfo is None:
+            # SQLite はタイムゾーンを保持しないため UTC として扱う
+            synced_at = synced_at.replace(tzinfo=timezone.utc)
+        return synced_at
+
+    @staticmethod
+    def _filter(statement: Select, query: CharacterQuery) -> Select:
+        """絞り込み条件を WHERE 句に追加する"""
+        if query.type is not None:
+            statement = statement.where(CharacterRecord.type == query.type)
+        if query.rarity is not None:
+            statement = statement.where(CharacterRecord.rarity == query.rarity)
+        if query.guard_ability is not None:
+            statement = statement.where(CharacterRecord.guard_ability == query.guard_ability)
+        if query.infinite_defense_stacking is not None:
+            statement = statement.where(
+                CharacterRecord.infinite_defense_stacking == query.infinite_defense_stacking
+            )
+        if query.skill_type is not None:
+            statement = statement.where(CharacterRecord.id.in_(
+                select(PassiveSkillRecord.character_id).where(PassiveSkillRecord.type == query.skill_type)
+            ))
+        return statement
+
+    @staticmethod
+    def _dialect_insert(session: Session):
+        """接続先に応じた upsert 対応の insert 関数を返す"""
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise NotImplementedError(f"未対応のデータベースです: {dialect}")
+        return insert
@@ -0,0 +1,102 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - バトルシミュレーション
+
+1ターン内に複数回受ける敵の攻撃を、攻撃値の分布・攻撃の発生確率・ガードの発動確率を
+与えてモンテカルロ試行し、試行ごとの被ダメージの合計を求めます。
+各攻撃のダメージはベクトル化ダメージ計算カーネル（calculate_damage_arrays）で計算します。
+"""
+
+from dataclasses import replace
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from ..models.schemas import SimulatedAttack
+from .damage_coefficients import GUARD_REDUCTION_RATE, DamageCoefficients
+from .damage_kernel import build_character_arrays, calculate_damage_arrays
+
+# 1回に配列で処理する試行数（一時配列のメモリを抑え、CPU キャッシュに収める）
+CHUNK_TRIALS = 1 << 16
+
+
+def _sample_attack(rng: np.random.Generator, attack: SimulatedAttack, size: int) -> np.ndarray:
+    """敵の攻撃値を分布に従って生成する（負の値は0に切り詰める）"""
+    if attack.distribution == "fixed" or attack.spread == 0:
+        return np.full(size, attack.attack)
+    if attack.distribution == "uniform":
+        values = rng.uniform(attack.attack - attack.spread, attack.attack + attack.spread, size)
+    else:
+        values = rng.normal(attack.attack, attack.spread, size)
+    return np.maximum(values, 0.0, out=values)
+
+
+def simulate_turn_damage(
+    coefficients: DamageCoefficients,
+    def_stat: float,
+    leader_skill_multiplier: float,
+    attacks: Sequence[SimulatedAttack],
+    trials: int,
+    rng: np.random.Generator,
+    attack_count: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    1ターン分の被ダメージをモンテカルロ試行する
+
+    各試行では attacks を順に受け、DEF無限上昇の攻撃回数はターン開始時点の回数に
+    それまでに発生した攻撃の回数を加えたものとします。guard_chance を指定した攻撃は
+    その確率でガード（被ダメージ × (1 - GUARD_REDUCTION_RATE)）し、省略した攻撃は
+    キャラクターのガード能力に従います。
+
+    乱数は試行をチャンクに分けて攻撃ごとに「攻撃値・ガード・発生」の順に生成するため、
+    同じシードと入力であれば同じ結果になります。
+
+    Args:
+        coefficients: キャラクターのダメージ計算係数
+        def_stat: DEFステータス値
+        leader_skill_multiplier: リーダースキル倍率
+        attacks: ターン内の敵の攻撃（受ける順）
+        trials: 試行回数
+        rng: 乱数生成器
+        attack_count: ターン開始時点で受けた攻撃回数
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (試行ごとの被ダメージの合計 (trials,), 攻撃ごとの被ダメージの合計 (攻撃数,))
+    """
+    # ガードは攻撃ごとに判定するため、ガードを含まない被ダメージ倍率で計算する
+    arrays = build_character_arrays([replace(
+        coefficients,
+        guard_factor=1.0,
+        damage_factor=1 - coefficients.damage_reduction / 100
+    )])
+    guard_multiplier = 1 - GUARD_REDUCTION_RATE
+
+    totals = np.empty(trials, dtype=np.float64)
+    attack_totals = np.zeros(len(attacks), dtype=np.float64)
+    for start in range(0, trials, CHUNK_TRIALS):
+        size = min(CHUNK_TRIALS, trials - start)
+        total = totals[start:start + size]
+        total.fill(0.0)
+        received = np.full(size, float(attack_count))
+
+        for i, attack in enumerate(attacks):
+            enemy_attack = _sample_attack(rng, attack, size)
+            _, damage = calculate_damage_arrays(
+                arrays, 0, def_stat, leader_skill_multiplier, enemy_attack, received
+            )
+
+            if attack.guard_chance is None:
+                damage *= coefficients.guard_factor
+            elif attack.guard_chance > 0:
+                damage[rng.random(size) < attack.guard_chance] *= guard_multiplier
+
+            if attack.probability < 1:
+                occurred = rng.random(size) < attack.probability
+                damage *= occurred
+                received += occurred
+            else:
+                received += 1
+
+            total += damage
+            attack_totals[i] += damage.sum()
+
+    return totals, attack_totals
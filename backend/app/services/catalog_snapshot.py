@@ -0,0 +1,251 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - カタログスナップショット
+
+正規化済みのキャラクター一覧をローカルファイルへ保存・読み込みし、
+ワーカー再起動時に外部APIを待たずにカタログを復元する機能を提供します。
+
+ファイル形式（リトルエンディアン）:
+    マジック "DKCS"(4) | 形式バージョン u16 | 予約 u16 | ヘッダー長 u32 |
+    ヘッダー JSON | ID 一覧 JSON | 行オフセット u32 × (件数 + 1) | 行データ
+
+行データはキャラクター1体を位置ベースの JSON 配列で表したものを連結したもので、
+読み込み時は ID 一覧とオフセット表だけを解析します。各行は参照時に
+オフセット表から切り出して復元します（CatalogSnapshot.character_at）。
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import List
+
+from ..models.schemas import Character, PassiveSkill
+
+SNAPSHOT_MAGIC = b"DKCS"
+SNAPSHOT_FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct("<4sHHI")
+
+
+class SnapshotError(Exception):
+    """スナップショットの形式不正・破損を表す例外"""
+
+
+class CatalogSnapshot:
+    """
+    読み込んだスナップショット
+
+    行データはバイト列のまま保持し、キャラクターは参照時に復元します。
+    """
+
+    def __init__(
+        self,
+        ids: List[str],
+        offsets: array,
+        rows: memoryview,
+        catalog_version: str,
+        created_at: float
+    ):
+        self.ids = ids                          # キャラクターID一覧（行順）
+        self.catalog_version = catalog_version  # 行データの SHA-256（内容が同じなら同じ値）
+        self.created_at = created_at            # 保存時刻（UNIX 時刻）
+        self._offsets = offsets
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def character_at(self, i: int) -> Character:
+        """
+        行番号のキャラクターを復元する
+
+        Args:
+            i: 行番号
+
+        Returns:
+            Character: キャラクター
+        """
+        row = json.loads(bytes(self._rows[self._offsets[i]:self._offsets[i + 1]]))
+        return _row_to_character(row)
+
+
+def _character_to_row(character: Character) -> list:
+    """キャラクターを位置ベースのコンパクトな行に変換する"""
+    return [
+        character.id,
+        character.name,
+        character.rarity,
+        character.type,
+        character.defense_multiplier,
+        character.damage_reduction,
+        character.guard_ability,
+        character.infinite_defense_stacking,
+        [
+            [skill.id, skill.type, skill.value, skill.condition, skill.stackable]
+            for skill in character.passive_skills
+        ],
+    ]
+
+
+def _row_to_character(row: list) -> Character:
+    """
+    行をキャラクターに復元する
+
+    保存時に検証済みのデータのため、バリデーションを省略して生成します。
+    """
+    (character_id, name, rarity, type_, defense_multiplier, damage_reduction,
+     guard_ability, infinite_defense_stacking, skills) = row
+    return Character.model_construct(
+        id=character_id,
+        name=name,
+        rarity=rarity,
+        type=type_,
+        passive_skills=[
+            PassiveSkill.model_construct(
+                id=skill_id, type=skill_type, value=value, condition=condition, stackable=stackable
+            )
+            for skill_id, skill_type, value, condition, stackable in skills
+        ],
+        defense_multiplier=defense_multiplier,
+        damage_reduction=damage_reduction,
+        guard_ability=guard_ability,
+        infinite_defense_stacking=infinite_defense_stacking,
+    )
+
+
+def _little_endian(values: array) -> array:
+    """配列をリトルエンディアンのバイト順にそろえる"""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _encode_rows(characters: List[Character]) -> List[bytes]:
+    """キャラクター一覧を行データ（JSON 配列のバイト列）に変換する"""
+    return [
+        json.dumps(_character_to_row(c), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        for c in characters
+    ]
+
+
+def compute_catalog_version(characters: List[Character]) -> str:
+    """
+    カタログバージョンを計算する
+
+    スナップショットの catalog_version と同じ値（行データの SHA-256）で、
+    内容が同じキャラクター一覧であればプロセスをまたいで同じ値になります。
+
+    Args:
+        characters: キャラクター一覧
+
+    Returns:
+        str: カタログバージョン
+    """
+    digest = hashlib.sha256()
+    for row in _encode_rows(characters):
+        digest.update(row)
+    return digest.hexdigest()
+
+
+def write_snapshot(path: str, characters: List[Character]) -> str:
+    """
+    キャラクター一覧をスナップショットファイルに保存する
+
+    一時ファイルに書き込んでから置き換えるため、読み込み側が書きかけの
+    ファイルを読むことはありません。
+
+    Args:
+        path: 保存先のファイルパス
+        characters: キャラクター一覧
+
+    Returns:
+        str: カタログバージョン（行データの SHA-256）
+    """
+    encoded_rows = _encode_rows(characters)
+    offsets = array("I", [0])
+    for row in encoded_rows:
+        offsets.append(offsets[-1] + len(row))
+    rows = b"".join(encoded_rows)
+    ids = json.dumps([c.id for c in characters], ensure_ascii=False).encode("utf-8")
+
+    catalog_version = hashlib.sha256(rows).hexdigest()
+    header = json.dumps({
+        "catalog_version": catalog_version,
+        "count": len(characters),
+        "ids_length": len(ids),
+        "created_at": time.time(),
+    }).encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, 0, len(header)))
+        f.write(header)
+        f.write(ids)
+        f.write(_little_endian(offsets).tobytes())
+        f.write(rows)
+    os.replace(tmp_path, path)
+
+    return catalog_version
+
+
+def read_snapshot(path: str) -> CatalogSnapshot:
+    """
+    スナップショットファイルを読み込む
+
+    Args:
+        path: スナップショットのファイルパス
+
+    Returns:
+        CatalogSnapshot: 読み込んだスナップショット
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+        SnapshotError: 形式バージョン不一致やデータ破損の場合
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _PREAMBLE.size:
+        raise SnapshotError("スナップショットが短すぎます")
+    magic, format_version, _, header_length = _PREAMBLE.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("スナップショットのマジックが一致しません")
+    if format_version != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"未対応のスナップショット形式バージョンです: {format_version}")
+
+    view = memoryview(data)
+    position = _PREAMBLE.size
+    try:
+        header = json.loads(bytes(view[position:position + header_length]))
+        position += header_length
+
+        ids = json.loads(bytes(view[position:position + header["ids_length"]]))
+        position += header["ids_length"]
+
+        offsets = array("I")
+        offsets_length = (header["count"] + 1) * offsets.itemsize
+        offsets.frombytes(view[position:position + offsets_length])
+        offsets = _little_endian(offsets)
+        position += offsets_length
+    except (ValueError, KeyError) as e:
+        raise SnapshotError(f"スナップショットが破損しています: {e}") from e
+
+    rows = view[position:]
+    if len(ids) != header["count"] or offsets[-1] != len(rows):
+        raise SnapshotError("スナップショットの件数またはサイズが一致しません")
+    if hashlib.sha256(rows).hexdigest() != header["catalog_version"]:
+        raise SnapshotError("スナップショットのチェックサムが一致しません")
+
+    return CatalogSnapshot(
+        ids=ids,
+        offsets=offsets,
+        rows=rows,
+        catalog_version=header["catalog_version"],
+        created_at=header["created_at"],
+    )
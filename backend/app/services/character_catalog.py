@@ -0,0 +1,252 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - キャラクターカタログ
+
+取得済みのキャラクター一覧と、その ID 索引・二次索引・ダメージ計算係数を
+まとめた読み取り専用のスナップショットを提供します。
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from weakref import WeakValueDictionary
+
+from ..models.schemas import Character, CharacterQuery
+from .character_index import CharacterIndex, SortKey
+from .character_store import CharacterStore
+from .damage_coefficients import DamageCoefficients, compile_character
+from .name_search import NameEntry
+
+# ID で取得した直近のキャラクターを保持する件数（ストアからの Character の生成を省く）
+RECENT_CHARACTERS = 1024
+
+
+@dataclass(slots=True)
+class _RecentCharacter:
+    """
+    ID で取得した直近のキャラクター（係数は最初の取得時に生成する）
+    """
+    row: int
+    character: Character
+    coefficients: Optional[DamageCoefficients] = None
+
+
+class CharacterCatalog:
+    """
+    キャラクターカタログクラス
+
+    一覧取得のたびに新しいインスタンスを生成して丸ごと差し替えるため、
+    生成後に内容が変わることはありません。
+
+    キャラクターは列指向のストア（CharacterStore）に保持し、Character オブジェクトは
+    参照された時点で行から生成します。生成した Character は弱参照で追跡し、
+    参照されている間は同じ行に同じオブジェクトを返します（係数の取得時の照合に使用）。
+    ID で取得したキャラクター（詳細・計算）は直近 RECENT_CHARACTERS 件を係数とともに保持し、
+    同じキャラクターの繰り返しの取得では生成を省きます。
+
+    スナップショットから復元したカタログ（lazy）は、キャラクターを最初に
+    参照した時点で Character オブジェクトを生成し、係数をコンパイルします。
+    一覧・検索で全キャラクターが必要になった時点でストアと二次索引を構築し、
+    生成済みの Character の保持をやめます。
+    """
+
+    def __init__(self, characters: List[Character], fetched_at: Optional[float] = None):
+        """
+        Args:
+            characters: キャラクター一覧（外部APIの並び順）
+            fetched_at: 取得時刻（単調増加クロック、省略時は現在時刻）
+        """
+        self.fetched_at = time.monotonic() if fetched_at is None else fetched_at
+
+        # ストア（係数を含む）と二次索引はカタログ生成時に一度だけ構築する
+        self._store: Optional[CharacterStore] = CharacterStore(characters)
+        self._secondary_index: Optional[CharacterIndex] = CharacterIndex(self._store)
+        self._live: "WeakValueDictionary[int, Character]" = WeakValueDictionary()
+        self._recent: "OrderedDict[str, _RecentCharacter]" = OrderedDict()
+
+        # スナップショットから復元したカタログ（ストアの構築前）の状態
+        self._index: Dict[str, int] = {}
+        self._size = 0
+        self._materialize: Optional[Callable[[int], Character]] = None
+        self._loaded: Dict[int, Character] = {}
+        self._loaded_coefficients: Dict[int, DamageCoefficients] = {}
+
+    @classmethod
+    def lazy(
+        cls,
+        ids: List[str],
+        materialize: Callable[[int], Character],
+        fetched_at: Optional[float] = None
+    ) -> "CharacterCatalog":
+        """
+        キャラクターを参照時に生成するカタログを作成する
+
+        Args:
+            ids: キャラクターID一覧（並び順）
+            materialize: 行番号から Character を生成する関数
+            fetched_at: 取得時刻（単調増加クロック、省略時は現在時刻）
+
+        Returns:
+            CharacterCatalog: カタログ
+        """
+        catalog = cls([], fetched_at=fetched_at)
+        catalog._store = None
+        catalog._secondary_index = None
+        catalog._index = {character_id: i for i, character_id in enumerate(ids)}
+        catalog._size = len(ids)
+        catalog._materialize = materialize
+        return catalog
+
+    def __len__(self) -> int:
+        return self._size if self._store is None else len(self._store)
+
+    def __contains__(self, character_id: str) -> bool:
+        return self._row_of(character_id) is not None
+
+    @property
+    def characters(self) -> List[Character]:
+        """キャラクター一覧（呼び出しのたびに全キャラクターの Character を生成する）"""
+        store = self._require_store()
+        return [self._character_at(i) for i in range(len(store))]
+
+    def get(self, character_id: str) -> Optional[Character]:
+        """
+        ID でキャラクターを取得する
+
+        Args:
+            character_id: キャラクターID
+
+        Returns:
+            Optional[Character]: キャラクター（存在しない場合はNone）
+        """
+        if self._store is None:
+            i = self._index.get(character_id)
+            return None if i is None else self._character_at(i)
+
+        recent = self._recent.get(character_id)
+        if recent is None:
+            i = self._store.row_of(character_id)
+            if i is None:
+                return None
+            recent = self._recent[character_id] = _RecentCharacter(i, self._character_at(i))
+            if len(self._recent) > RECENT_CHARACTERS:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(character_id)
+        return recent.character
+
+    def find(
+        self,
+        query: CharacterQuery,
+        limit: int,
+        after: Optional[SortKey] = None
+    ) -> Tuple[List[Character], int]:
+        """
+        二次索引で条件に一致するキャラクターを並び順に取得する
+
+        Args:
+            query: 絞り込み条件と並び替えの種類
+            limit: 最大件数
+            after: この並び替えキーより後のキャラクターから取得する
+
+        Returns:
+            Tuple[List[Character], int]: キャラクター一覧と、条件に一致する総件数
+        """
+        if self._secondary_index is None:
+            self._secondary_index = CharacterIndex(self._require_store())
+        positions, total = self._secondary_index.query(query, limit, after)
+        return [self._character_at(i) for i in positions], total
+
+    def name_entries(self) -> List[NameEntry]:
+        """
+        名前索引の登録情報を取得する（Character は生成しない）
+
+        Returns:
+            List[NameEntry]: 全キャラクターの登録情報（並び順）
+        """
+        store = self._require_store()
+        size = len(store)
+        return [
+            NameEntry(character_id, name, store.type_names[code], rarity)
+            for character_id, name, code, rarity in zip(
+                store.ids.slice(0, size),
+                store.names.slice(0, size),
+                store.type_codes.tolist(),
+                store.rarity.tolist()
+            )
+        ]
+
+    def get_coefficients(self, character: Character) -> Optional[DamageCoefficients]:
+        """
+        カタログ内のキャラクターのダメージ計算係数を取得する
+
+        Args:
+            character: キャラクター情報
+
+        Returns:
+            Optional[DamageCoefficients]: 係数（このカタログのキャラクターでない場合はNone）
+        """
+        if self._store is None:
+            i = self._index.get(character.id)
+            if i is None or self._loaded.get(i) is not character:
+                return None
+            return self._loaded_coefficients[i]
+
+        recent = self._recent.get(character.id)
+        if recent is not None and recent.character is character:
+            if recent.coefficients is None:
+                recent.coefficients = self._store.coefficients_at(recent.row)
+            return recent.coefficients
+        i = self._store.row_of(character.id)
+        if i is None or self._live.get(i) is not character:
+            return None
+        return self._store.coefficients_at(i)
+
+    def all_coefficients(self) -> List[DamageCoefficients]:
+        """
+        全キャラクターのダメージ計算係数を取得する（Character は生成しない）
+
+        Returns:
+            List[DamageCoefficients]: 並び順の係数一覧
+        """
+        return self._require_store().all_coefficients()
+
+    def age(self) -> float:
+        """取得からの経過秒数"""
+        return time.monotonic() - self.fetched_at
+
+    def _row_of(self, character_id: str) -> Optional[int]:
+        """ID の行番号を取得する（存在しない場合はNone）"""
+        if self._store is None:
+            return self._index.get(character_id)
+        return self._store.row_of(character_id)
+
+    def _character_at(self, i: int) -> Character:
+        """行番号のキャラクターを取得する（参照中でなければ生成する）"""
+        if self._store is None:
+            character = self._loaded.get(i)
+            if character is None:
+                character = self._materialize(i)
+                self._loaded[i] = character
+                self._loaded_coefficients[i] = compile_character(character)
+            return character
+
+        character = self._live.get(i)
+        if character is None:
+            character = self._store.character_at(i)
+            self._live[i] = character
+        return character
+
+    def _require_store(self) -> CharacterStore:
+        """ストアを取得する（スナップショットから復元したカタログは全行を読み込んで構築する）"""
+        if self._store is None:
+            characters = [self._loaded.get(i) or self._materialize(i) for i in range(self._size)]
+            self._store = CharacterStore(characters)
+            # 生成済みの Character は参照されている間、引き続き同じ行として扱う
+            for i, character in self._loaded.items():
+                self._live[i] = character
+            self._index = {}
+            self._materialize = None
+            self._loaded = {}
+            self._loaded_coefficients = {}
+        return self._store
@@ -0,0 +1,197 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - キャラクター二次索引
+
+キャラクター一覧の絞り込み・並び替え・カーソルページングに使用する
+二次索引と、ページングカーソルのエンコード・デコードを提供します。
+"""
+
+import base64
+import json
+from bisect import bisect_right
+from typing import Dict, Hashable, List, Optional, Tuple, get_args
+
+import numpy as np
+
+from ..models.schemas import Character, CharacterQuery, CharacterSort
+from .character_store import FLAG_GUARD, FLAG_INFINITE_STACKING, CharacterStore
+
+# 並び替えキー（値なしフラグ, 値, ID）。値なしのキャラクターは昇順・降順とも末尾に並ぶ
+SortKey = Tuple[int, float, str]
+
+# 並び替えの種類（"-" 始まりは降順）
+SORTS: Tuple[str, ...] = get_args(CharacterSort)
+
+# 完全一致で絞り込む項目
+_FILTER_FIELDS = ("type", "rarity", "guard_ability", "infinite_defense_stacking")
+
+
+class InvalidCursorError(ValueError):
+    """ページングカーソルが不正であることを表す例外"""
+
+
+def sort_key(character: Character, sort: str) -> SortKey:
+    """
+    キャラクターの並び替えキーを取得する
+
+    Args:
+        character: キャラクター情報
+        sort: 並び替えの種類
+
+    Returns:
+        SortKey: 並び替えキー（昇順に並べると指定の並び順になる）
+    """
+    if sort == "id":
+        return (0, 0.0, character.id)
+    value = getattr(character, sort.lstrip("-"))
+    if value is None:
+        return (1, 0.0, character.id)
+    return (0, -value if sort.startswith("-") else value, character.id)
+
+
+def encode_cursor(sort: str, key: SortKey) -> str:
+    """
+    ページングカーソルを生成する（直前のページ末尾の並び替えキーを埋め込む）
+
+    Args:
+        sort: 並び替えの種類
+        key: ページ末尾のキャラクターの並び替えキー
+
+    Returns:
+        str: URL セーフなカーソル文字列
+    """
+    payload = json.dumps([sort, *key], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> SortKey:
+    """
+    ページングカーソルを解析する
+
+    Args:
+        cursor: カーソル文字列
+        sort: リクエストの並び替えの種類
+
+    Returns:
+        SortKey: 直前のページ末尾の並び替えキー
+
+    Raises:
+        InvalidCursorError: カーソルが不正、または並び替えの種類が一致しない場合
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, missing, value, character_id = json.loads(base64.urlsafe_b64decode(padded))
+        key = (int(missing), float(value), str(character_id))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("カーソルの形式が不正です") from e
+    if cursor_sort != sort:
+        raise InvalidCursorError("カーソルと並び替えの種類が一致しません")
+    return key
+
+
+def _sort_keys(store: CharacterStore, ids: List[str], sort: str) -> List[SortKey]:
+    """ストアの全行の並び替えキーを取得する（sort_key と同じ値）"""
+    if sort == "id":
+        return [(0, 0.0, character_id) for character_id in ids]
+    values = getattr(store, sort.lstrip("-")).tolist()
+    sign = -1.0 if sort.startswith("-") else 1.0
+    return [
+        (1, 0.0, character_id) if value != value else (0, sign * value, character_id)
+        for value, character_id in zip(values, ids)
+    ]
+
+
+class CharacterIndex:
+    """
+    キャラクター二次索引クラス
+
+    - 絞り込み項目の値ごとに、該当する行を表す真偽値マスクを保持
+    - 並び替えの種類ごとに、行番号の並び順と並び替えキーを保持
+
+    カタログの生成時にキャラクターストアの列から一度だけ構築し、検索ではマスクの論理積と
+    並び順の二分探索のみを行います（キャラクター自体は走査しません）。
+    """
+
+    def __init__(self, store: CharacterStore):
+        """
+        Args:
+            store: キャラクターストア（行番号はストアの並び順）
+        """
+        self._size = len(store)
+        self._masks: Dict[Tuple[str, Hashable], np.ndarray] = {}
+
+        for code, type_name in enumerate(store.type_names):
+            self._masks[("type", type_name)] = store.type_codes == code
+        for rarity in np.unique(store.rarity).tolist():
+            self._masks[("rarity", rarity)] = store.rarity == rarity
+        for field, flag in (("guard_ability", FLAG_GUARD), ("infinite_defense_stacking", FLAG_INFINITE_STACKING)):
+            has_flag = (store.flags & flag) != 0
+            self._masks[(field, True)] = has_flag
+            self._masks[(field, False)] = ~has_flag
+
+        for skill_type, rows in store.skill_type_rows().items():
+            self._mask("skill_type", skill_type)[rows] = True
+
+        ids = store.ids.slice(0, self._size)
+        self._orders: Dict[str, np.ndarray] = {}
+        self._keys: Dict[str, List[SortKey]] = {}
+        for sort in SORTS:
+            keys = _sort_keys(store, ids, sort)
+            order = sorted(range(self._size), key=keys.__getitem__)
+            self._orders[sort] = np.fromiter(order, dtype=np.intp, count=self._size)
+            self._keys[sort] = [keys[i] for i in order]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def query(
+        self,
+        query: CharacterQuery,
+        limit: int,
+        after: Optional[SortKey] = None
+    ) -> Tuple[List[int], int]:
+        """
+        条件に一致する行番号を並び順に取得する
+
+        Args:
+            query: 絞り込み条件と並び替えの種類
+            limit: 最大件数
+            after: この並び替えキーより後の行から取得する（カーソルページング）
+
+        Returns:
+            Tuple[List[int], int]: 行番号一覧と、条件に一致する総件数
+        """
+        mask = self._match(query)
+        total = self._size if mask is None else int(np.count_nonzero(mask))
+
+        order = self._orders[query.sort]
+        if after is not None:
+            order = order[bisect_right(self._keys[query.sort], after):]
+        if mask is not None:
+            order = order[mask[order]]
+        return order[:limit].tolist(), total
+
+    def _match(self, query: CharacterQuery) -> Optional[np.ndarray]:
+        """絞り込み条件のマスクの論理積（条件がない場合はNone）"""
+        conditions = [
+            (field, getattr(query, field))
+            for field in (*_FILTER_FIELDS, "skill_type")
+            if getattr(query, field) is not None
+        ]
+        if not conditions:
+            return None
+
+        mask = np.ones(self._size, dtype=bool)
+        for condition in conditions:
+            matched = self._masks.get(condition)
+            if matched is None:
+                return np.zeros(self._size, dtype=bool)
+            mask &= matched
+        return mask
+
+    def _mask(self, field: str, value: Hashable) -> np.ndarray:
+        """絞り込み項目の値に対応するマスクを取得する（なければ作成）"""
+        key = (field, value)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = np.zeros(self._size, dtype=bool)
+        return mask
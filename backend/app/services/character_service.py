@@ -4,19 +4,65 @@
 外部APIからのキャラクターデータ取得と管理を行うサービスクラスです。
 """
 
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Dict, Any, Set, Tuple, TypeVar
+from urllib.parse import quote
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
 
 import httpx
 
-from ..models.schemas import Character, PassiveSkill
+from ..models.schemas import Character, CharacterQuery, PassiveSkill
+from ..core.cache import TTLCache
+from ..core.circuit_breaker import CircuitBreaker
 from ..core.config import get_settings
+from ..core.logging_config import log_fields, should_log_request
+from ..core.metrics import counter
+from ..core.singleflight import SingleFlight
+from .catalog_snapshot import compute_catalog_version, read_snapshot, write_snapshot
+from .character_catalog import CharacterCatalog
+from .character_index import decode_cursor, encode_cursor, sort_key
+from .damage_coefficients import DamageCoefficients, compile_character
+from .name_search import NameEntry, NameIndex, NameSearchHit
+from .upstream import UpstreamClient, UpstreamError
+
+if TYPE_CHECKING:
+    # SQLAlchemy の読み込みは重いため、データベースは初回使用時に読み込む（起動時間の短縮）
+    from ..repositories.character_repository import CharacterRepository
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# キャラクター一覧のシングルフライトキー
+CATALOG_KEY = "characters_list"
+
+# 名前索引の初回構築のシングルフライトキー
+NAME_INDEX_KEY = "name_index"
+
+# 外部APIに存在しなかった ID を表すキャッシュ値
+_NOT_FOUND = object()
+
+mock_fallbacks_total = counter(
+    "dokkan_mock_fallbacks",
+    "外部API・データベースから取得できずモックデータにフォールバックした件数",
+    ("operation",)
+)
+
+T = TypeVar("T")
+
+
+def _name_entries(characters: Iterable[Character]) -> List[NameEntry]:
+    """キャラクター一覧を名前索引の登録情報に変換する"""
+    return [NameEntry(c.id, c.name, c.type, c.rarity) for c in characters]
+
+
+def _build_name_index(entries: List[NameEntry]) -> NameIndex:
+    """名前索引を構築する"""
+    index = NameIndex()
+    index.update(entries)
+    return index
+
 
 class CharacterService:
     """
@@ -24,25 +70,135 @@ class CharacterService:
     
     外部APIからキャラクターデータを取得し、アプリケーション内で使用可能な
     形式に変換・キャッシュする機能を提供します。
+    
+    プロセス内で1つのインスタンスを共有し（get_character_service を参照）、
+    HTTP クライアントはアプリケーションのライフスパンで開閉します。
+    
+    キャラクター一覧は ID 索引付きのカタログとして保持し、一覧・詳細の両方で
+    共有します。カタログは stale-while-revalidate で提供します。cache_ttl を過ぎた
+    一覧も cache_hard_ttl までは即座に返し、裏で非同期に再取得します。
+    
+    catalog_snapshot_path を設定すると取得したカタログをファイルに保存し、
+    起動時はそのスナップショットから復元してから裏で再取得します。
+    
+    取得したカタログはリポジトリ（database_url のデータベース）に同期し、
+    これを正とします。catalog_cache_mode が on_demand の場合は一覧をメモリに
+    保持せず、一覧・詳細をリポジトリから取得します（詳細は TTLCache に保持）。
+    
+    外部APIの呼び出しはリトライ（指数バックオフ・ジッター付き）と
+    サーキットブレーカーを備えた UpstreamClient 経由で行います。
     """
     
-    def __init__(self):
-        self._cache: Dict[str, Any] = {}
-        self._cache_timestamps: Dict[str, datetime] = {}
-        self._http_client: Optional[httpx.AsyncClient] = None
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        repository: Optional["CharacterRepository"] = None
+    ):
+        self._cache = TTLCache(
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes,
+            default_ttl=settings.cache_ttl
+        )
+        self._single_flight = SingleFlight()
+        self._http_client: Optional[httpx.AsyncClient] = http_client
+        self._owns_http_client = False
+        self._upstream = UpstreamClient(
+            base_url=settings.external_api_base_url,
+            breaker=CircuitBreaker(
+                "character_api",
+                failure_threshold=settings.external_api_circuit_failure_threshold,
+                recovery_timeout=settings.external_api_circuit_recovery_timeout
+            ),
+            retry_count=settings.external_api_retry_count,
+            backoff_base=settings.external_api_retry_backoff_base,
+            backoff_max=settings.external_api_retry_backoff_max
+        )
+        
+        # キャラクター一覧と ID 索引（on_demand モードでは保持しない）
+        self._catalog: Optional[CharacterCatalog] = None
+        
+        # カタログの内容のハッシュ（HTTP キャッシュの ETag に使用）
+        self._catalog_version: Optional[str] = None
+        
+        # キャラクター名の n-gram 索引（初回検索時に構築し、以降は差分更新）
+        self._name_index: Optional[NameIndex] = None
+        
+        # キャラクターの保存先と直近の同期時刻（単調増加クロック）
+        self._repository: Optional["CharacterRepository"] = repository
+        self._owns_repository = False
+        self._synced_at: Optional[float] = None
+        
+        # バックグラウンドタスク（再取得・定期更新スケジューラ）
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._refresh_scheduler: Optional[asyncio.Task] = None
     
     async def __aenter__(self):
         """非同期コンテキストマネージャーの開始"""
-        self._http_client = httpx.AsyncClient(
-            timeout=httpx.Timeout(settings.external_api_timeout),
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-        )
+        await self.start()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """非同期コンテキストマネージャーの終了"""
-        if self._http_client:
+        await self.close()
+    
+    async def start(self) -> None:
+        """
+        HTTP クライアント（コネクションプール）を生成し、定期更新を開始する
+        
+        外部から HTTP クライアントが渡されている場合はそれを使用します。
+        スナップショットがあればカタログを復元し、裏で最新化します。
+        スナップショットがない場合はリポジトリの同期済みデータから復元します。
+        """
+        if self._catalog is None and self._synced_at is None:
+            if settings.catalog_cache_mode == "full" and self._load_snapshot():
+                self.refresh_in_background()
+            else:
+                await self._restore_from_repository()
+        
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.external_api_timeout),
+                limits=httpx.Limits(
+                    max_keepalive_connections=settings.external_api_max_keepalive_connections,
+                    max_connections=settings.external_api_max_connections,
+                    keepalive_expiry=settings.external_api_keepalive_expiry
+                )
+            )
+            self._owns_http_client = True
+            logger.info("外部API用 HTTP クライアントを生成")
+        
+        if settings.catalog_refresh_interval > 0 and self._refresh_scheduler is None:
+            self._refresh_scheduler = asyncio.create_task(self._run_refresh_scheduler())
+            logger.info(f"キャラクター一覧の定期更新を開始: {settings.catalog_refresh_interval}秒間隔")
+    
+    async def close(self) -> None:
+        """
+        バックグラウンドタスクを停止し、自身で生成した HTTP クライアントを閉じる
+        
+        シングルフライトで実行中の取得は待機側のキャンセルでは止まらないため、
+        HTTP クライアント・データベースを閉じる前に直接キャンセルして終了を待ちます。
+        """
+        tasks = list(self._background_tasks)
+        if self._refresh_scheduler is not None:
+            tasks.append(self._refresh_scheduler)
+            self._refresh_scheduler = None
+        tasks.extend(self._single_flight.tasks())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if self._http_client is not None and self._owns_http_client:
             await self._http_client.aclose()
+            logger.info("外部API用 HTTP クライアントを終了")
+        self._http_client = None
+        self._owns_http_client = False
+        
+        if self._owns_repository:
+            from ..core.database import dispose_engine
+            
+            dispose_engine()
+            self._repository = None
+            self._owns_repository = False
     
     async def get_characters(self) -> List[Character]:
         """
@@ -54,42 +210,99 @@ class CharacterService:
         Raises:
             Exception: 外部API接続エラーまたはデータ変換エラー
         """
-        cache_key = "characters_list"
+        try:
+            await self._ensure_catalog()
+            if self._catalog is not None:
+                return self._catalog.characters
+            return await self._run_repository(lambda repository: repository.list_all())
+            
+        except Exception as e:
+            logger.error(f"キャラクター一覧の取得に失敗: {str(e)}")
+            
+            # フォールバック: モックデータを返す
+            logger.warning("モックデータを使用してフォールバック（外部APIのデータではありません）")
+            mock_fallbacks_total.inc("list")
+            return self._get_mock_characters()
+    
+    async def find_characters(
+        self,
+        query: CharacterQuery,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Character], int, Optional[str]]:
+        """
+        条件に一致するキャラクターを1ページ分取得する
         
-        # キャッシュから取得を試行
-        cached_data = self._get_from_cache(cache_key)
-        if cached_data is not None:
-            logger.info("キャラクター一覧をキャッシュから取得")
-            return cached_data
+        カタログの二次索引（on_demand モードではリポジトリの索引付きクエリ）で
+        検索し、キャラクター一覧は走査しません。
+        
+        Args:
+            query: 絞り込み条件と並び替えの種類
+            limit: ページサイズ
+            cursor: 前のページで返したカーソル（先頭ページの場合はNone）
+            
+        Returns:
+            Tuple[List[Character], int, Optional[str]]: キャラクター一覧・総件数・次のページのカーソル
+            
+        Raises:
+            InvalidCursorError: カーソルが不正な場合
+        """
+        after = decode_cursor(cursor, query.sort) if cursor else None
         
         try:
-            # 外部APIからデータを取得
-            logger.info("外部APIからキャラクター一覧を取得中...")
-            raw_characters = await self._fetch_characters_from_api()
+            await self._ensure_catalog()
+            if self._catalog is not None:
+                characters, total = self._catalog.find(query, limit + 1, after)
+            else:
+                characters, total = await self._run_repository(
+                    lambda repository: repository.search(query, limit + 1, after)
+                )
             
-            # データを正規化してCharacterオブジェクトに変換
-            characters = [
-                self._normalize_character_data(char_data)
-                for char_data in raw_characters
-            ]
+        except Exception as e:
+            logger.error(f"キャラクター一覧の取得に失敗: {str(e)}")
             
-            # キャッシュに保存
-            self._save_to_cache(cache_key, characters)
+            # フォールバック: モックデータから検索する
+            logger.warning("モックデータを使用してフォールバック（外部APIのデータではありません）")
+            mock_fallbacks_total.inc("find")
+            characters, total = CharacterCatalog(self._get_mock_characters()).find(query, limit + 1, after)
+        
+        next_cursor = None
+        if len(characters) > limit:
+            characters = characters[:limit]
+            next_cursor = encode_cursor(query.sort, sort_key(characters[-1], query.sort))
+        return characters, total, next_cursor
+    
+    async def search_characters(self, query: str, limit: int) -> List[NameSearchHit]:
+        """
+        キャラクターを名前で検索する
+        
+        Args:
+            query: 検索文字列（全角・半角、ひらがな・カタカナ、括弧の有無を区別しない）
+            limit: 最大件数
             
-            logger.info(f"キャラクター一覧を取得完了: {len(characters)}件")
-            return characters
+        Returns:
+            List[NameSearchHit]: 検索結果（完全一致 > 前方一致 > 部分一致 > あいまい一致の順）
+        """
+        try:
+            index = await self._get_name_index()
             
         except Exception as e:
-            logger.error(f"キャラクター一覧の取得に失敗: {str(e)}")
+            logger.error(f"キャラクター名索引の取得に失敗: {str(e)}")
             
-            # フォールバック: モックデータを返す
-            logger.info("モックデータを使用してフォールバック")
-            return self._get_mock_characters()
+            # フォールバック: モックデータから検索する
+            logger.warning("モックデータを使用してフォールバック（外部APIのデータではありません）")
+            mock_fallbacks_total.inc("search")
+            index = _build_name_index(_name_entries(self._get_mock_characters()))
+        
+        return index.search(query, limit)
     
     async def get_character(self, character_id: str) -> Optional[Character]:
         """
         指定されたIDのキャラクター詳細を取得する
         
+        キャラクター一覧の ID 索引（on_demand モードではリポジトリ）から取得し、
+        存在しない場合のみ外部APIから個別に取得します。
+        
         Args:
             character_id: キャラクターID
             
@@ -99,43 +312,435 @@ class CharacterService:
         Raises:
             Exception: 外部API接続エラーまたはデータ変換エラー
         """
-        cache_key = f"character_{character_id}"
+        character, _ = await self.lookup_character(character_id)
+        return character
+    
+    async def lookup_character(self, character_id: str) -> Tuple[Optional[Character], bool]:
+        """
+        指定されたIDのキャラクター詳細を、カタログから取得したかどうかとともに取得する
         
-        # キャッシュから取得を試行
+        個別取得・モックデータへのフォールバックの結果はカタログのバージョンに
+        対応しないため、HTTP キャッシュ（ETag）の対象かどうかの判定に使います。
+        
+        Args:
+            character_id: キャラクターID
+            
+        Returns:
+            Tuple[Optional[Character], bool]: キャラクター詳細（見つからない場合はNone）と、
+                カタログ（on_demand モードではリポジトリ）から取得したかどうか
+            
+        Raises:
+            Exception: 外部API接続エラーまたはデータ変換エラー
+        """
+        # キャラクター一覧の ID 索引から取得を試行
+        try:
+            character = await self._find_in_catalog(character_id)
+            if character is not None:
+                return character, True
+        except Exception as e:
+            logger.error(f"キャラクター一覧の取得に失敗: {str(e)}")
+        
+        # 索引にない ID は個別取得の結果をキャッシュから取得を試行
+        cache_key = f"character_{character_id}"
         cached_data = self._get_from_cache(cache_key)
         if cached_data is not None:
-            logger.info(f"キャラクター詳細をキャッシュから取得: {character_id}")
-            return cached_data
+            if should_log_request(logger, logging.DEBUG):
+                logger.debug("キャラクター詳細をキャッシュから取得", extra=log_fields(character_id=character_id))
+            return (None if cached_data is _NOT_FOUND else cached_data), False
         
         try:
-            # 外部APIからデータを取得
-            logger.info(f"外部APIからキャラクター詳細を取得中: {character_id}")
-            raw_character = await self._fetch_character_from_api(character_id)
-            
-            if not raw_character:
-                logger.warning(f"キャラクターが見つかりません: {character_id}")
-                return None
-            
-            # データを正規化してCharacterオブジェクトに変換
-            character = self._normalize_character_data(raw_character)
-            
-            # キャッシュに保存
-            self._save_to_cache(cache_key, character)
-            
-            logger.info(f"キャラクター詳細を取得完了: {character.name}")
-            return character
+            # 同時に発生したキャッシュミスは1回の外部API取得を共有する
+            character = await self._single_flight.do(
+                cache_key, lambda: self._load_character(character_id)
+            )
+            return character, False
             
         except Exception as e:
             logger.error(f"キャラクター詳細の取得に失敗: {character_id}, エラー: {str(e)}")
             
             # フォールバック: モックデータから検索
+            mock_fallbacks_total.inc("detail")
             mock_characters = self._get_mock_characters()
             for char in mock_characters:
                 if char.id == character_id:
-                    logger.info(f"モックデータからキャラクターを取得: {character_id}")
-                    return char
+                    logger.warning(f"モックデータからキャラクターを取得: {character_id}")
+                    return char, False
+            
+            return None, False
+    
+    def get_coefficients(self, character: Character) -> DamageCoefficients:
+        """
+        キャラクターのコンパイル済みダメージ計算係数を取得する
+        
+        キャラクター一覧の読み込み時にコンパイル済みであればそれを返し、
+        一覧外のキャラクター（個別取得・フォールバック時）はその場でコンパイルします。
+        
+        Args:
+            character: キャラクター情報
+            
+        Returns:
+            DamageCoefficients: ダメージ計算係数
+        """
+        if self._catalog is not None:
+            coefficients = self._catalog.get_coefficients(character)
+            if coefficients is not None:
+                return coefficients
+        return compile_character(character)
+    
+    async def get_all_coefficients(self) -> List[DamageCoefficients]:
+        """
+        全キャラクターのダメージ計算係数を取得する
+        
+        カタログを保持している場合は Character を生成せず、ストアの列から取得します。
+        それ以外（on_demand モード・フォールバック時）は get_characters の一覧からコンパイルします。
+        
+        Returns:
+            List[DamageCoefficients]: キャラクター一覧の並び順の係数
+        """
+        try:
+            await self._ensure_catalog()
+        except Exception as e:
+            logger.error(f"キャラクター一覧の取得に失敗: {str(e)}")
+        else:
+            if self._catalog is not None:
+                return self._catalog.all_coefficients()
+        return [self.get_coefficients(character) for character in await self.get_characters()]
+    
+    @property
+    def catalog_loaded(self) -> bool:
+        """外部APIまたはデータベースのキャラクター一覧を保持しているか（モックデータへのフォールバック中は False）"""
+        return self._catalog_age() is not None
+    
+    @property
+    def catalog_version(self) -> Optional[str]:
+        """現在保持しているカタログのバージョン（取得・更新は行わない）"""
+        return self._catalog_version
+    
+    async def get_catalog_version(self) -> Optional[str]:
+        """
+        現在のカタログバージョンを取得する
+        
+        内容が同じカタログであればプロセスをまたいで同じ値になります。
+        カタログを取得できない（フォールバック中の）場合は None を返します。
+        
+        Returns:
+            Optional[str]: カタログバージョン
+        """
+        try:
+            await self._ensure_catalog()
+        except Exception as e:
+            logger.error(f"キャラクター一覧の取得に失敗: {str(e)}")
+            return None
+        return self._catalog_version
+    
+    def upstream_status(self) -> Dict[str, Any]:
+        """
+        外部APIのサーキットブレーカー状態を取得する
+        
+        Returns:
+            Dict[str, Any]: 状態・連続失敗回数・再試行までの秒数・累計件数
+        """
+        return self._upstream.breaker.snapshot()
+    
+    def refresh_in_background(self) -> None:
+        """
+        キャラクター一覧の再取得をバックグラウンドで開始する
+        
+        既に取得中の場合は何もしません。取得に失敗した場合は現在の一覧を維持します。
+        """
+        if self._single_flight.in_flight(CATALOG_KEY):
+            return
+        
+        self._spawn(self._refresh_catalog())
+    
+    def _spawn(self, coro) -> None:
+        """バックグラウンドタスクを生成し、終了まで参照を保持する"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    def _get_repository(self) -> "CharacterRepository":
+        """リポジトリを取得する（未指定時は database_url から生成）"""
+        if self._repository is None:
+            from ..core.database import get_session_factory
+            from ..repositories.character_repository import CharacterRepository
+            
+            self._repository = CharacterRepository(get_session_factory())
+            self._owns_repository = True
+        return self._repository
+    
+    async def _run_repository(self, operation: Callable[["CharacterRepository"], T]) -> T:
+        """リポジトリ操作をワーカースレッドで実行する（データベース I/O でイベントループを止めない）"""
+        return await asyncio.to_thread(lambda: operation(self._get_repository()))
+    
+    def _catalog_age(self) -> Optional[float]:
+        """カタログの経過時間（秒、未取得の場合はNone）"""
+        if self._catalog is not None:
+            return self._catalog.age()
+        if self._synced_at is not None:
+            return time.monotonic() - self._synced_at
+        return None
+    
+    async def _ensure_catalog(self) -> None:
+        """
+        キャラクターカタログを有効な状態にする（stale-while-revalidate）
+        
+        Raises:
+            Exception: カタログ未取得または強制期限切れで、外部API取得に失敗した場合
+        """
+        age = self._catalog_age()
+        if age is not None:
+            # 有効期限内であればそのまま使う
+            if age <= settings.cache_ttl:
+                return
+            
+            # 有効期限切れでも強制期限内であればそのまま使い、裏で再取得する
+            if settings.cache_stale_while_revalidate and age <= settings.cache_hard_ttl:
+                logger.info(f"期限切れのキャラクター一覧を返却し再取得を開始: 経過{age:.0f}秒")
+                self.refresh_in_background()
+                return
+        
+        # 同時に発生したキャッシュミスは1回の外部API取得を共有する
+        await self._single_flight.do(CATALOG_KEY, self._load_catalog)
+    
+    async def _get_name_index(self) -> NameIndex:
+        """
+        キャラクター名索引を取得する（未構築の場合はワーカースレッドで構築）
+        
+        Returns:
+            NameIndex: キャラクター名索引
+        """
+        await self._ensure_catalog()
+        if self._name_index is None:
+            await self._single_flight.do(NAME_INDEX_KEY, self._load_name_index)
+        return self._name_index
+    
+    async def _load_name_index(self) -> None:
+        """カタログ（on_demand モードではリポジトリ）から名前索引を構築する"""
+        started = time.perf_counter()
+        if self._catalog is not None:
+            entries = self._catalog.name_entries()
+        else:
+            rows = await self._run_repository(lambda repository: repository.list_name_entries())
+            entries = [NameEntry(*row) for row in rows]
+        
+        self._name_index = await asyncio.to_thread(_build_name_index, entries)
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"キャラクター名索引を構築: {len(entries)}件, {elapsed_ms:.0f}ms")
+    
+    async def _find_in_catalog(self, character_id: str) -> Optional[Character]:
+        """
+        カタログ（on_demand モードではリポジトリ）からキャラクターを取得する
+        
+        Args:
+            character_id: キャラクターID
+            
+        Returns:
+            Optional[Character]: キャラクター（カタログに存在しない場合はNone）
+        """
+        await self._ensure_catalog()
+        if self._catalog is not None:
+            return self._catalog.get(character_id)
+        
+        # 個別取得の結果（character_{id}）とは別のキーに保持する
+        cache_key = f"catalog_character_{character_id}"
+        cached_data = self._get_from_cache(cache_key)
+        if cached_data is not None:
+            return cached_data
+        
+        character = await self._run_repository(lambda repository: repository.get(character_id))
+        if character is not None:
+            self._save_to_cache(cache_key, character)
+        return character
+    
+    async def _refresh_catalog(self) -> None:
+        """キャラクター一覧を再取得する（失敗時は現在の一覧を維持）"""
+        try:
+            await self._single_flight.do(CATALOG_KEY, self._load_catalog)
+        except Exception as e:
+            logger.error(f"キャラクター一覧の再取得に失敗（現在の一覧を維持）: {str(e)}")
+    
+    async def _run_refresh_scheduler(self) -> None:
+        """キャラクター一覧を一定間隔で先行して再取得する"""
+        while True:
+            await asyncio.sleep(settings.catalog_refresh_interval)
+            await self._refresh_catalog()
+    
+    async def _load_catalog(self) -> None:
+        """
+        外部APIからキャラクター一覧を取得し、リポジトリに同期してカタログを差し替える
+        
+        正規化・カタログの構築はワーカースレッドで行い（大量のキャラクターでも
+        イベントループを止めない）、完成したカタログへの差し替えのみをループ上で行います。
+        
+        Raises:
+            Exception: 外部API取得、または on_demand モードでリポジトリ同期に失敗した場合
+        """
+        # 外部APIからデータを取得
+        logger.info("外部APIからキャラクター一覧を取得中...")
+        raw_characters = await self._fetch_characters_from_api()
+        
+        # データを正規化してCharacterオブジェクトに変換し、バージョンを計算する
+        characters, catalog_version = await asyncio.to_thread(self._normalize_catalog, raw_characters)
+        
+        # リポジトリに一括 upsert する（on_demand モードでは同期できなければ一覧を提供できない）
+        try:
+            await self._run_repository(
+                lambda repository: repository.sync_catalog(characters, catalog_version=catalog_version)
+            )
+        except Exception as e:
+            if settings.catalog_cache_mode == "on_demand":
+                raise
+            logger.error(f"キャラクター一覧のデータベース同期に失敗: {str(e)}")
+        
+        # ID 索引・ダメージ計算係数を構築したカタログに差し替える
+        catalog = None
+        if settings.catalog_cache_mode == "full":
+            catalog = await asyncio.to_thread(CharacterCatalog, characters)
+        
+        self._synced_at = time.monotonic()
+        self._catalog_version = catalog_version
+        if catalog is not None:
+            self._catalog = catalog
+            
+            # 次回起動用のスナップショットを裏で保存する
+            if settings.catalog_snapshot_path:
+                self._spawn(self._save_snapshot(characters))
+        
+        # 構築済みの名前索引には差分のみを反映する
+        # （差分の計算はワーカースレッドで行い、検索中の索引の変更はループ上で行う）
+        name_index = self._name_index
+        if name_index is not None:
+            delta = await asyncio.to_thread(lambda: name_index.diff(_name_entries(characters)))
+            changed, removed = name_index.apply(delta)
+            logger.info(f"キャラクター名索引を更新: 追加・変更{changed}件, 削除{removed}件")
+        
+        # 一覧に含まれた ID の個別取得結果・リポジトリから読み込んだ詳細は不要になるため破棄する
+        for character in characters:
+            self._cache.delete(f"character_{character.id}")
+            self._cache.delete(f"catalog_character_{character.id}")
+        
+        logger.info(f"キャラクター一覧を取得完了: {len(characters)}件")
+    
+    def _normalize_catalog(self, raw_characters: List[Dict[str, Any]]) -> Tuple[List[Character], str]:
+        """外部APIのキャラクター一覧を正規化し、カタログバージョンを計算する（ワーカースレッドで実行）"""
+        characters = [
+            self._normalize_character_data(char_data)
+            for char_data in raw_characters
+        ]
+        return characters, compute_catalog_version(characters)
+    
+    def _load_snapshot(self) -> bool:
+        """
+        スナップショットファイルからカタログを復元する
+        
+        Returns:
+            bool: 復元できたかどうか
+        """
+        path = settings.catalog_snapshot_path
+        if not path:
+            return False
+        
+        started = time.perf_counter()
+        try:
+            snapshot = read_snapshot(path)
+        except FileNotFoundError:
+            logger.info(f"カタログスナップショットが存在しません: {path}")
+            return False
+        except Exception as e:
+            logger.warning(f"カタログスナップショットの読み込みに失敗: {path}, エラー: {str(e)}")
+            return False
+        
+        # 保存時刻からの経過時間をカタログの取得時刻に反映する
+        age = max(0.0, time.time() - snapshot.created_at)
+        self._catalog = CharacterCatalog.lazy(
+            snapshot.ids,
+            snapshot.character_at,
+            fetched_at=time.monotonic() - age
+        )
+        self._catalog_version = snapshot.catalog_version
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"カタログスナップショットから復元: {len(snapshot)}件, "
+            f"バージョン={snapshot.catalog_version[:12]}, {age:.0f}秒前に保存, 読み込み{elapsed_ms:.1f}ms"
+        )
+        return True
+    
+    async def _restore_from_repository(self) -> bool:
+        """
+        リポジトリの同期済みデータからカタログを復元する
+        
+        on_demand モードでは同期時刻のみを復元し、一覧はメモリに読み込みません。
+        
+        Returns:
+            bool: 復元できたかどうか
+        """
+        started = time.perf_counter()
+        try:
+            synced_at = await self._run_repository(lambda repository: repository.last_synced_at())
+            if synced_at is None:
+                logger.info("データベースに同期済みのキャラクターがありません")
+                return False
+            
+            # 同期時刻からの経過時間をカタログの取得時刻に反映する
+            age = max(0.0, (datetime.now(timezone.utc) - synced_at).total_seconds())
+            fetched_at = time.monotonic() - age
+            catalog_version = await self._run_repository(lambda repository: repository.catalog_version())
+            if settings.catalog_cache_mode == "full":
+                characters = await self._run_repository(lambda repository: repository.list_all())
+                self._catalog = await asyncio.to_thread(CharacterCatalog, characters, fetched_at)
+            self._synced_at = fetched_at
+            self._catalog_version = catalog_version
+        except Exception as e:
+            logger.warning(f"データベースからのカタログ復元に失敗: {str(e)}")
+            return False
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"データベースからカタログを復元: {age:.0f}秒前に同期, 読み込み{elapsed_ms:.1f}ms")
+        return True
+    
+    async def _save_snapshot(self, characters: List[Character]) -> None:
+        """カタログをスナップショットファイルに保存する（失敗してもサービスは継続）"""
+        path = settings.catalog_snapshot_path
+        try:
+            catalog_version = await asyncio.to_thread(write_snapshot, path, characters)
+            logger.info(f"カタログスナップショットを保存: {path}, バージョン={catalog_version[:12]}")
+        except Exception as e:
+            logger.error(f"カタログスナップショットの保存に失敗: {path}, エラー: {str(e)}")
+    
+    async def _load_character(self, character_id: str) -> Optional[Character]:
+        """
+        外部APIからキャラクター詳細を個別に取得してキャッシュに保存する
+        
+        Args:
+            character_id: キャラクターID
             
+        Returns:
+            Optional[Character]: キャラクター詳細（見つからない場合はNone）
+        """
+        # 外部APIからデータを取得
+        if should_log_request(logger):
+            logger.info("外部APIからキャラクター詳細を取得中", extra=log_fields(character_id=character_id))
+        raw_character = await self._fetch_character_from_api(character_id)
+        
+        cache_key = f"character_{character_id}"
+        if not raw_character:
+            # 存在しない ID への外部API取得が繰り返されないよう短時間記録する
+            logger.warning(f"キャラクターが見つかりません: {character_id}")
+            self._save_to_cache(cache_key, _NOT_FOUND, ttl=settings.cache_negative_ttl)
             return None
+        
+        # データを正規化してCharacterオブジェクトに変換
+        character = self._normalize_character_data(raw_character)
+        
+        # キャッシュに保存
+        self._save_to_cache(cache_key, character)
+        
+        if should_log_request(logger):
+            logger.info("キャラクター詳細を取得完了", extra=log_fields(character_id=character.id))
+        return character
     
     async def _fetch_characters_from_api(self) -> List[Dict[str, Any]]:
         """
@@ -143,9 +748,18 @@ class CharacterService:
         
         Returns:
             List[Dict[str, Any]]: 外部APIからの生データ
+            
+        Raises:
+            CircuitOpenError: 外部APIへの呼び出しを遮断中の場合
+            UpstreamError: 外部APIから取得できなかった場合
         """
-        # TODO: 実際の外部API実装時に置き換え
-        # 現在はモックデータを返す
+        if not settings.external_api_use_mock:
+            data = await self._upstream.get_json(self._require_http_client(), "/characters")
+            if not isinstance(data, list):
+                raise UpstreamError("外部APIのキャラクター一覧の形式が不正です")
+            return data
+        
+        # モックデータを返す
         await asyncio.sleep(0.1)  # API呼び出しのシミュレーション
         
         return [
@@ -197,16 +811,30 @@ class CharacterService:
             character_id: キャラクターID
             
         Returns:
-            Optional[Dict[str, Any]]: 外部APIからの生データ
+            Optional[Dict[str, Any]]: 外部APIからの生データ（存在しない場合はNone）
+            
+        Raises:
+            CircuitOpenError: 外部APIへの呼び出しを遮断中の場合
+            UpstreamError: 外部APIから取得できなかった場合
         """
-        # TODO: 実際の外部API実装時に置き換え
-        # 現在は一覧から該当するものを返す
+        if not settings.external_api_use_mock:
+            return await self._upstream.get_json(
+                self._require_http_client(), f"/characters/{quote(character_id, safe='')}"
+            )
+        
+        # モックデータの一覧から該当するものを返す
         characters = await self._fetch_characters_from_api()
         for char in characters:
             if char["id"] == character_id:
                 return char
         return None
     
+    def _require_http_client(self) -> httpx.AsyncClient:
+        """HTTP クライアントを取得する（start() 前の呼び出しはエラー）"""
+        if self._http_client is None:
+            raise RuntimeError("HTTP クライアントが未初期化です（start() を呼び出してください）")
+        return self._http_client
+    
     def _normalize_character_data(self, raw_data: Dict[str, Any]) -> Character:
         """
         外部APIの生データをCharacterオブジェクトに正規化する
@@ -292,6 +920,26 @@ class CharacterService:
             )
         ]
     
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        キャッシュの使用状況と統計情報を取得する
+        
+        Returns:
+            Dict[str, Any]: エントリ数・サイズ・ヒット/ミス/削除/期限切れ件数
+        """
+        stats = self._cache.stats
+        return {
+            "entries": len(self._cache),
+            "bytes": self._cache.current_bytes,
+            "max_entries": self._cache.max_entries,
+            "max_bytes": self._cache.max_bytes,
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "evictions": stats.evictions,
+            "expirations": stats.expirations,
+            "hit_ratio": stats.hit_ratio
+        }
+    
     def _get_from_cache(self, key: str) -> Optional[Any]:
         """
         キャッシュからデータを取得する
@@ -302,28 +950,37 @@ class CharacterService:
         Returns:
             Optional[Any]: キャッシュされたデータ（期限切れまたは存在しない場合はNone）
         """
-        if key not in self._cache:
-            return None
-        
-        # キャッシュの有効期限をチェック
-        timestamp = self._cache_timestamps.get(key)
-        if timestamp and datetime.now() - timestamp > timedelta(seconds=settings.cache_ttl):
-            # 期限切れのキャッシュを削除
-            del self._cache[key]
-            del self._cache_timestamps[key]
-            return None
-        
-        return self._cache[key]
+        return self._cache.get(key)
     
-    def _save_to_cache(self, key: str, data: Any) -> None:
+    def _save_to_cache(self, key: str, data: Any, ttl: Optional[float] = None) -> None:
         """
         データをキャッシュに保存する
         
         Args:
             key: キャッシュキー
             data: 保存するデータ
+            ttl: 有効期限（秒、省略時は cache_ttl）
         """
-        self._cache[key] = data
-        self._cache_timestamps[key] = datetime.now()
+        self._cache.set(key, data, ttl=ttl)
         
-        logger.debug(f"データをキャッシュに保存: {key}")
\ No newline at end of file
+        logger.debug("データをキャッシュに保存: %s", key)
+
+
+# プロセス共有のキャラクターサービスインスタンス
+_character_service: Optional[CharacterService] = None
+
+
+def get_character_service() -> CharacterService:
+    """
+    プロセス共有のキャラクターサービスインスタンスを取得する関数
+    
+    キャッシュとコネクションプールをリクエスト間で共有するため、
+    常に同一のインスタンスを返します。
+    
+    Returns:
+        CharacterService: キャラクターサービス
+    """
+    global _character_service
+    if _character_service is None:
+        _character_service = CharacterService()
+    return _character_service
\ No newline at end of file
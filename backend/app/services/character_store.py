@@ -0,0 +1,288 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - 列指向のキャラクターストア
+
+キャラクター一覧を列ごとの配列（ID・名前の UTF-8 連結とオフセット、属性タイプの
+コード、レアリティ、倍率、フラグ、パッシブスキルを平坦化した表）とコンパイル済みの
+ダメージ計算係数の列で保持する読み取り専用のストアを提供します。
+
+Character（pydantic モデル）は API の境界で必要になった時点で行から生成し、
+ストア自体はキャラクターごとのオブジェクトを保持しません。
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.schemas import Character, PassiveSkill
+from .damage_coefficients import DamageCoefficients, compile_character
+
+# フラグ（flags 列のビット）
+FLAG_GUARD = 1               # ガード能力あり
+FLAG_INFINITE_STACKING = 2   # DEF無限上昇能力あり
+FLAG_GUARD_NONE = 4          # guard_ability が None
+FLAG_INFINITE_NONE = 8       # infinite_defense_stacking が None
+
+# ダメージ計算係数の列（DamageCoefficients の項目名）
+_COEFFICIENT_FIELDS = (
+    "defense_boost_percent",
+    "stacking_rate_per_attack",
+    "damage_reduction",
+    "guard_factor",
+    "damage_factor",
+)
+
+
+class StringColumn:
+    """
+    文字列の列（UTF-8 で連結したバイト列と行ごとのオフセット）
+
+    None を含む列は None の行を別のマスクで表します。
+    """
+
+    def __init__(self, values: Iterable[Optional[str]]):
+        """
+        Args:
+            values: 文字列の一覧（None を含んでもよい）
+        """
+        encoded = []
+        nulls = []
+        for value in values:
+            nulls.append(value is None)
+            encoded.append(b"" if value is None else value.encode("utf-8"))
+        self._offsets = array("q", [0])
+        total = 0
+        for data in encoded:
+            total += len(data)
+            self._offsets.append(total)
+        self._data = b"".join(encoded)
+        self._nulls: Optional[np.ndarray] = np.array(nulls, dtype=bool) if any(nulls) else None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        if self._nulls is not None and self._nulls[i]:
+            return None
+        return self._data[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+
+    def slice(self, start: int, stop: int) -> List[Optional[str]]:
+        """start 行から stop 行の手前までの値を取得する"""
+        return [self[i] for i in range(start, stop)]
+
+    @property
+    def nbytes(self) -> int:
+        """列が保持するバッファの合計バイト数"""
+        nulls = 0 if self._nulls is None else self._nulls.nbytes
+        return len(self._data) + self._offsets.itemsize * len(self._offsets) + nulls
+
+
+def _encode_codes(values: Sequence[str]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """文字列を出現順に割り当てたコードの配列と、コードに対応する値の一覧に変換する"""
+    vocabulary: Dict[str, int] = {}
+    codes = np.fromiter(
+        (vocabulary.setdefault(value, len(vocabulary)) for value in values),
+        dtype=np.uint8,
+        count=len(values)
+    )
+    return codes, tuple(vocabulary)
+
+
+def _nullable(value: Optional[float]) -> float:
+    """None を NaN で表す"""
+    return np.nan if value is None else value
+
+
+class CharacterStore:
+    """
+    列指向のキャラクターストアクラス
+
+    行番号はキャラクター一覧の並び順です。ID からの行番号の検索は、ID のハッシュ値を
+    昇順に並べた配列の二分探索で行い、ID 文字列の辞書は保持しません
+    （ハッシュ値はプロセス内でのみ有効なため、ストアはプロセス間で共有しません）。
+    """
+
+    def __init__(self, characters: Sequence[Character]):
+        """
+        Args:
+            characters: キャラクター一覧（行番号はこの並び順）
+        """
+        size = len(characters)
+        self.ids = StringColumn(c.id for c in characters)
+        self.names = StringColumn(c.name for c in characters)
+        self.type_codes, self.type_names = _encode_codes([c.type for c in characters])
+        self.rarity = np.fromiter((c.rarity for c in characters), dtype=np.uint8, count=size)
+        self.defense_multiplier = np.fromiter(
+            (_nullable(c.defense_multiplier) for c in characters), dtype=np.float64, count=size
+        )
+        self.damage_reduction = np.fromiter(
+            (_nullable(c.damage_reduction) for c in characters), dtype=np.float64, count=size
+        )
+        self.flags = np.fromiter(
+            (
+                (FLAG_GUARD if c.guard_ability else 0)
+                | (FLAG_INFINITE_STACKING if c.infinite_defense_stacking else 0)
+                | (FLAG_GUARD_NONE if c.guard_ability is None else 0)
+                | (FLAG_INFINITE_NONE if c.infinite_defense_stacking is None else 0)
+                for c in characters
+            ),
+            dtype=np.uint8,
+            count=size
+        )
+
+        # パッシブスキルの表（キャラクター i のスキルは skill_offsets[i] から skill_offsets[i + 1] の手前まで）
+        skills = [skill for c in characters for skill in c.passive_skills]
+        self.skill_offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum([len(c.passive_skills) for c in characters], out=self.skill_offsets[1:])
+        self.skill_ids = StringColumn(skill.id for skill in skills)
+        self.skill_type_codes, self.skill_type_names = _encode_codes([skill.type for skill in skills])
+        self.skill_values = np.fromiter((skill.value for skill in skills), dtype=np.float64, count=len(skills))
+        self.skill_conditions = StringColumn(skill.condition for skill in skills)
+        self.skill_stackable = np.fromiter((skill.stackable for skill in skills), dtype=bool, count=len(skills))
+
+        # ダメージ計算係数（キャラクターの読み込み時に一度だけコンパイルする）
+        compiled = [compile_character(c) for c in characters]
+        self.coefficients: Dict[str, np.ndarray] = {
+            name: np.fromiter((getattr(k, name) for k in compiled), dtype=np.float64, count=size)
+            for name in _COEFFICIENT_FIELDS
+        }
+        self.versions = np.fromiter((k.version for k in compiled), dtype=np.int64, count=size)
+
+        # ID のハッシュ値（昇順）と対応する行番号
+        hashes = [hash(c.id) for c in characters]
+        order = sorted(range(size), key=hashes.__getitem__)
+        self._id_hashes = array("q", (hashes[i] for i in order))
+        self._id_rows = array("q", order)
+
+    def __len__(self) -> int:
+        return len(self.rarity)
+
+    def __contains__(self, character_id: str) -> bool:
+        return self.row_of(character_id) is not None
+
+    def row_of(self, character_id: str) -> Optional[int]:
+        """
+        ID の行番号を取得する
+
+        Args:
+            character_id: キャラクターID
+
+        Returns:
+            Optional[int]: 行番号（存在しない場合はNone）
+        """
+        key = hash(character_id)
+        j = bisect_left(self._id_hashes, key)
+        # ハッシュ値の衝突に備え、同じハッシュ値の行は ID を照合する
+        while j < len(self._id_hashes) and self._id_hashes[j] == key:
+            row = self._id_rows[j]
+            if self.ids[row] == character_id:
+                return row
+            j += 1
+        return None
+
+    def character_at(self, i: int) -> Character:
+        """
+        行から Character を生成する
+
+        ストアへの格納時に検証済みのデータのため、バリデーションを省略して生成します。
+
+        Args:
+            i: 行番号
+
+        Returns:
+            Character: キャラクター
+        """
+        flags = int(self.flags[i])
+        start, stop = int(self.skill_offsets[i]), int(self.skill_offsets[i + 1])
+        skill_types = self.skill_type_names
+        passive_skills = [
+            PassiveSkill.model_construct(
+                id=skill_id, type=skill_types[code], value=value, condition=condition, stackable=stackable
+            )
+            for skill_id, code, value, condition, stackable in zip(
+                self.skill_ids.slice(start, stop),
+                self.skill_type_codes[start:stop].tolist(),
+                self.skill_values[start:stop].tolist(),
+                self.skill_conditions.slice(start, stop),
+                self.skill_stackable[start:stop].tolist()
+            )
+        ]
+        defense_multiplier = self.defense_multiplier[i].item()
+        damage_reduction = self.damage_reduction[i].item()
+        return Character.model_construct(
+            id=self.ids[i],
+            name=self.names[i],
+            rarity=int(self.rarity[i]),
+            type=self.type_names[self.type_codes[i]],
+            passive_skills=passive_skills,
+            defense_multiplier=None if defense_multiplier != defense_multiplier else defense_multiplier,
+            damage_reduction=None if damage_reduction != damage_reduction else damage_reduction,
+            guard_ability=None if flags & FLAG_GUARD_NONE else bool(flags & FLAG_GUARD),
+            infinite_defense_stacking=(
+                None if flags & FLAG_INFINITE_NONE else bool(flags & FLAG_INFINITE_STACKING)
+            ),
+        )
+
+    def coefficients_at(self, i: int) -> DamageCoefficients:
+        """
+        行のダメージ計算係数を取得する
+
+        Args:
+            i: 行番号
+
+        Returns:
+            DamageCoefficients: コンパイル済みの係数
+        """
+        return DamageCoefficients(
+            self.ids[i],
+            *(self.coefficients[name][i].item() for name in _COEFFICIENT_FIELDS),
+            version=self.versions[i].item()
+        )
+
+    def all_coefficients(self) -> List[DamageCoefficients]:
+        """
+        全行のダメージ計算係数を取得する
+
+        Returns:
+            List[DamageCoefficients]: 行順の係数一覧
+        """
+        columns = [self.coefficients[name].tolist() for name in _COEFFICIENT_FIELDS]
+        return [
+            DamageCoefficients(character_id, *values, version=version)
+            for character_id, *values, version in zip(
+                self.ids.slice(0, len(self)), *columns, self.versions.tolist()
+            )
+        ]
+
+    def type_at(self, i: int) -> str:
+        """行の属性タイプを取得する"""
+        return self.type_names[self.type_codes[i]]
+
+    def skill_type_rows(self) -> Dict[str, np.ndarray]:
+        """
+        パッシブスキルのタイプごとに、そのタイプのスキルを持つ行番号を取得する
+
+        Returns:
+            Dict[str, np.ndarray]: スキルタイプをキーとする行番号の配列（重複を含む）
+        """
+        owners = np.repeat(np.arange(len(self), dtype=np.intp), np.diff(self.skill_offsets))
+        return {
+            skill_type: owners[self.skill_type_codes == code]
+            for code, skill_type in enumerate(self.skill_type_names)
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """ストアが保持する配列の合計バイト数（Python オブジェクトのヘッダーを除く）"""
+        arrays = [
+            self.type_codes, self.rarity, self.defense_multiplier, self.damage_reduction, self.flags,
+            self.skill_offsets, self.skill_type_codes, self.skill_values, self.skill_stackable,
+            self.versions, *self.coefficients.values()
+        ]
+        columns = [self.ids, self.names, self.skill_ids, self.skill_conditions]
+        return (
+            sum(a.nbytes for a in arrays)
+            + sum(c.nbytes for c in columns)
+            + self._id_hashes.itemsize * len(self._id_hashes) * 2
+        )
@@ -4,18 +4,48 @@
 ダメージ計算のコアロジックを提供するサービスクラスです。
 """
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
+import asyncio
 import logging
+import math
+import secrets
 
+import numpy as np
+
+from ..core.cache import CacheStats, TTLCache
+from ..core.config import get_settings
+from ..core.logging_config import log_fields, should_log_request
+from ..core.metrics import counter
 from ..models.schemas import (
     Character,
     DamageCalculationRequest,
     DamageCalculationResult,
+    BatchDamageCalculationResult,
+    DamageSweepRequest,
+    BattleSimulationRequest,
+    BattleSimulationResult,
+    SweepRange,
     AppliedModifiers,
-    PassiveSkill
+    CalculationDetailLevel
 )
+from .battle_simulation import simulate_turn_damage
+from .damage_coefficients import DamageCoefficients, compile_character
+from .damage_kernel import build_character_arrays, calculate_damage_arrays
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# path: scalar（単体）/ batch（一括）/ sweep（グリッドスイープ）/ sweep_job（スイープジョブ）/ simulation（バトルシミュレーション）
+calculations_total = counter(
+    "dokkan_calculations",
+    "計算経路ごとのダメージ計算の呼び出し件数（単体はメモのヒットを含む）",
+    ("path",)
+)
+calculated_cells_total = counter(
+    "dokkan_calculated_cells",
+    "計算経路ごとの計算結果の件数（一括は行数、スイープは格子の要素数、シミュレーションは試行回数 × 攻撃数）",
+    ("path",)
+)
 
 
 class DamageCalculatorService:
@@ -24,25 +54,134 @@ class DamageCalculatorService:
     
     キャラクターの防御ステータス、パッシブスキル、リーダースキルを考慮して
     最終的な受けるダメージを計算します。
+    
+    単体の計算結果は、キャラクターのバージョンと入力値をキーとする LRU のメモに保持し、
+    同じ計算の繰り返しでは再利用します。キャラクターの内容がカタログ更新で変わると
+    バージョンが変わるため、古い結果は参照されなくなり LRU により順次削除されます。
     """
     
+    def __init__(self, memo_max_entries: Optional[int] = None):
+        """
+        Args:
+            memo_max_entries: 計算結果のメモの最大エントリ数（省略時は設定値、0 でメモを無効化）
+        """
+        if memo_max_entries is None:
+            memo_max_entries = (
+                settings.calculation_memo_max_entries if settings.calculation_memo_enabled else 0
+            )
+        # 結果はキャラクターのバージョンで無効化されるため有効期限は設けない
+        self._memo: Optional[TTLCache] = (
+            TTLCache(max_entries=memo_max_entries, default_ttl=math.inf)
+            if memo_max_entries > 0 else None
+        )
+    
     async def calculate_damage(
         self,
         request: DamageCalculationRequest,
-        character: Character
+        character: Character,
+        coefficients: Optional[DamageCoefficients] = None,
+        detail: CalculationDetailLevel = "full"
     ) -> DamageCalculationResult:
         """
         ダメージ計算のメイン処理
         
+        detail が full 未満の場合、パッシブスキル一覧の複製と説明文の生成を省略し、
+        結果は検証を省いて組み立てます（値は計算済みのため検証不要）。
+        
+        メモが有効な場合、結果はメモと共有されるため呼び出し側で変更しないでください。
+        
         Args:
             request: ダメージ計算リクエスト
             character: キャラクター情報
+            coefficients: コンパイル済みの係数（省略時はキャラクターからコンパイル）
+            detail: 計算結果の詳細度
             
         Returns:
             DamageCalculationResult: 計算結果
         """
-        logger.info(f"ダメージ計算開始: キャラクター={character.name}, DEF={request.def_stat}")
+        if coefficients is None:
+            coefficients = compile_character(character)
+        
+        memo_key = None
+        result = None
+        if self._memo is not None:
+            memo_key = (
+                coefficients.character_id,
+                coefficients.version,
+                request.def_stat,
+                request.leader_skill_multiplier,
+                request.enemy_attack,
+                request.attack_count or 0,
+                detail
+            )
+            result = self._memo.get(memo_key)
+        memo_hit = result is not None
+        calculations_total.inc("scalar")
+        calculated_cells_total.inc("scalar")
+        
+        if not memo_hit:
+            result = self._calculate_damage(request, character, coefficients, detail)
+            if memo_key is not None:
+                self._memo.set(memo_key, result)
+        
+        # リクエスト単位のログはサンプリングし、項目の整形はログ出力スレッドで行う
+        if should_log_request(logger):
+            logger.info("ダメージ計算完了", extra=log_fields(
+                character_id=character.id,
+                def_stat=request.def_stat,
+                leader_skill_multiplier=request.leader_skill_multiplier,
+                enemy_attack=request.enemy_attack,
+                detail=detail,
+                damage_received=result.damage_received,
+                memo_hit=memo_hit
+            ))
+        return result
+    
+    def memo_stats(self) -> Dict[str, Any]:
+        """
+        計算結果のメモの使用状況と統計情報を取得する
+        
+        Returns:
+            Dict[str, Any]: エントリ数・ヒット/ミス/削除件数・ヒット率（メモ無効時は全て0）
+        """
+        memo = self._memo
+        stats = memo.stats if memo is not None else CacheStats()
+        return {
+            "entries": len(memo) if memo is not None else 0,
+            "bytes": 0,
+            "max_entries": memo.max_entries if memo is not None else 0,
+            "max_bytes": None,
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "evictions": stats.evictions,
+            "expirations": stats.expirations,
+            "hit_ratio": stats.hit_ratio
+        }
+    
+    def clear_memo(self) -> None:
+        """計算結果のメモを全て削除する"""
+        if self._memo is not None:
+            self._memo.clear()
+    
+    def _calculate_damage(
+        self,
+        request: DamageCalculationRequest,
+        character: Character,
+        coefficients: DamageCoefficients,
+        detail: CalculationDetailLevel
+    ) -> DamageCalculationResult:
+        """
+        ダメージを計算する（メモを使用しない）
         
+        Args:
+            request: ダメージ計算リクエスト
+            character: キャラクター情報
+            coefficients: コンパイル済みの係数
+            detail: 計算結果の詳細度
+            
+        Returns:
+            DamageCalculationResult: 計算結果
+        """
         # 1. 基本防御力の計算（DEF × リーダースキル倍率）
         base_defense = self._calculate_base_defense(
             request.def_stat,
@@ -51,7 +190,7 @@ class DamageCalculatorService:
         
         # 2. パッシブスキルによる防御力修正の計算
         passive_defense_bonus = self._calculate_passive_defense_bonus(
-            character,
+            coefficients,
             base_defense,
             request.attack_count or 0
         )
@@ -59,22 +198,26 @@ class DamageCalculatorService:
         # 3. 実効防御力の計算
         effective_defense = base_defense + passive_defense_bonus
         
-        # 4. ダメージ軽減の適用
-        damage_reduction_rate = self._calculate_damage_reduction(character)
-        
-        # 5. 最終ダメージの計算
+        # 4-6. ダメージ軽減・ガード能力を適用した最終ダメージの計算
         raw_damage = max(0, request.enemy_attack - effective_defense)
-        final_damage = raw_damage * (1 - damage_reduction_rate / 100)
+        final_damage = raw_damage * coefficients.damage_factor
+        stacking_bonus = passive_defense_bonus if character.infinite_defense_stacking else None
         
-        # 6. ガード能力の適用
-        if character.guard_ability and self._should_apply_guard(character, request):
-            final_damage = self._apply_guard_reduction(final_damage)
+        if detail != "full":
+            return DamageCalculationResult.model_construct(
+                effective_defense=effective_defense,
+                damage_received=max(0.0, final_damage),
+                applied_modifiers=AppliedModifiers.model_construct(
+                    leader_skill=request.leader_skill_multiplier,
+                    stacking_bonus=stacking_bonus
+                ) if detail == "summary" else None
+            )
         
         # 7. 適用された修正値の詳細を作成
         applied_modifiers = AppliedModifiers(
             leader_skill=request.leader_skill_multiplier,
             passive_skills=character.passive_skills,
-            stacking_bonus=passive_defense_bonus if character.infinite_defense_stacking else None
+            stacking_bonus=stacking_bonus
         )
         
         # 8. 計算詳細の説明文を生成
@@ -89,9 +232,180 @@ class DamageCalculatorService:
             calculation_details=calculation_details
         )
         
-        logger.info(f"ダメージ計算完了: 実効防御力={effective_defense}, 受けるダメージ={final_damage}")
         return result
     
+    async def calculate_damage_batch(
+        self,
+        requests: List[DamageCalculationRequest],
+        coefficients: Dict[str, DamageCoefficients]
+    ) -> BatchDamageCalculationResult:
+        """
+        複数行のダメージ計算を一括で実行する
+
+        calculate_damage と同一の計算を NumPy 配列上でまとめて行います。
+        計算詳細の説明文や適用された修正値は生成しません。
+
+        Args:
+            requests: ダメージ計算リクエスト一覧
+            coefficients: キャラクターIDをキーとするコンパイル済みの係数
+
+        Returns:
+            BatchDamageCalculationResult: 各行の計算結果
+        """
+        if should_log_request(logger):
+            logger.info("一括ダメージ計算開始", extra=log_fields(
+                rows=len(requests), characters=len(coefficients)
+            ))
+        calculations_total.inc("batch")
+        calculated_cells_total.inc("batch", amount=len(requests))
+
+        # キャラクターを配列の行番号に対応付ける
+        character_ids = list(coefficients)
+        row_of = {character_id: row for row, character_id in enumerate(character_ids)}
+        arrays = build_character_arrays([coefficients[cid] for cid in character_ids])
+
+        count = len(requests)
+        character_index = np.fromiter(
+            (row_of[r.character_id] for r in requests), dtype=np.intp, count=count
+        )
+        def_stat = np.fromiter((r.def_stat for r in requests), dtype=np.float64, count=count)
+        leader_skill_multiplier = np.fromiter(
+            (r.leader_skill_multiplier for r in requests), dtype=np.float64, count=count
+        )
+        enemy_attack = np.fromiter((r.enemy_attack for r in requests), dtype=np.float64, count=count)
+        attack_count = np.fromiter(
+            (r.attack_count or 0 for r in requests), dtype=np.float64, count=count
+        )
+
+        effective_defense, damage_received = calculate_damage_arrays(
+            arrays,
+            character_index,
+            def_stat,
+            leader_skill_multiplier,
+            enemy_attack,
+            attack_count
+        )
+
+        return BatchDamageCalculationResult(
+            count=count,
+            effective_defense=effective_defense.tolist(),
+            damage_received=damage_received.tolist()
+        )
+
+    async def calculate_damage_sweep(
+        self,
+        request: DamageSweepRequest,
+        character: Character,
+        coefficients: Optional[DamageCoefficients] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        DEF × 敵攻撃値 × リーダースキル倍率のグリッド全体を一括計算する
+
+        Args:
+            request: グリッドスイープリクエスト
+            character: キャラクター情報
+            coefficients: コンパイル済みの係数（省略時はキャラクターからコンパイル）
+
+        Returns:
+            Dict[str, np.ndarray]: 各軸の値と受けるダメージのグリッド
+                （damage_received の形状は (リーダースキル倍率, DEF, 敵攻撃値)）
+        """
+        leader_values = self._sweep_axis(request.leader_skill_multiplier)
+        def_values = self._sweep_axis(request.def_stat)
+        enemy_values = self._sweep_axis(request.enemy_attack)
+        if should_log_request(logger):
+            logger.info("グリッドスイープ開始", extra=log_fields(
+                character_id=character.id,
+                shape=(leader_values.size, def_values.size, enemy_values.size)
+            ))
+        calculations_total.inc("sweep")
+        calculated_cells_total.inc("sweep", amount=leader_values.size * def_values.size * enemy_values.size)
+
+        arrays = build_character_arrays([coefficients or compile_character(character)])
+        # 格子全体の計算は NumPy が GIL を解放するため、イベントループを塞がないようスレッドで行う
+        _, damage_received = await asyncio.to_thread(
+            calculate_damage_arrays,
+            arrays,
+            0,
+            def_values[np.newaxis, :, np.newaxis],
+            leader_values[:, np.newaxis, np.newaxis],
+            enemy_values[np.newaxis, np.newaxis, :],
+            request.attack_count or 0
+        )
+
+        return {
+            "leader_skill_multiplier": leader_values,
+            "def_stat": def_values,
+            "enemy_attack": enemy_values,
+            "damage_received": damage_received
+        }
+
+    async def simulate_battle(
+        self,
+        request: BattleSimulationRequest,
+        character: Character,
+        coefficients: Optional[DamageCoefficients] = None
+    ) -> BattleSimulationResult:
+        """
+        1ターン分の被ダメージをモンテカルロ試行し、分布を集計する
+
+        Args:
+            request: バトルシミュレーションリクエスト
+            character: キャラクター情報
+            coefficients: コンパイル済みの係数（省略時はキャラクターからコンパイル）
+
+        Returns:
+            BattleSimulationResult: 被ダメージの統計量・パーセンタイル・HP 以上になる確率
+        """
+        seed = request.seed if request.seed is not None else secrets.randbits(32)
+        samples = request.trials * len(request.attacks)
+        if should_log_request(logger):
+            logger.info("バトルシミュレーション開始", extra=log_fields(
+                character_id=character.id, trials=request.trials, attacks=len(request.attacks), seed=seed
+            ))
+        calculations_total.inc("simulation")
+        calculated_cells_total.inc("simulation", amount=samples)
+
+        def simulate() -> BattleSimulationResult:
+            totals, attack_totals = simulate_turn_damage(
+                coefficients or compile_character(character),
+                request.def_stat,
+                request.leader_skill_multiplier,
+                request.attacks,
+                request.trials,
+                np.random.default_rng(seed),
+                request.attack_count or 0
+            )
+            percentiles = np.percentile(totals, request.percentiles)
+            return BattleSimulationResult(
+                trials=request.trials,
+                seed=seed,
+                hp=request.hp,
+                mean_damage=float(totals.mean()),
+                std_damage=float(totals.std()),
+                min_damage=float(totals.min()),
+                max_damage=float(totals.max()),
+                percentiles={f"p{p:g}": float(value) for p, value in zip(request.percentiles, percentiles)},
+                exceed_hp_probability=float(np.count_nonzero(totals >= request.hp)) / request.trials,
+                attack_mean_damage=(attack_totals / request.trials).tolist()
+            )
+
+        # 試行は NumPy が GIL を解放するため、イベントループを塞がないようスレッドで行う
+        return await asyncio.to_thread(simulate)
+
+    @staticmethod
+    def _sweep_axis(sweep_range: SweepRange) -> np.ndarray:
+        """
+        スイープ範囲から軸の値の配列を生成する
+
+        Args:
+            sweep_range: スイープ範囲
+
+        Returns:
+            np.ndarray: 軸の値
+        """
+        return sweep_range.start + sweep_range.step * np.arange(sweep_range.count(), dtype=np.float64)
+
     def _calculate_base_defense(self, def_stat: int, leader_skill_multiplier: float) -> float:
         """
         基本防御力を計算する（DEF × リーダースキル倍率）
@@ -107,7 +421,7 @@ class DamageCalculatorService:
     
     def _calculate_passive_defense_bonus(
         self,
-        character: Character,
+        coefficients: DamageCoefficients,
         base_defense: float,
         attack_count: int
     ) -> float:
@@ -115,35 +429,27 @@ class DamageCalculatorService:
         パッシブスキルによる防御力ボーナスを計算する
         
         Args:
-            character: キャラクター情報
+            coefficients: コンパイル済みの係数
             base_defense: 基本防御力
             attack_count: 攻撃回数（DEF無限上昇用）
             
         Returns:
             float: 防御力ボーナス
         """
-        total_bonus = 0.0
-        
-        # キャラクター固有の防御力倍率を適用
-        if character.defense_multiplier:
-            total_bonus += base_defense * (character.defense_multiplier / 100)
+        # 防御力倍率と defense_boost スキルの合計
+        total_bonus = base_defense * (coefficients.defense_boost_percent / 100)
         
-        # パッシブスキルによるボーナスを計算
-        for skill in character.passive_skills:
-            if skill.type == "defense_boost":
-                total_bonus += base_defense * (skill.value / 100)
-            elif skill.type == "infinite_stacking" and character.infinite_defense_stacking:
-                # DEF無限上昇の計算
-                stacking_bonus = self._calculate_infinite_stacking_bonus(
-                    skill, base_defense, attack_count
-                )
-                total_bonus += stacking_bonus
+        # DEF無限上昇の計算
+        if coefficients.stacking_rate_per_attack:
+            total_bonus += self._calculate_infinite_stacking_bonus(
+                coefficients.stacking_rate_per_attack, base_defense, attack_count
+            )
         
         return total_bonus
     
     def _calculate_infinite_stacking_bonus(
         self,
-        skill: PassiveSkill,
+        stacking_rate_per_attack: float,
         base_defense: float,
         attack_count: int
     ) -> float:
@@ -151,7 +457,7 @@ class DamageCalculatorService:
         DEF無限上昇による防御力ボーナスを計算する
         
         Args:
-            skill: 無限上昇パッシブスキル
+            stacking_rate_per_attack: 1回の攻撃あたりの増加率（パーセンテージ）
             base_defense: 基本防御力
             attack_count: 攻撃回数
             
@@ -162,64 +468,9 @@ class DamageCalculatorService:
             return 0.0
         
         # 攻撃回数に応じた段階的な防御力増加
-        # skill.value は1回の攻撃あたりの増加率（パーセンテージ）
-        total_stacking_rate = skill.value * attack_count
+        total_stacking_rate = stacking_rate_per_attack * attack_count
         return base_defense * (total_stacking_rate / 100)
     
-    def _calculate_damage_reduction(self, character: Character) -> float:
-        """
-        ダメージ軽減率を計算する
-        
-        Args:
-            character: キャラクター情報
-            
-        Returns:
-            float: ダメージ軽減率（パーセンテージ）
-        """
-        total_reduction = 0.0
-        
-        # キャラクター固有のダメージ軽減
-        if character.damage_reduction:
-            total_reduction += character.damage_reduction
-        
-        # パッシブスキルによるダメージ軽減
-        for skill in character.passive_skills:
-            if skill.type == "damage_reduction":
-                total_reduction += skill.value
-        
-        # ダメージ軽減率は100%を超えないようにクランプ
-        return min(total_reduction, 100.0)
-    
-    def _should_apply_guard(self, character: Character, request: DamageCalculationRequest) -> bool:
-        """
-        ガード能力を適用するかどうかを判定する
-        
-        Args:
-            character: キャラクター情報
-            request: ダメージ計算リクエスト
-            
-        Returns:
-            bool: ガード適用可否
-        """
-        # 基本的にはガード能力があれば適用
-        # 将来的には属性相性や条件判定を追加可能
-        return character.guard_ability or False
-    
-    def _apply_guard_reduction(self, damage: float) -> float:
-        """
-        ガード能力によるダメージ軽減を適用する
-        
-        Args:
-            damage: 軽減前のダメージ
-            
-        Returns:
-            float: ガード適用後のダメージ
-        """
-        # ガード時は通常50%のダメージ軽減
-        # TODO: キャラクターやスキルに応じた軽減率の設定
-        guard_reduction_rate = 0.5
-        return damage * (1 - guard_reduction_rate)
-    
     def _generate_calculation_details(
         self,
         request: DamageCalculationRequest,
@@ -260,4 +511,23 @@ class DamageCalculatorService:
         details.append(f"敵攻撃力: {request.enemy_attack:,}")
         details.append(f"受けるダメージ: {final_damage:,.0f}")
         
-        return " → ".join(details)
\ No newline at end of file
+        return " → ".join(details)
+
+
+# プロセス共有のダメージ計算サービスインスタンス
+_damage_calculator_service: Optional[DamageCalculatorService] = None
+
+
+def get_damage_calculator_service() -> DamageCalculatorService:
+    """
+    プロセス共有のダメージ計算サービスインスタンスを取得する関数
+    
+    計算結果のメモをリクエスト間で共有するため、常に同一のインスタンスを返します。
+    
+    Returns:
+        DamageCalculatorService: ダメージ計算サービス
+    """
+    global _damage_calculator_service
+    if _damage_calculator_service is None:
+        _damage_calculator_service = DamageCalculatorService()
+    return _damage_calculator_service
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - ダメージ計算係数
+
+キャラクターのパッシブスキルを事前に集計し、ダメージ計算のホットパスで
+使用する係数レコードへコンパイルする機能を提供します。
+"""
+
+from dataclasses import dataclass
+
+from ..models.schemas import Character
+
+# ガード時のダメージ軽減率（通常50%）
+# TODO: キャラクターやスキルに応じた軽減率の設定
+GUARD_REDUCTION_RATE = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class DamageCoefficients:
+    """
+    キャラクター1体分のダメージ計算係数
+
+    キャラクターの読み込み・更新時に一度だけ生成し、計算時には
+    パッシブスキル一覧を走査せずにこの値のみを使用します。
+    """
+    character_id: str
+    defense_boost_percent: float      # 防御力倍率 + defense_boost スキルの合計（%）
+    stacking_rate_per_attack: float   # 攻撃1回あたりのDEF上昇率（%、DEF無限上昇用）
+    damage_reduction: float           # ダメージ軽減率（%、100%でクランプ済み）
+    guard_factor: float               # ガード適用時の被ダメージ倍率（ガードなしは1.0）
+    damage_factor: float              # 軽減率とガードを合成した被ダメージ倍率
+    version: int = 0                  # キャラクター内容のバージョン（内容が変われば変わる）
+
+
+def character_version(character: Character) -> int:
+    """
+    キャラクターの内容から、そのキャラクターのバージョンを算出する
+
+    カタログ更新で内容（パッシブスキルを含む全項目）が変わった場合にのみ値が変わるため、
+    計算結果のメモのキーに含めることで古い結果が参照されなくなります。
+    値はプロセス内でのみ有効です（文字列のハッシュはプロセスごとに異なる）。
+
+    Args:
+        character: キャラクター情報
+
+    Returns:
+        int: バージョン
+    """
+    return hash((
+        tuple(value for name, value in character.__dict__.items() if name != "passive_skills"),
+        tuple(tuple(skill.__dict__.values()) for skill in character.passive_skills)
+    ))
+
+
+def compile_character(character: Character) -> DamageCoefficients:
+    """
+    キャラクターをダメージ計算係数にコンパイルする
+
+    Args:
+        character: キャラクター情報
+
+    Returns:
+        DamageCoefficients: コンパイル済みの係数
+    """
+    defense_boost_percent = 0.0
+    stacking_rate_per_attack = 0.0
+    total_reduction = 0.0
+
+    # キャラクター固有の防御力倍率・ダメージ軽減
+    if character.defense_multiplier:
+        defense_boost_percent += character.defense_multiplier
+    if character.damage_reduction:
+        total_reduction += character.damage_reduction
+
+    # パッシブスキルの集計
+    for skill in character.passive_skills:
+        if skill.type == "defense_boost":
+            defense_boost_percent += skill.value
+        elif skill.type == "infinite_stacking" and character.infinite_defense_stacking:
+            stacking_rate_per_attack += skill.value
+        elif skill.type == "damage_reduction":
+            total_reduction += skill.value
+
+    # ダメージ軽減率は100%を超えないようにクランプ
+    damage_reduction = min(total_reduction, 100.0)
+
+    # ガード能力があれば常に適用（将来的には属性相性や条件判定を追加可能）
+    guard_factor = 1 - GUARD_REDUCTION_RATE if character.guard_ability else 1.0
+
+    return DamageCoefficients(
+        character_id=character.id,
+        defense_boost_percent=defense_boost_percent,
+        stacking_rate_per_attack=stacking_rate_per_attack,
+        damage_reduction=damage_reduction,
+        guard_factor=guard_factor,
+        damage_factor=(1 - damage_reduction / 100) * guard_factor,
+        version=character_version(character)
+    )
@@ -0,0 +1,98 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - ベクトル化ダメージ計算カーネル
+
+DamageCalculatorService.calculate_damage と同一の計算を NumPy 配列に対して
+一括で行うカーネルを提供します。
+"""
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from .damage_coefficients import DamageCoefficients
+
+
+@dataclass(frozen=True)
+class CharacterArrays:
+    """
+    ダメージ計算係数をキャラクターごとの配列にしたもの
+    """
+    defense_boost_percent: np.ndarray     # (キャラクター数,) float64
+    stacking_rate_per_attack: np.ndarray  # (キャラクター数,) float64
+    damage_factor: np.ndarray             # (キャラクター数,) float64
+
+
+def build_character_arrays(coefficients: Sequence[DamageCoefficients]) -> CharacterArrays:
+    """
+    ダメージ計算係数の一覧から計算用の配列を構築する
+
+    Args:
+        coefficients: キャラクターごとの係数（配列の行順はこの順序に従う）
+
+    Returns:
+        CharacterArrays: 配列化された係数
+    """
+    return CharacterArrays(
+        defense_boost_percent=np.fromiter(
+            (c.defense_boost_percent for c in coefficients), dtype=np.float64, count=len(coefficients)
+        ),
+        stacking_rate_per_attack=np.fromiter(
+            (c.stacking_rate_per_attack for c in coefficients), dtype=np.float64, count=len(coefficients)
+        ),
+        damage_factor=np.fromiter(
+            (c.damage_factor for c in coefficients), dtype=np.float64, count=len(coefficients)
+        ),
+    )
+
+
+def calculate_damage_arrays(
+    arrays: CharacterArrays,
+    character_index: np.ndarray,
+    def_stat: np.ndarray,
+    leader_skill_multiplier: np.ndarray,
+    enemy_attack: np.ndarray,
+    attack_count: np.ndarray,
+):
+    """
+    ダメージ計算をベクトル化して一括実行する
+
+    Args:
+        arrays: 配列化された係数
+        character_index: 各行が参照するキャラクターの行番号
+        def_stat: DEFステータス値
+        leader_skill_multiplier: リーダースキル倍率
+        enemy_attack: 敵の攻撃値
+        attack_count: 攻撃回数
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (実効防御力, 受けるダメージ)
+
+    各入力は NumPy のブロードキャスト規則に従って結合されるため、
+    character_index にスカラーを渡して格子状の入力を与えることもできます。
+    """
+    def_stat = np.asarray(def_stat, dtype=np.float64)
+    leader_skill_multiplier = np.asarray(leader_skill_multiplier, dtype=np.float64)
+    enemy_attack = np.asarray(enemy_attack, dtype=np.float64)
+    attack_count = np.asarray(attack_count, dtype=np.float64)
+
+    # 1. 基本防御力（DEF × リーダースキル倍率）
+    base_defense = def_stat * leader_skill_multiplier
+
+    # 2. パッシブスキルによる防御力ボーナス（固定分 + DEF無限上昇分）
+    defense_boost_percent = arrays.defense_boost_percent[character_index]
+    stacking_rate = arrays.stacking_rate_per_attack[character_index]
+    passive_defense_bonus = base_defense * (defense_boost_percent / 100) + np.where(
+        attack_count > 0,
+        base_defense * ((stacking_rate * attack_count) / 100),
+        0.0
+    )
+
+    # 3. 実効防御力
+    effective_defense = base_defense + passive_defense_bonus
+
+    # 4-6. ダメージ軽減・ガードを適用した最終ダメージ
+    raw_damage = np.maximum(0.0, enemy_attack - effective_defense)
+    final_damage = raw_damage * arrays.damage_factor[character_index]
+
+    return effective_defense, np.maximum(0.0, final_damage)
@@ -0,0 +1,307 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - キャラクター名検索
+
+キャラクター名の正規化（全角・半角、ひらがな・カタカナ、括弧）と、
+正規化済みの名前に対する n-gram 索引による部分一致検索を提供します。
+"""
+
+import heapq
+import math
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+# ひらがな（ぁ〜ゖ）をカタカナに寄せる変換表
+_HIRAGANA_TO_KATAKANA = {code: code + 0x60 for code in range(0x3041, 0x3097)}
+
+# 検索時に無視する括弧・区切り記号・空白（NFKC 正規化後の文字）
+_IGNORED_CHARACTERS = str.maketrans("", "", "()[]{}<>「」『』【】〔〕〈〉《》・･ 　、。,.!?:;/~〜'\"")
+
+# マッチの種類（小さいほど上位）
+MATCH_EXACT = "exact"
+MATCH_PREFIX = "prefix"
+MATCH_SUBSTRING = "substring"
+MATCH_FUZZY = "fuzzy"
+
+# あいまい検索で候補とする、クエリの n-gram の最低一致率
+FUZZY_MIN_OVERLAP = 0.5
+
+# あいまい検索で一致率を確認する候補の上限（名前の短い順）
+FUZZY_MAX_CANDIDATES = 200
+
+
+def normalize_name(text: str) -> str:
+    """
+    検索用に名前を正規化する
+
+    - NFKC 正規化（全角英数字・記号を半角に、半角カナを全角に）
+    - 英字を小文字に、ひらがなをカタカナに統一
+    - 括弧・区切り記号・空白を除去
+
+    Args:
+        text: 名前または検索文字列
+
+    Returns:
+        str: 正規化した文字列
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    return text.translate(_HIRAGANA_TO_KATAKANA).translate(_IGNORED_CHARACTERS)
+
+
+def _grams(text: str) -> Set[str]:
+    """文字列の 1-gram と 2-gram の集合"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+# ポスティングリストの並び順キー（正規化した名前の長さ, キャラクターID）
+_PostingKey = Tuple[int, str]
+
+
+class NameEntry(NamedTuple):
+    """
+    名前索引に登録するキャラクターの情報
+    """
+    id: str
+    name: str
+    type: str
+    rarity: int
+
+
+class NameIndexDelta(NamedTuple):
+    """
+    名前索引の差分（NameIndex.diff で計算し、NameIndex.apply で反映する）
+    """
+    removed: List[str]  # 一覧からなくなったキャラクターID
+    added: List[Tuple[NameEntry, str]]  # 追加・名前変更したキャラクターと正規化した名前
+    replaced: List[NameEntry]  # 名前以外のみ変更したキャラクター
+
+
+class NameSearchHit(NamedTuple):
+    """
+    名前検索の結果
+    """
+    entry: NameEntry
+    match: str  # exact / prefix / substring / fuzzy
+
+
+class NameIndex:
+    """
+    キャラクター名の n-gram 索引クラス
+
+    正規化した名前の 1-gram・2-gram ごとに、該当するキャラクターを
+    （名前の長さ, ID）順に並べたポスティングリストを保持します。
+    名前の先頭 1〜2 文字ごとのリストも別に持ち、前方一致はこちらから探します。
+    update() は前回との差分（追加・削除・名前変更）のみを二分探索で
+    各リストに挿入・削除して反映します。差分の計算（diff）と反映（apply）は
+    分けて呼び出せ、diff は索引を変更しないためワーカースレッドで実行できます
+    （diff から apply までの間に他の更新を行わないこと）。
+
+    検索結果は完全一致 > 前方一致 > 部分一致の順、同順位は名前の短い順です。
+    各リストは既にこの順に並んでいるため、件数に達した時点で走査を打ち切ります。
+    部分一致がない場合は n-gram の一致率によるあいまい検索を行います
+    （確認する候補は名前の短い順に FUZZY_MAX_CANDIDATES 件まで）。
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, NameEntry] = {}
+        self._normalized: Dict[str, str] = {}
+        # キャラクターごとの並び順キー（全ポスティングリストで同じオブジェクトを共有）
+        self._keys: Dict[str, _PostingKey] = {}
+        self._postings: Dict[str, List[_PostingKey]] = {}
+        self._prefixes: Dict[str, List[_PostingKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, entries: Iterable[NameEntry]) -> Tuple[int, int]:
+        """
+        索引を新しいキャラクター一覧の内容に更新する（差分のみ反映）
+
+        Args:
+            entries: キャラクター一覧の全件
+
+        Returns:
+            Tuple[int, int]: 追加・変更した件数と、削除した件数
+        """
+        return self.apply(self.diff(entries))
+
+    def diff(self, entries: Iterable[NameEntry]) -> NameIndexDelta:
+        """
+        新しいキャラクター一覧との差分を計算する（索引は変更しない）
+
+        Args:
+            entries: キャラクター一覧の全件
+
+        Returns:
+            NameIndexDelta: 索引に反映する差分
+        """
+        latest = {entry.id: entry for entry in entries}
+        removed = [character_id for character_id in self._entries if character_id not in latest]
+
+        added = []
+        replaced = []
+        for character_id, entry in latest.items():
+            current = self._entries.get(character_id)
+            if current == entry:
+                continue
+            if current is not None and current.name == entry.name:
+                # 名前以外の変更は索引の付け替え不要
+                replaced.append(entry)
+                continue
+            added.append((entry, normalize_name(entry.name)))
+
+        return NameIndexDelta(removed, added, replaced)
+
+    def apply(self, delta: NameIndexDelta) -> Tuple[int, int]:
+        """
+        diff で計算した差分を索引に反映する
+
+        Args:
+            delta: 直前の diff で計算した差分
+
+        Returns:
+            Tuple[int, int]: 追加・変更した件数と、削除した件数
+        """
+        bulk = not self._entries
+
+        for character_id in delta.removed:
+            self._remove(character_id)
+        for entry in delta.replaced:
+            self._entries[entry.id] = entry
+        for entry, normalized in delta.added:
+            if entry.id in self._entries:
+                self._remove(entry.id)
+            self._add(entry, normalized, bulk)
+
+        if bulk:
+            # 初回構築はまとめて追加してから一度だけ並べ替える
+            for posting in (*self._postings.values(), *self._prefixes.values()):
+                posting.sort()
+
+        return len(delta.added), len(delta.removed)
+
+    def search(self, query: str, limit: int = 10) -> List[NameSearchHit]:
+        """
+        名前を検索する
+
+        Args:
+            query: 検索文字列
+            limit: 最大件数
+
+        Returns:
+            List[NameSearchHit]: 検索結果（上位順）
+        """
+        normalized_query = normalize_name(query)
+        if not normalized_query or limit <= 0:
+            return []
+
+        rarest = self._rarest_posting(normalized_query)
+        if not rarest:
+            return self._search_fuzzy(normalized_query, limit)
+
+        hits = self._search_prefix(normalized_query, limit, rarest)
+        if len(hits) < limit:
+            hits.extend(self._search_substring(normalized_query, limit - len(hits), rarest))
+        return hits
+
+    def _rarest_posting(self, query: str) -> List[_PostingKey]:
+        """クエリの n-gram のうち最も短いポスティングリスト（該当なしの n-gram があれば空）"""
+        grams = [query] if len(query) == 1 else [query[i:i + 2] for i in range(len(query) - 1)]
+        rarest: List[_PostingKey] = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            if not rarest or len(posting) < len(rarest):
+                rarest = posting
+        return rarest
+
+    def _search_prefix(self, query: str, limit: int, rarest: List[_PostingKey]) -> List[NameSearchHit]:
+        """完全一致・前方一致で検索する（完全一致は名前が最短のため先頭に並ぶ）"""
+        candidates = self._prefixes.get(query[:2], ())
+        if len(rarest) < len(candidates):
+            candidates = rarest
+
+        hits: List[NameSearchHit] = []
+        for length, character_id in candidates:
+            if self._normalized[character_id].startswith(query):
+                match = MATCH_EXACT if length == len(query) else MATCH_PREFIX
+                hits.append(NameSearchHit(self._entries[character_id], match))
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def _search_substring(self, query: str, limit: int, rarest: List[_PostingKey]) -> List[NameSearchHit]:
+        """前方一致以外の部分一致で検索する"""
+        hits: List[NameSearchHit] = []
+        for _, character_id in rarest:
+            if self._normalized[character_id].find(query) > 0:
+                hits.append(NameSearchHit(self._entries[character_id], MATCH_SUBSTRING))
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def _search_fuzzy(self, query: str, limit: int) -> List[NameSearchHit]:
+        """クエリの n-gram の一致率で検索する（部分一致がない場合の補完）"""
+        query_grams = {query[i:i + 2] for i in range(len(query) - 1)} or {query}
+        required = math.ceil(len(query_grams) * FUZZY_MIN_OVERLAP)
+
+        # required 個以上の n-gram を含む名前は、短い方から (総数 - required + 1) 個の
+        # ポスティングリストのいずれかに必ず含まれるため、候補はそこからのみ集める
+        postings = sorted((self._postings.get(gram, []) for gram in query_grams), key=len)
+        candidates: Set[str] = set()
+        for _, character_id in heapq.merge(*postings[:len(postings) - required + 1]):
+            candidates.add(character_id)
+            if len(candidates) >= FUZZY_MAX_CANDIDATES:
+                break
+
+        scored = []
+        for character_id in candidates:
+            name = self._normalized[character_id]
+            count = sum(1 for gram in query_grams if gram in name)
+            if count >= required:
+                scored.append((-count, self._keys[character_id]))
+        return [
+            NameSearchHit(self._entries[key[1]], MATCH_FUZZY)
+            for _, key in heapq.nsmallest(limit, scored)
+        ]
+
+    def _add(self, entry: NameEntry, normalized: str, bulk: bool = False) -> None:
+        """キャラクターを索引に追加する（bulk の場合は並べ替えを呼び出し側で行う）"""
+        key = (len(normalized), entry.id)
+        self._entries[entry.id] = entry
+        self._normalized[entry.id] = normalized
+        self._keys[entry.id] = key
+
+        for postings, gram in self._grams_of(normalized):
+            posting = postings.setdefault(gram, [])
+            if bulk:
+                posting.append(key)
+            else:
+                insort(posting, key)
+
+    def _remove(self, character_id: str) -> None:
+        """キャラクターを索引から削除する"""
+        del self._entries[character_id]
+        normalized = self._normalized.pop(character_id)
+        key = self._keys.pop(character_id)
+
+        for postings, gram in self._grams_of(normalized):
+            posting = postings.get(gram)
+            if posting is None:
+                continue
+            i = bisect_left(posting, key)
+            if i < len(posting) and posting[i] == key:
+                del posting[i]
+            if not posting:
+                del postings[gram]
+
+    def _grams_of(self, normalized: str) -> Iterator[Tuple[Dict[str, List[_PostingKey]], str]]:
+        """正規化した名前が属するポスティングリスト（n-gram と先頭 1〜2 文字）"""
+        for gram in _grams(normalized):
+            yield self._postings, gram
+        for prefix in {normalized[:1], normalized[:2]}:
+            if prefix:
+                yield self._prefixes, prefix
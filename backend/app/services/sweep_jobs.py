@@ -0,0 +1,465 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - スイープジョブ
+
+大規模なグリッドスイープをチャンクに分割してプロセスプールで実行し、
+結果をローカルファイルに保存する非同期ジョブの管理機能を提供します。
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..core.config import get_settings
+from ..models.schemas import SweepRange
+from .damage_calculator import calculated_cells_total, calculations_total
+from .damage_coefficients import DamageCoefficients
+from .damage_kernel import CharacterArrays, build_character_arrays
+from .sweep_worker import RESULT_DTYPE, Axis, SweepChunkTask, compute_sweep_chunk
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# ジョブの状態
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+_FINISHED_STATES = frozenset({JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED})
+
+
+class JobNotFoundError(KeyError):
+    """ジョブが存在しない（期限切れで削除済みを含む）ことを表す例外"""
+
+
+class JobLimitError(RuntimeError):
+    """実行中・待機中のジョブ数が上限に達していることを表す例外"""
+
+
+class ChunkNotReadyError(RuntimeError):
+    """チャンクの計算が完了していないことを表す例外"""
+
+
+def _axis(sweep_range: SweepRange) -> Axis:
+    """スイープ範囲をワーカーに渡す軸の指定に変換する"""
+    return (sweep_range.start, sweep_range.step, sweep_range.count())
+
+
+@dataclass
+class SweepJob:
+    """
+    スイープジョブ
+
+    結果は (キャラクター, リーダースキル倍率, DEF, 敵攻撃値) の C 順の格子を
+    float32 リトルエンディアンで1つのファイルに保存します。
+    チャンク i は行（敵攻撃値の軸1本分）の [i × chunk_rows, (i + 1) × chunk_rows) です。
+    """
+    job_id: str
+    character_ids: List[str]
+    arrays: CharacterArrays
+    leader_skill_multiplier: Axis
+    def_stat: Axis
+    enemy_attack: Axis
+    attack_count: int
+    chunk_rows: int
+    path: str
+    status: str = JOB_QUEUED
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    finished_monotonic: Optional[float] = None
+    completed: bytearray = field(default_factory=bytearray)
+    completed_chunks: int = 0
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def shape(self) -> Tuple[int, int, int, int]:
+        """結果の形状（キャラクター, リーダースキル倍率, DEF, 敵攻撃値）"""
+        return (
+            len(self.character_ids),
+            self.leader_skill_multiplier[2],
+            self.def_stat[2],
+            self.enemy_attack[2]
+        )
+
+    @property
+    def row_count(self) -> int:
+        """行（敵攻撃値の軸1本分）の数"""
+        characters, leaders, defs, _ = self.shape
+        return characters * leaders * defs
+
+    @property
+    def chunk_count(self) -> int:
+        """チャンク数"""
+        return -(-self.row_count // self.chunk_rows)
+
+    @property
+    def finished(self) -> bool:
+        """完了・失敗・キャンセルのいずれかで終了しているか"""
+        return self.status in _FINISHED_STATES
+
+    def chunk_range(self, index: int) -> Tuple[int, int]:
+        """チャンクの行の範囲 [開始, 終了)"""
+        start = index * self.chunk_rows
+        return start, min(start + self.chunk_rows, self.row_count)
+
+    def chunk_task(self, index: int) -> SweepChunkTask:
+        """
+        チャンクの計算内容を生成する（係数はチャンクが参照するキャラクターの範囲のみ）
+
+        Args:
+            index: チャンク番号
+
+        Returns:
+            SweepChunkTask: チャンクの計算内容
+        """
+        row_start, row_stop = self.chunk_range(index)
+        rows_per_character = self.leader_skill_multiplier[2] * self.def_stat[2]
+        first = row_start // rows_per_character
+        characters = slice(first, (row_stop - 1) // rows_per_character + 1)
+        return SweepChunkTask(
+            path=self.path,
+            row_start=row_start,
+            row_stop=row_stop,
+            character_offset=first,
+            defense_boost_percent=self.arrays.defense_boost_percent[characters],
+            stacking_rate_per_attack=self.arrays.stacking_rate_per_attack[characters],
+            damage_factor=self.arrays.damage_factor[characters],
+            leader_skill_multiplier=self.leader_skill_multiplier,
+            def_stat=self.def_stat,
+            enemy_attack=self.enemy_attack,
+            attack_count=self.attack_count
+        )
+
+
+class SweepJobManager:
+    """
+    スイープジョブ管理クラス
+
+    - ジョブごとに asyncio タスクを1つ起動し、チャンクをプロセスプールへ投入する
+      （同時に投入するチャンク数はワーカー数までとし、複数ジョブでプールを共有）
+    - イベントループ上では投入と完了の記録のみを行うため、計算中も
+      他のエンドポイントの応答は妨げられない
+    - 完了したチャンクはジョブの実行中でも取得できる
+    - キャンセル・失敗したジョブの結果ファイルは、実行中のチャンクの終了を待ってから削除する
+    - 終了したジョブは保持期間を過ぎると結果ファイルごと削除する
+    """
+
+    def __init__(
+        self,
+        result_dir: str,
+        max_workers: int = 2,
+        chunk_cells: int = 1_000_000,
+        max_active_jobs: int = 4,
+        retention: float = 3600.0
+    ):
+        """
+        Args:
+            result_dir: 結果ファイルの保存先ディレクトリ
+            max_workers: プロセスプールのワーカー数
+            chunk_cells: 1チャンクあたりのおおよそのセル数
+            max_active_jobs: 実行中・待機中のジョブ数の上限
+            retention: 終了したジョブを保持する秒数
+        """
+        self.result_dir = result_dir
+        self.max_workers = max(1, max_workers)
+        self.chunk_cells = max(1, chunk_cells)
+        self.max_active_jobs = max_active_jobs
+        self.retention = retention
+        self._jobs: Dict[str, SweepJob] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def submit(
+        self,
+        character_ids: Sequence[str],
+        coefficients: Sequence[DamageCoefficients],
+        leader_skill_multiplier: SweepRange,
+        def_stat: SweepRange,
+        enemy_attack: SweepRange,
+        attack_count: int = 0
+    ) -> SweepJob:
+        """
+        スイープジョブを登録して実行を開始する（実行中のイベントループが必要）
+
+        Args:
+            character_ids: キャラクターID一覧（結果の第1軸の並び順）
+            coefficients: キャラクターごとのダメージ計算係数（character_ids と同じ並び順）
+            leader_skill_multiplier: リーダースキル倍率の範囲
+            def_stat: DEFステータス値の範囲
+            enemy_attack: 敵の攻撃値の範囲
+            attack_count: 攻撃回数
+
+        Returns:
+            SweepJob: 登録したジョブ
+
+        Raises:
+            JobLimitError: 実行中・待機中のジョブ数が上限に達している場合
+        """
+        self.purge_expired()
+        active = sum(1 for job in self._jobs.values() if not job.finished)
+        if active >= self.max_active_jobs:
+            raise JobLimitError(f"実行中・待機中のジョブ数が上限（{self.max_active_jobs}件）に達しています")
+
+        enemy_axis = _axis(enemy_attack)
+        job_id = uuid.uuid4().hex
+        job = SweepJob(
+            job_id=job_id,
+            character_ids=list(character_ids),
+            arrays=build_character_arrays(coefficients),
+            leader_skill_multiplier=_axis(leader_skill_multiplier),
+            def_stat=_axis(def_stat),
+            enemy_attack=enemy_axis,
+            attack_count=attack_count,
+            chunk_rows=max(1, self.chunk_cells // enemy_axis[2]),
+            path=os.path.join(self.result_dir, f"{job_id}.f32")
+        )
+        job.completed = bytearray(job.chunk_count)
+
+        # 結果ファイルを全体のサイズで確保し、各ワーカーが自分の範囲に書き込む
+        os.makedirs(self.result_dir, exist_ok=True)
+        with open(job.path, "wb") as f:
+            f.truncate(job.row_count * job.enemy_attack[2] * RESULT_DTYPE.itemsize)
+
+        self._jobs[job_id] = job
+        calculations_total.inc("sweep_job")
+        calculated_cells_total.inc("sweep_job", amount=job.row_count * job.enemy_attack[2])
+        job.task = asyncio.get_running_loop().create_task(self._run(job))
+        job.task.add_done_callback(lambda _: self._discard_incomplete_result(job))
+        logger.info(
+            f"スイープジョブを登録: {job_id}, 形状={job.shape}, チャンク数={job.chunk_count}"
+        )
+        return job
+
+    def get(self, job_id: str) -> SweepJob:
+        """
+        ジョブを取得する
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            SweepJob: ジョブ
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合
+        """
+        self.purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    def cancel(self, job_id: str) -> SweepJob:
+        """
+        ジョブをキャンセルする（未投入・未開始のチャンクは実行しない）
+
+        終了済みのジョブはそのまま返します。結果ファイルは、実行中のチャンクが
+        終了してからジョブのタスクの終了時に削除します。
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            SweepJob: ジョブ
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合
+        """
+        job = self.get(job_id)
+        if not job.finished:
+            self._finish(job, JOB_CANCELLED)
+            if job.task is not None:
+                job.task.cancel()
+            logger.info(f"スイープジョブをキャンセル: {job_id}")
+        return job
+
+    async def read_chunk(self, job_id: str, index: int) -> bytes:
+        """
+        完了したチャンクの結果を読み込む
+
+        Args:
+            job_id: ジョブID
+            index: チャンク番号
+
+        Returns:
+            bytes: float32 リトルエンディアンの結果（行数 × 敵攻撃値の点の数）
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合
+            IndexError: チャンク番号が範囲外の場合
+            ChunkNotReadyError: チャンクの計算が完了していない場合
+        """
+        job = self.get(job_id)
+        if not 0 <= index < job.chunk_count:
+            raise IndexError(f"チャンク番号は 0 から {job.chunk_count - 1} の範囲で指定してください")
+        if job.status == JOB_CANCELLED or not job.completed[index]:
+            raise ChunkNotReadyError(f"チャンク {index} の計算は完了していません（状態: {job.status}）")
+
+        row_start, row_stop = job.chunk_range(index)
+        row_bytes = job.enemy_attack[2] * RESULT_DTYPE.itemsize
+        return await asyncio.to_thread(
+            self._read_range, job.path, row_start * row_bytes, (row_stop - row_start) * row_bytes
+        )
+
+    def purge_expired(self) -> int:
+        """
+        保持期間を過ぎた終了済みジョブを結果ファイルごと削除する
+
+        Returns:
+            int: 削除したジョブ数
+        """
+        now = time.monotonic()
+        expired = [
+            job for job in self._jobs.values()
+            if job.finished_monotonic is not None and now - job.finished_monotonic > self.retention
+        ]
+        for job in expired:
+            del self._jobs[job.job_id]
+            self._remove_result(job)
+        return len(expired)
+
+    async def shutdown(self) -> None:
+        """実行中のジョブを中断し、プロセスプールを終了して結果ファイルを削除する"""
+        tasks = [job.task for job in self._jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for job in self._jobs.values():
+            self._remove_result(job)
+        self._jobs.clear()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """プロセスプールを取得する（初回のジョブ実行時に生成）"""
+        if self._executor is None:
+            # イベントループやスレッドを持つプロセスを fork しないよう spawn で起動する
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, job: SweepJob) -> None:
+        """ジョブのチャンクを順にプロセスプールへ投入し、完了を記録する"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now(timezone.utc)
+
+        # 待機用の Future → (チャンク番号, プロセスプールの Future)
+        pending: Dict[asyncio.Future, Tuple[int, Future]] = {}
+        next_index = 0
+        try:
+            while next_index < job.chunk_count or pending:
+                while next_index < job.chunk_count and len(pending) < self.max_workers:
+                    submitted = executor.submit(compute_sweep_chunk, job.chunk_task(next_index))
+                    pending[asyncio.wrap_future(submitted, loop=loop)] = (next_index, submitted)
+                    next_index += 1
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    index, _ = pending.pop(future)
+                    future.result()
+                    job.completed[index] = 1
+                    job.completed_chunks += 1
+
+            self._finish(job, JOB_COMPLETED)
+            logger.info(f"スイープジョブが完了: {job.job_id}")
+        except asyncio.CancelledError:
+            # 未開始のチャンクは実行せず、実行中のチャンクの結果は破棄する
+            self._finish(job, JOB_CANCELLED)
+            raise
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # ワーカーが異常終了したプールは使用できないため、次のジョブで作り直す
+                self._executor = None
+            job.error = f"{type(e).__name__}: {e}"
+            self._finish(job, JOB_FAILED)
+            logger.error(f"スイープジョブが失敗: {job.job_id}, {job.error}")
+        finally:
+            await self._drain(pending)
+
+    @staticmethod
+    async def _drain(pending: Dict[asyncio.Future, Tuple[int, Future]]) -> None:
+        """
+        未開始のチャンクを取り消し、実行中のチャンクの終了を待つ
+
+        実行中のチャンクは取り消せないため、結果ファイルを削除する前に終了を待ち、
+        発生した例外は回収して破棄します。
+
+        Args:
+            pending: 終了していないチャンクの待機用の Future
+        """
+        if not pending:
+            return
+        for _, submitted in pending.values():
+            submitted.cancel()
+        await asyncio.wait(pending)
+        for future in pending:
+            if not future.cancelled():
+                future.exception()
+
+    def _discard_incomplete_result(self, job: SweepJob) -> None:
+        """ジョブのタスクの終了時に、完了しなかったジョブの結果ファイルを削除する"""
+        if job.status != JOB_COMPLETED:
+            self._remove_result(job)
+
+    @staticmethod
+    def _finish(job: SweepJob, status: str) -> None:
+        """ジョブを終了状態にする（既に終了している場合は何もしない）"""
+        if job.finished:
+            return
+        job.status = status
+        job.finished_at = datetime.now(timezone.utc)
+        job.finished_monotonic = time.monotonic()
+
+    @staticmethod
+    def _remove_result(job: SweepJob) -> None:
+        """結果ファイルを削除する"""
+        try:
+            os.remove(job.path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _read_range(path: str, offset: int, length: int) -> bytes:
+        """ファイルの指定範囲を読み込む"""
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+
+# プロセス共有のスイープジョブ管理インスタンス
+_sweep_job_manager: Optional[SweepJobManager] = None
+
+
+def get_sweep_job_manager() -> SweepJobManager:
+    """
+    プロセス共有のスイープジョブ管理インスタンスを取得する関数
+
+    Returns:
+        SweepJobManager: スイープジョブ管理
+    """
+    global _sweep_job_manager
+    if _sweep_job_manager is None:
+        _sweep_job_manager = SweepJobManager(
+            result_dir=settings.sweep_job_result_dir,
+            max_workers=settings.sweep_job_workers,
+            chunk_cells=settings.sweep_job_chunk_cells,
+            max_active_jobs=settings.sweep_job_max_active,
+            retention=settings.sweep_job_retention
+        )
+    return _sweep_job_manager
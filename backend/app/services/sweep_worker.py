@@ -0,0 +1,97 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - スイープジョブのワーカー処理
+
+プロセスプール上で実行する、スイープジョブのチャンク1つ分の計算と
+結果ファイルへの書き込みを提供します。
+ワーカープロセスで読み込まれるため、計算カーネル以外には依存しません。
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from .damage_kernel import CharacterArrays, calculate_damage_arrays
+
+# 軸の指定（開始値, 刻み幅, 点の数）
+Axis = Tuple[float, float, int]
+
+# 結果ファイルの要素型（float32 リトルエンディアン）
+RESULT_DTYPE = np.dtype("<f4")
+
+
+def axis_values(axis: Axis) -> np.ndarray:
+    """
+    軸の指定から軸の値の配列を生成する（SweepRange と同じ刻み方）
+
+    Args:
+        axis: 軸の指定
+
+    Returns:
+        np.ndarray: 軸の値
+    """
+    start, step, count = axis
+    return start + step * np.arange(count, dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class SweepChunkTask:
+    """
+    スイープジョブのチャンク1つ分の計算内容
+
+    結果は (キャラクター, リーダースキル倍率, DEF, 敵攻撃値) の C 順の格子で、
+    敵攻撃値の軸1本分を「行」として row_start 行目から row_stop 行目の手前までを計算します。
+    係数の配列はチャンクが参照するキャラクターの範囲のみを持ち、
+    character_offset はその先頭のキャラクターの行番号です。
+    """
+    path: str
+    row_start: int
+    row_stop: int
+    character_offset: int
+    defense_boost_percent: np.ndarray
+    stacking_rate_per_attack: np.ndarray
+    damage_factor: np.ndarray
+    leader_skill_multiplier: Axis
+    def_stat: Axis
+    enemy_attack: Axis
+    attack_count: int
+
+
+def compute_sweep_chunk(task: SweepChunkTask) -> int:
+    """
+    チャンクを計算して結果ファイルの該当範囲に書き込む
+
+    Args:
+        task: チャンクの計算内容
+
+    Returns:
+        int: 書き込んだセル数
+    """
+    leader_count = task.leader_skill_multiplier[2]
+    def_count = task.def_stat[2]
+    enemy_values = axis_values(task.enemy_attack)
+
+    # 行番号を (キャラクター, リーダースキル倍率, DEF) の添字に分解する
+    rows = np.arange(task.row_start, task.row_stop)
+    character_index, rest = np.divmod(rows, leader_count * def_count)
+    leader_index, def_index = np.divmod(rest, def_count)
+
+    arrays = CharacterArrays(
+        defense_boost_percent=task.defense_boost_percent,
+        stacking_rate_per_attack=task.stacking_rate_per_attack,
+        damage_factor=task.damage_factor
+    )
+    _, damage_received = calculate_damage_arrays(
+        arrays,
+        (character_index - task.character_offset)[:, np.newaxis],
+        axis_values(task.def_stat)[def_index][:, np.newaxis],
+        axis_values(task.leader_skill_multiplier)[leader_index][:, np.newaxis],
+        enemy_values[np.newaxis, :],
+        task.attack_count
+    )
+
+    data = damage_received.astype(RESULT_DTYPE)
+    with open(task.path, "r+b") as f:
+        f.seek(task.row_start * enemy_values.size * RESULT_DTYPE.itemsize)
+        f.write(data.tobytes())
+    return data.size
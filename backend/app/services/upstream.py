@@ -0,0 +1,168 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - 外部API クライアント
+
+外部キャラクターAPIへの GET リクエストに、指数バックオフ（ジッター付き）の
+リトライとサーキットブレーカーを適用する機能を提供します。
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Optional
+
+import httpx
+
+from ..core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from ..core.metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+# リトライ対象の HTTP ステータス（タイムアウト・レート制限・サーバーエラー）
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+upstream_request_duration_seconds = histogram(
+    "dokkan_upstream_request_duration_seconds",
+    "外部APIへの1回のリクエスト（再試行は個別に計測）の所要時間（秒）"
+)
+upstream_errors_total = counter(
+    "dokkan_upstream_errors",
+    "外部API呼び出しの失敗件数（reason: connection / status / invalid_json / circuit_open）",
+    ("reason",)
+)
+
+
+class UpstreamError(Exception):
+    """外部APIの呼び出しに失敗したことを表す例外"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class UpstreamClient:
+    """
+    外部API クライアントクラス
+
+    - 接続エラー・タイムアウト・リトライ対象ステータスは retry_count 回まで再試行
+    - 再試行の待ち時間は min(backoff_max, backoff_base × 2^試行回数) を上限とする
+      一様乱数（フルジッター）で、Retry-After ヘッダーがあればそちらを優先
+    - 各試行の前にサーキットブレーカーの許可を得て、結果を報告する
+      （遮断中は CircuitOpenError を即座に送出し、再試行しない）
+    - 404 は「存在しない」として None を返し、失敗には数えない
+    - その他のリトライ対象外の 4xx は再試行せず、成功・失敗のどちらにも数えない
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        breaker: CircuitBreaker,
+        retry_count: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        rng: Optional[random.Random] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.breaker = breaker
+        self.retry_count = max(0, retry_count)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._rng = rng or random.Random()
+
+    async def get_json(self, http_client: httpx.AsyncClient, path: str) -> Optional[Any]:
+        """
+        外部APIから JSON を取得する
+
+        Args:
+            http_client: 使用する HTTP クライアント
+            path: ベースURLからのパス
+
+        Returns:
+            Optional[Any]: レスポンスの JSON（404 の場合はNone）
+
+        Raises:
+            CircuitOpenError: サーキットブレーカーが遮断中の場合
+            UpstreamError: 再試行しても取得できなかった場合、またはリトライ対象外のエラーの場合
+        """
+        url = f"{self.base_url}{path}"
+        attempts = self.retry_count + 1
+
+        for attempt in range(attempts):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                upstream_errors_total.inc("circuit_open")
+                raise
+            retry_after: Optional[float] = None
+            started = time.perf_counter()
+            try:
+                response = await http_client.get(url)
+            except httpx.HTTPError as e:
+                upstream_request_duration_seconds.observe(time.perf_counter() - started)
+                upstream_errors_total.inc("connection")
+                error = UpstreamError(f"外部APIへの接続に失敗: {url}, {type(e).__name__}: {e}")
+            except BaseException:
+                # キャンセル等は外部APIの失敗ではないため、結果を報告せずに枠を返す
+                self.breaker.release()
+                raise
+            else:
+                upstream_request_duration_seconds.observe(time.perf_counter() - started)
+                status_code = response.status_code
+                if status_code == 404:
+                    self.breaker.record_success()
+                    return None
+                if status_code < 400:
+                    try:
+                        data = response.json()
+                    except ValueError as e:
+                        upstream_errors_total.inc("invalid_json")
+                        self.breaker.record_failure()
+                        raise UpstreamError(f"外部APIのレスポンスが JSON ではありません: {url}") from e
+                    self.breaker.record_success()
+                    return data
+
+                upstream_errors_total.inc("status")
+                error = UpstreamError(f"外部APIがエラーを返しました: {url}, ステータス={status_code}", status_code)
+                if status_code not in RETRYABLE_STATUS_CODES:
+                    # リクエスト側の誤りは外部APIの障害ではないため失敗に数えないが、
+                    # 回復の確認にもならないため成功とはせず、結果を報告せずに枠を返す
+                    self.breaker.release()
+                    raise error
+                retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+
+            self.breaker.record_failure()
+            if attempt + 1 >= attempts:
+                raise error
+
+            delay = self._backoff_delay(attempt, retry_after)
+            logger.warning(
+                f"外部API呼び出しを再試行: {attempt + 1}/{self.retry_count}回目, "
+                f"{delay:.2f}秒後, 原因: {error}"
+            )
+            await asyncio.sleep(delay)
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        再試行までの待ち時間を計算する
+
+        Args:
+            attempt: 失敗した試行の番号（0始まり）
+            retry_after: Retry-After ヘッダーの秒数
+
+        Returns:
+            float: 待ち時間（秒）
+        """
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return self._rng.uniform(0, ceiling)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After ヘッダー（秒数形式のみ）を解析する"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
@@ -0,0 +1,190 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - 起動時のウォームアップ
+
+起動直後の最初のリクエストがカタログ取得・係数のコンパイル・各処理の初回実行の
+コストを負担しないよう、ライフスパン内でカタログを読み込み、全ての計算経路を
+1回ずつ実行します。完了するまで /ready はトラフィックを受け付けない状態を返します。
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from ..core.logging_config import log_fields
+from ..models.schemas import CharacterQuery
+from .character_service import CharacterService
+
+logger = logging.getLogger(__name__)
+
+# ウォームアップの状態
+WARMUP_PENDING = "pending"
+WARMUP_RUNNING = "running"
+WARMUP_COMPLETED = "completed"
+WARMUP_FAILED = "failed"
+WARMUP_SKIPPED = "skipped"
+
+_FINISHED_STATES = frozenset({WARMUP_COMPLETED, WARMUP_FAILED, WARMUP_SKIPPED})
+
+
+@dataclass
+class WarmupState:
+    """
+    ウォームアップの進行状況
+    """
+    status: str = WARMUP_PENDING
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    # 手順名をキーとする所要時間（ミリ秒）
+    steps: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def finished(self) -> bool:
+        """ウォームアップが終了している（失敗・省略を含む）かどうか"""
+        return self.status in _FINISHED_STATES
+
+
+def _warmup_requests(character_id: str, name: str) -> List[Tuple[str, str, str, Dict[str, Any]]]:
+    """
+    ウォームアップで実行するリクエスト一覧（手順名・メソッド・パス・httpx の引数）
+
+    計算の各経路（単体の詳細度ごと・一括・スイープの出力形式ごと・バトルシミュレーション）と
+    キャラクター一覧・検索・詳細を1回ずつ実行します。
+    """
+    calculation = {
+        "character_id": character_id,
+        "def_stat": 15000,
+        "leader_skill_multiplier": 1.7,
+        "enemy_attack": 50000,
+        "attack_count": 1
+    }
+    sweep = {
+        "character_id": character_id,
+        "def_stat": {"start": 10000, "stop": 11000, "step": 1000},
+        "enemy_attack": {"start": 40000, "stop": 50000, "step": 10000},
+        "leader_skill_multiplier": {"start": 1.5, "stop": 2.0, "step": 0.5},
+        "attack_count": 0
+    }
+    requests: List[Tuple[str, str, str, Dict[str, Any]]] = [
+        ("characters_list", "GET", "/api/characters", {}),
+        ("characters_search", "GET", "/api/characters/search", {"params": {"q": name}}),
+        ("character_detail", "GET", f"/api/characters/{character_id}", {}),
+    ]
+    for detail in ("none", "summary", "full"):
+        requests.append((
+            f"calculate_{detail}", "POST", "/api/calculate-damage",
+            {"params": {"detail": detail}, "json": calculation}
+        ))
+    requests.append((
+        "calculate_batch", "POST", "/api/calculate-damage/batch",
+        {"json": {"requests": [calculation, {**calculation, "attack_count": 0}]}}
+    ))
+    for output_format in ("json", "binary"):
+        requests.append((
+            f"sweep_{output_format}", "POST", "/api/calculate-damage/sweep",
+            {"json": {**sweep, "format": output_format}}
+        ))
+    requests.append((
+        "simulation", "POST", "/api/calculate-damage/simulation",
+        {"json": {
+            "character_id": character_id,
+            "def_stat": 15000,
+            "leader_skill_multiplier": 1.7,
+            "hp": 100000,
+            "trials": 1000,
+            "seed": 0,
+            "attacks": [
+                {"attack": 50000, "distribution": "normal", "spread": 5000, "guard_chance": 0.5},
+                {"attack": 80000, "distribution": "uniform", "spread": 10000, "probability": 0.5}
+            ]
+        }}
+    ))
+    return requests
+
+
+async def _run_steps(app: Any, character_service: CharacterService, state: WarmupState) -> None:
+    """
+    ウォームアップの各手順を実行する
+
+    Raises:
+        RuntimeError: キャラクターが1件もない、またはリクエストがエラーを返した場合
+    """
+    # カタログを読み込み、ストア（全キャラクターの係数を含む）と二次索引を構築する
+    # （スナップショットから復元したカタログは最初の検索で構築するため、ここで済ませる）
+    started = time.perf_counter()
+    characters, _, _ = await character_service.find_characters(CharacterQuery(), 1)
+    state.steps["catalog"] = (time.perf_counter() - started) * 1000
+    if not characters:
+        raise RuntimeError("キャラクターが1件もありません")
+
+    # ルーティング・入力検証・シリアライズを含めてアプリケーション内で各経路を実行する
+    character = characters[0]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        for step, method, path, kwargs in _warmup_requests(character.id, character.name):
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            state.steps[step] = (time.perf_counter() - started) * 1000
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {path} が {response.status_code} を返しました")
+
+
+async def run_warmup(
+    app: Any,
+    character_service: CharacterService,
+    state: WarmupState,
+    timeout: float
+) -> None:
+    """
+    ウォームアップを実行する
+
+    失敗・タイムアウトした場合は状態に記録してログを出力し、例外は送出しません
+    （起動は継続し、最初のリクエストが従来どおり初回のコストを負担します）。
+
+    Args:
+        app: ASGI アプリケーション
+        character_service: キャラクターサービス
+        state: 進行状況の記録先
+        timeout: タイムアウト（秒）
+    """
+    state.status = WARMUP_RUNNING
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(_run_steps(app, character_service, state), timeout)
+    except asyncio.TimeoutError:
+        state.status = WARMUP_FAILED
+        state.error = f"{timeout}秒以内に完了しませんでした"
+    except Exception as e:
+        state.status = WARMUP_FAILED
+        state.error = str(e)
+    else:
+        state.status = WARMUP_COMPLETED
+    finally:
+        state.duration = time.perf_counter() - started
+
+    fields = log_fields(
+        status=state.status,
+        duration_ms=round(state.duration * 1000, 1),
+        steps={step: round(ms, 1) for step, ms in state.steps.items()}
+    )
+    if state.status == WARMUP_COMPLETED:
+        logger.info("ウォームアップ完了", extra=fields)
+    else:
+        logger.error(f"ウォームアップに失敗: {state.error}", extra=fields)
+
+
+# プロセス共有のウォームアップ状態
+_warmup_state = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    """
+    プロセス共有のウォームアップ状態を取得する関数
+
+    Returns:
+        WarmupState: ウォームアップの進行状況
+    """
+    return _warmup_state
@@ -0,0 +1 @@
+# ベンチマークパッケージの初期化
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - 列指向キャラクターストアのベンチマーク
+
+キャラクター一覧を List[Character]（+ ID 辞書・係数の辞書）で保持する従来の形式と、
+列指向の CharacterStore で保持する形式のメモリ使用量と参照時間を比較します。
+
+- メモリ: tracemalloc で計測した、それぞれの形式が保持するメモリ
+- 参照: ID からの検索・Character の取得（ストアは行から生成、または直近の取得の再利用）・
+  計算経路（Character と係数の取得）・全件の集計
+
+実行方法（backend ディレクトリで）:
+    python -m benchmarks.character_store --size 50000
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from app.services.character_catalog import RECENT_CHARACTERS, CharacterCatalog
+from app.services.character_service import CharacterService
+from app.services.character_store import FLAG_GUARD, CharacterStore
+from app.services.damage_coefficients import compile_character
+
+from .synthetic import make_raw_catalog
+
+
+def _retained(build: Callable[[], object]) -> Tuple[object, int]:
+    """build の戻り値と、それが保持するメモリ（バイト）を返す"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return value, retained
+
+
+def _per_op_ns(func: Callable[[str], object], keys: List[str], rounds: int) -> float:
+    """keys の各値で func を呼び出し、1回あたりの所要時間の中央値（ナノ秒）を返す"""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for key in keys:
+            func(key)
+        timings.append((time.perf_counter() - started) / len(keys) * 1e9)
+    return statistics.median(timings)
+
+
+def _total_us(func: Callable[[], object], rounds: int) -> float:
+    """func の所要時間の中央値（マイクロ秒）を返す"""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="列指向キャラクターストアのベンチマーク")
+    parser.add_argument("--size", type=int, default=50000, help="キャラクター数")
+    parser.add_argument("--lookups", type=int, default=20000, help="参照の計測に使う ID の数")
+    parser.add_argument("--rounds", type=int, default=5, help="計測回数")
+    args = parser.parse_args()
+
+    raw_catalog = make_raw_catalog(args.size)
+    service = CharacterService()
+
+    # 従来の形式: Character の一覧・ID 辞書・キャラクターごとの係数
+    def build_list():
+        characters = [service._normalize_character_data(raw) for raw in raw_catalog]
+        index = {c.id: i for i, c in enumerate(characters)}
+        coefficients = {c.id: compile_character(c) for c in characters}
+        return characters, index, coefficients
+
+    (characters, index, coefficients), list_bytes = _retained(build_list)
+    store, store_bytes = _retained(lambda: CharacterStore(characters))
+    catalog = CharacterCatalog(characters)
+
+    rng = random.Random(0)
+    keys = [characters[rng.randrange(args.size)].id for _ in range(args.lookups)]
+    # 直近の取得を再利用できる、よく参照されるキャラクター（保持件数の半分）
+    hot_ids = [characters[rng.randrange(args.size)].id for _ in range(RECENT_CHARACTERS // 2)]
+    hot_keys = [rng.choice(hot_ids) for _ in range(args.lookups)]
+    row_of_key = {key: store.row_of(key) for key in keys}
+
+    def calculation_path(character_id: str):
+        character = catalog.get(character_id)
+        return catalog.get_coefficients(character)
+
+    # (表示名, 従来, ストア, 使用する ID)
+    lookups = [
+        ("ID → 行番号", lambda k: index[k], store.row_of, keys),
+        (
+            "ID → Character（生成）",
+            lambda k: characters[index[k]],
+            lambda k: store.character_at(store.row_of(k)),
+            keys
+        ),
+        ("ID → Character（直近）", lambda k: characters[index[k]], catalog.get, hot_keys),
+        ("ID → Character + 係数（直近）", lambda k: coefficients[characters[index[k]].id], calculation_path, hot_keys),
+        (
+            "行番号 → DEF倍率",
+            lambda k: characters[index[k]].defense_multiplier,
+            lambda k: store.defense_multiplier[row_of_key[k]],
+            keys
+        ),
+    ]
+
+    print(f"キャラクター数: {args.size:,}")
+    print(f"\n{'メモリ':<28}{'合計(MiB)':>12}{'1体あたり(B)':>14}")
+    print(f"{'List[Character] + 辞書':<28}{list_bytes / 2**20:>12,.1f}{list_bytes / args.size:>14,.0f}")
+    print(f"{'CharacterStore':<28}{store_bytes / 2**20:>12,.1f}{store_bytes / args.size:>14,.0f}")
+    print(f"{'  （うち配列の nbytes）':<28}{store.nbytes / 2**20:>12,.1f}{store.nbytes / args.size:>14,.0f}")
+
+    print(f"\n{'参照（1回あたり）':<28}{'List(ns)':>12}{'Store(ns)':>12}")
+    for label, list_lookup, store_lookup, lookup_keys in lookups:
+        list_ns = _per_op_ns(list_lookup, lookup_keys, args.rounds)
+        store_ns = _per_op_ns(store_lookup, lookup_keys, args.rounds)
+        print(f"{label:<28}{list_ns:>12,.0f}{store_ns:>12,.0f}")
+
+    scans = [
+        (
+            "ガード能力ありの件数",
+            lambda: sum(1 for c in characters if c.guard_ability),
+            lambda: int(((store.flags & FLAG_GUARD) != 0).sum())
+        ),
+        (
+            "パッシブスキルの効果値合計",
+            lambda: sum(s.value for c in characters for s in c.passive_skills),
+            lambda: float(store.skill_values.sum())
+        ),
+    ]
+    print(f"\n{'全件の集計':<28}{'List(us)':>12}{'Store(us)':>12}")
+    for label, list_scan, store_scan in scans:
+        list_us = _total_us(list_scan, args.rounds)
+        store_us = _total_us(store_scan, args.rounds)
+        print(f"{label:<28}{list_us:>12,.0f}{store_us:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - 負荷試験用の外部キャラクターAPI
+
+外部キャラクターAPI（GET /characters, GET /characters/{id}）の代わりとなるローカルサーバーです。
+合成キャラクターのカタログを返し、応答の遅延・ゆらぎ・エラー率を指定できます。
+GET /_stats でエンドポイントごとの呼び出し件数を返し、POST /_stats/reset で初期化します。
+
+実行方法（backend ディレクトリで）:
+    python -m benchmarks.fake_upstream --port 8100 --size 5000 --latency-ms 50 --jitter-ms 20 --error-rate 0.01
+
+アプリケーション側は次の設定で接続します:
+    EXTERNAL_API_USE_MOCK=false EXTERNAL_API_BASE_URL=http://127.0.0.1:8100
+"""
+
+import argparse
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import orjson
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from .synthetic import make_raw_catalog
+
+
+@dataclass
+class UpstreamBehavior:
+    """
+    外部APIの応答の振る舞い
+    """
+    latency_ms: float = 50.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+
+def create_app(size: int, behavior: UpstreamBehavior, seed: int = 0) -> Starlette:
+    """
+    外部キャラクターAPIの代わりとなるアプリケーションを生成する
+
+    Args:
+        size: カタログのキャラクター数
+        behavior: 応答の振る舞い
+        seed: カタログと遅延・エラーの乱数シード
+
+    Returns:
+        Starlette: ASGI アプリケーション
+    """
+    catalog = make_raw_catalog(size, seed=seed)
+    # 一覧は毎回同じ内容のため、シリアライズ済みの本文を使い回す
+    catalog_body = orjson.dumps(catalog)
+    details: Dict[str, bytes] = {raw["id"]: orjson.dumps(raw) for raw in catalog}
+    calls: Counter = Counter()
+    rng = random.Random(seed)
+
+    async def simulate(endpoint: str) -> Optional[Response]:
+        """呼び出しを記録し、遅延を入れてエラーの場合はエラーレスポンスを返す"""
+        calls[endpoint] += 1
+        delay_ms = behavior.latency_ms + rng.uniform(-behavior.jitter_ms, behavior.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        if behavior.error_rate > 0 and rng.random() < behavior.error_rate:
+            calls[f"{endpoint}_error"] += 1
+            return JSONResponse({"error": "simulated upstream error"}, status_code=behavior.error_status)
+        return None
+
+    async def list_characters(request: Request) -> Response:
+        error = await simulate("list")
+        if error is not None:
+            return error
+        return Response(catalog_body, media_type="application/json")
+
+    async def get_character(request: Request) -> Response:
+        error = await simulate("detail")
+        if error is not None:
+            return error
+        body = details.get(request.path_params["character_id"])
+        if body is None:
+            calls["detail_not_found"] += 1
+            return JSONResponse({"error": "not found"}, status_code=404)
+        return Response(body, media_type="application/json")
+
+    async def get_stats(request: Request) -> Response:
+        return JSONResponse({"size": size, "calls": dict(calls)})
+
+    async def reset_stats(request: Request) -> Response:
+        calls.clear()
+        return JSONResponse({"size": size, "calls": {}})
+
+    return Starlette(routes=[
+        Route("/characters", list_characters),
+        Route("/characters/{character_id}", get_character),
+        Route("/_stats", get_stats),
+        Route("/_stats/reset", reset_stats, methods=["POST"]),
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="負荷試験用の外部キャラクターAPI")
+    parser.add_argument("--host", default="127.0.0.1", help="待ち受けアドレス")
+    parser.add_argument("--port", type=int, default=8100, help="待ち受けポート")
+    parser.add_argument("--size", type=int, default=5000, help="カタログのキャラクター数")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="応答の遅延（ミリ秒）")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="遅延のゆらぎ（± ミリ秒、一様分布）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="エラーを返す割合（0.0〜1.0）")
+    parser.add_argument("--error-status", type=int, default=503, help="エラー時の HTTP ステータス")
+    parser.add_argument("--seed", type=int, default=0, help="乱数シード")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    behavior = UpstreamBehavior(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status
+    )
+    uvicorn.run(
+        create_app(args.size, behavior, args.seed),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - 起動時の import 時間の計測
+
+新しいプロセスで `import main` にかかる時間を複数回計測し、中央値が予算を超えた場合、
+または起動時に読み込まないはずのモジュール（SQLAlchemy など、初回使用時に読み込む
+もの）が読み込まれていた場合は終了コード 1 で終了します。
+同じ検査は tests/test_import_time.py としてテストスイート（pytest）でも実行されます。
+
+実行方法（backend ディレクトリで）:
+    python -m benchmarks.import_time --runs 5 --budget-ms 1500
+    python -m benchmarks.import_time --top 15    # -X importtime の累積時間の上位を表示
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+# 起動時（import main の時点）に読み込まれてはならないモジュール
+DEFERRED_MODULES = ("sqlalchemy",)
+
+# import main の予算（ミリ秒）と既定の計測回数
+DEFAULT_BUDGET_MS = 1500.0
+DEFAULT_RUNS = 5
+
+# backend ディレクトリ（子プロセスの作業ディレクトリと import パス）
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子プロセスで実行するコード（import 時間と読み込まれたモジュールを JSON で出力する）
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({"ms": elapsed * 1000, "modules": sorted(sys.modules)}))
+"""
+
+
+def _child_env() -> Dict[str, str]:
+    """子プロセスの環境変数（起動ログを抑止し、backend ディレクトリを import パスに含める）"""
+    env = dict(os.environ)
+    env["LOG_LEVEL"] = "WARNING"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get("PYTHONPATH")]))
+    return env
+
+
+@dataclass
+class ImportTimeReport:
+    """
+    import 時間の計測結果
+    """
+    timings: List[float]     # 各回の import 時間（ミリ秒）
+    budget_ms: float
+    deferred: List[str]      # 起動時に読み込まれた DEFERRED_MODULES のモジュール
+
+    @property
+    def median(self) -> float:
+        """import 時間の中央値（ミリ秒）"""
+        return statistics.median(self.timings)
+
+    @property
+    def over_budget(self) -> bool:
+        """中央値が予算を超えているか"""
+        return self.median > self.budget_ms
+
+    @property
+    def failed(self) -> bool:
+        """予算超過、または初回使用時に読み込むべきモジュールが読み込まれているか"""
+        return self.over_budget or bool(self.deferred)
+
+
+def measure_once() -> Tuple[float, List[str]]:
+    """
+    新しいプロセスで import main を1回計測する
+
+    Returns:
+        Tuple[float, List[str]]: import 時間（ミリ秒）と読み込まれたモジュール名の一覧
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND_DIR,
+        env=_child_env(),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result["ms"], result["modules"]
+
+
+def import_profile(top: int) -> List[Tuple[str, float, float]]:
+    """
+    -X importtime の出力から累積時間の上位のモジュールを取得する
+
+    Args:
+        top: 件数
+
+    Returns:
+        List[Tuple[str, float, float]]: (モジュール名, 自身の時間ms, 累積時間ms) の一覧
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        env=_child_env(),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # 見出し行
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:top]
+
+
+def check_import_time(runs: int = DEFAULT_RUNS, budget_ms: float = DEFAULT_BUDGET_MS) -> ImportTimeReport:
+    """
+    import main の時間を runs 回計測し、予算と読み込まれたモジュールを検査する
+
+    Args:
+        runs: 計測回数（中央値を予算と比較）
+        budget_ms: import main の予算（ミリ秒）
+
+    Returns:
+        ImportTimeReport: 計測結果
+    """
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        elapsed_ms, modules = measure_once()
+        timings.append(elapsed_ms)
+        loaded.update(modules)
+    deferred = sorted(
+        name for name in loaded
+        if any(name == module or name.startswith(f"{module}.") for module in DEFERRED_MODULES)
+    )
+    return ImportTimeReport(timings=timings, budget_ms=budget_ms, deferred=deferred)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="起動時の import 時間の計測")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="計測回数（中央値を予算と比較）")
+    parser.add_argument(
+        "--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="import main の予算（ミリ秒）"
+    )
+    parser.add_argument("--top", type=int, default=0, help="累積時間の上位を表示する件数（0 で表示しない）")
+    args = parser.parse_args()
+
+    report = check_import_time(args.runs, args.budget_ms)
+    timings = report.timings
+    print(
+        f"import main: 中央値 {report.median:,.0f}ms / 最小 {min(timings):,.0f}ms / 最大 {max(timings):,.0f}ms"
+        f"（{args.runs}回、予算 {args.budget_ms:,.0f}ms）"
+    )
+
+    if args.top > 0:
+        print(f"\n{'モジュール':<48}{'自身(ms)':>10}{'累積(ms)':>10}")
+        for name, self_ms, cumulative_ms in import_profile(args.top):
+            print(f"{name:<48}{self_ms:>10,.1f}{cumulative_ms:>10,.1f}")
+
+    if report.deferred:
+        print(
+            f"\n起動時に読み込まれたモジュール（初回使用時に読み込む必要があります）: {', '.join(report.deferred[:10])}"
+        )
+    if report.over_budget:
+        print(f"\nimport 時間が予算を超えています: {report.median:,.0f}ms > {args.budget_ms:,.0f}ms")
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
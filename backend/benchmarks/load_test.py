@@ -0,0 +1,317 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - 負荷試験
+
+/api/calculate-damage と /api/characters に目標の RPS でリクエストを送り、
+エンドポイントごとのレイテンシのパーセンタイル・スループット・エラー件数と、
+負荷試験用の外部API（benchmarks.fake_upstream）への呼び出し件数を表示します。
+
+リクエストは応答を待たずに一定間隔で送信し（オープンループ）、レイテンシは
+送信予定時刻から計測します（サーバーが詰まった場合の待ち時間も含まれます）。
+
+--spawn を指定すると、負荷試験用の外部APIとアプリケーション（uvicorn）を子プロセスとして起動し、
+--env で指定した設定（キャッシュ・コネクションプール等）で計測します。
+
+実行方法（backend ディレクトリで）:
+    # 起動済みのアプリケーション・外部APIに対して計測
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --upstream-url http://127.0.0.1:8100 --rps 200
+
+    # 子プロセスを起動して設定を比較
+    python -m benchmarks.load_test --spawn --rps 200 --duration 20 --env CACHE_TTL=1
+    python -m benchmarks.load_test --spawn --rps 200 --duration 20 --env EXTERNAL_API_MAX_CONNECTIONS=2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+# 一覧リクエストの並び替え・ページサイズの候補
+LIST_SORTS = ["id", "defense_multiplier", "-defense_multiplier", "damage_reduction", "-damage_reduction"]
+LIST_LIMITS = [20, 50]
+
+
+@dataclass
+class EndpointStats:
+    """
+    エンドポイントごとの計測結果
+    """
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def count(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def ok(self) -> int:
+        return sum(count for status, count in self.statuses.items() if status.startswith("2"))
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    パーセンタイルを求める（最近傍順位法）
+
+    Args:
+        values: 値の一覧
+        q: パーセンタイル（0〜100）
+
+    Returns:
+        float: パーセンタイル値（値がない場合は0.0）
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(round(q / 100 * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+def _build_request(rng: random.Random, character_ids: List[str], calc_ratio: float) -> Tuple[str, str, str, Any]:
+    """送信するリクエスト（エンドポイント名, メソッド, パス, ボディ）を選ぶ"""
+    if rng.random() < calc_ratio:
+        body = {
+            "character_id": rng.choice(character_ids),
+            "def_stat": rng.randrange(5000, 30000, 500),
+            "leader_skill_multiplier": rng.choice([1.0, 1.5, 1.7, 2.0, 2.2]),
+            "enemy_attack": rng.randrange(10000, 2000000, 10000),
+            "attack_count": rng.randint(0, 5),
+        }
+        return "calculate-damage", "POST", "/api/calculate-damage", body
+    query = f"sort={rng.choice(LIST_SORTS)}&limit={rng.choice(LIST_LIMITS)}"
+    return "characters", "GET", f"/api/characters?{query}", None
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    character_ids: List[str],
+    rps: float,
+    duration: float,
+    calc_ratio: float,
+    seed: int = 0
+) -> Tuple[Dict[str, EndpointStats], float]:
+    """
+    目標の RPS でリクエストを送信して計測する
+
+    Args:
+        client: API の HTTP クライアント
+        character_ids: ダメージ計算に使うキャラクターID
+        rps: 目標の秒間リクエスト数
+        duration: 計測時間（秒）
+        calc_ratio: ダメージ計算の割合（残りはキャラクター一覧）
+        seed: リクエスト内容の乱数シード
+
+    Returns:
+        Tuple[Dict[str, EndpointStats], float]: エンドポイントごとの結果と、最初の送信から最後の応答までの秒数
+    """
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+    stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+
+    async def send(scheduled: float, name: str, method: str, path: str, body: Any) -> None:
+        try:
+            response = await client.request(method, path, json=body)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        stats[name].latencies_ms.append((loop.time() - scheduled) * 1000)
+        stats[name].statuses[status] += 1
+
+    started = loop.time()
+    tasks = []
+    for i in range(int(rps * duration)):
+        scheduled = started + i / rps
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(scheduled, *_build_request(rng, character_ids, calc_ratio))))
+    await asyncio.gather(*tasks)
+    return stats, loop.time() - started
+
+
+def print_report(stats: Dict[str, EndpointStats], elapsed: float, upstream_calls: Optional[Dict[str, int]]) -> None:
+    """計測結果を表示する"""
+    print(f"\n{'エンドポイント':<20}{'件数':>8}{'成功':>8}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}{'最大(ms)':>10}")
+    for name, endpoint in sorted(stats.items()):
+        latencies = endpoint.latencies_ms
+        print(
+            f"{name:<20}{endpoint.count:>8}{endpoint.ok:>8}"
+            f"{percentile(latencies, 50):>10.1f}{percentile(latencies, 90):>10.1f}"
+            f"{percentile(latencies, 99):>10.1f}{max(latencies, default=0.0):>10.1f}"
+        )
+        failures = {status: count for status, count in endpoint.statuses.items() if not status.startswith("2")}
+        if failures:
+            print(f"  失敗: {failures}")
+
+    total_ok = sum(endpoint.ok for endpoint in stats.values())
+    print(f"\nスループット: {total_ok / elapsed:,.1f} 件/秒（成功のみ、{elapsed:.1f}秒）")
+    if upstream_calls is not None:
+        print(f"外部API呼び出し: {upstream_calls or '0件'}")
+
+
+def _report_json(
+    stats: Dict[str, EndpointStats],
+    elapsed: float,
+    upstream_calls: Optional[Dict[str, int]],
+    args: argparse.Namespace
+) -> Dict[str, Any]:
+    """計測結果を設定の比較用に JSON 形式へ変換する"""
+    return {
+        "config": {
+            "rps": args.rps,
+            "duration": args.duration,
+            "calc_ratio": args.calc_ratio,
+            "env": args.env,
+        },
+        "elapsed": elapsed,
+        "throughput": sum(endpoint.ok for endpoint in stats.values()) / elapsed,
+        "endpoints": {
+            name: {
+                "count": endpoint.count,
+                "ok": endpoint.ok,
+                "statuses": dict(endpoint.statuses),
+                "p50_ms": percentile(endpoint.latencies_ms, 50),
+                "p90_ms": percentile(endpoint.latencies_ms, 90),
+                "p99_ms": percentile(endpoint.latencies_ms, 99),
+                "max_ms": max(endpoint.latencies_ms, default=0.0),
+            }
+            for name, endpoint in stats.items()
+        },
+        "upstream_calls": upstream_calls,
+    }
+
+
+def _wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    """URL が応答するまで待機する（子プロセスが終了した場合はエラー）"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} の子プロセスが終了しました（終了コード {process.returncode}）")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} が {timeout:.0f} 秒以内に起動しませんでした")
+
+
+@contextmanager
+def spawn_servers(args: argparse.Namespace) -> Iterator[Tuple[str, str]]:
+    """
+    負荷試験用の外部APIとアプリケーションを子プロセスとして起動する
+
+    アプリケーションは一時ディレクトリのデータベースを用い、--env の設定を環境変数で渡します。
+
+    Yields:
+        Tuple[str, str]: アプリケーションと外部APIのベースURL
+    """
+    upstream_url = f"http://127.0.0.1:{args.upstream_port}"
+    base_url = f"http://127.0.0.1:{args.api_port}"
+    processes: List[subprocess.Popen] = []
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "EXTERNAL_API_USE_MOCK": "false",
+            "EXTERNAL_API_BASE_URL": upstream_url,
+            "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'load_test.db')}",
+            "CATALOG_SNAPSHOT_PATH": "",
+            "LOG_LEVEL": "WARNING",
+        }
+        for item in args.env:
+            key, _, value = item.partition("=")
+            env[key] = value
+        try:
+            processes.append(subprocess.Popen([
+                sys.executable, "-m", "benchmarks.fake_upstream",
+                "--port", str(args.upstream_port),
+                "--size", str(args.upstream_size),
+                "--latency-ms", str(args.upstream_latency_ms),
+                "--jitter-ms", str(args.upstream_jitter_ms),
+                "--error-rate", str(args.upstream_error_rate),
+            ]))
+            _wait_until_ready(f"{upstream_url}/_stats", processes[-1])
+            processes.append(subprocess.Popen([
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--port", str(args.api_port), "--log-level", "warning",
+            ], env=env))
+            _wait_until_ready(f"{base_url}/health", processes[-1])
+            yield base_url, upstream_url
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+async def run(args: argparse.Namespace, base_url: str, upstream_url: Optional[str]) -> None:
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        # キャラクターIDの取得を兼ねて、カタログの初回読み込みを計測から除く
+        response = await client.get("/api/characters", params={"limit": 100})
+        response.raise_for_status()
+        character_ids = [item["id"] for item in response.json()["items"]]
+        if not character_ids:
+            raise RuntimeError("キャラクター一覧が空です")
+
+        if upstream_url:
+            (await client.post(f"{upstream_url}/_stats/reset")).raise_for_status()
+
+        print(f"{base_url} に {args.rps:.0f} 件/秒で {args.duration:.0f} 秒間送信します（ダメージ計算 {args.calc_ratio:.0%}）")
+        stats, elapsed = await run_load(
+            client, character_ids, args.rps, args.duration, args.calc_ratio, args.seed
+        )
+
+        upstream_calls = None
+        if upstream_url:
+            upstream_calls = (await client.get(f"{upstream_url}/_stats")).json()["calls"]
+    print_report(stats, elapsed, upstream_calls)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(_report_json(stats, elapsed, upstream_calls, args), f, ensure_ascii=False, indent=2)
+        print(f"結果を保存: {args.output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="負荷試験")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="アプリケーションのベースURL")
+    parser.add_argument("--upstream-url", default=None, help="負荷試験用の外部APIのベースURL（呼び出し件数の集計用）")
+    parser.add_argument("--rps", type=float, default=100.0, help="目標の秒間リクエスト数")
+    parser.add_argument("--duration", type=float, default=20.0, help="計測時間（秒）")
+    parser.add_argument("--calc-ratio", type=float, default=0.7, help="ダメージ計算の割合（残りはキャラクター一覧）")
+    parser.add_argument("--max-connections", type=int, default=200, help="負荷側の最大同時接続数")
+    parser.add_argument("--timeout", type=float, default=30.0, help="リクエストのタイムアウト（秒）")
+    parser.add_argument("--seed", type=int, default=0, help="リクエスト内容の乱数シード")
+    parser.add_argument("--output", default=None, help="結果を JSON で保存するパス（設定の比較用）")
+
+    spawn = parser.add_argument_group("子プロセスの起動（--spawn）")
+    spawn.add_argument("--spawn", action="store_true", help="外部APIとアプリケーションを子プロセスとして起動する")
+    spawn.add_argument("--env", action="append", default=[], help="アプリケーションの設定（KEY=VALUE、複数指定可）")
+    spawn.add_argument("--api-port", type=int, default=8200, help="アプリケーションのポート")
+    spawn.add_argument("--upstream-port", type=int, default=8100, help="外部APIのポート")
+    spawn.add_argument("--upstream-size", type=int, default=5000, help="外部APIのカタログのキャラクター数")
+    spawn.add_argument("--upstream-latency-ms", type=float, default=50.0, help="外部APIの応答の遅延（ミリ秒）")
+    spawn.add_argument("--upstream-jitter-ms", type=float, default=20.0, help="外部APIの遅延のゆらぎ（± ミリ秒）")
+    spawn.add_argument("--upstream-error-rate", type=float, default=0.0, help="外部APIのエラー率")
+    args = parser.parse_args()
+
+    if args.spawn:
+        with spawn_servers(args) as (base_url, upstream_url):
+            asyncio.run(run(args, base_url, upstream_url))
+    else:
+        asyncio.run(run(args, args.base_url, args.upstream_url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - ログ出力オーバーヘッドベンチマーク
+
+ダメージ計算（単体、detail=full、メモ無効）のスループットを、ログの出力方式ごとに比較します。
+
+- 従来: 1回の計算ごとに f-string で整形した INFO ログ2行を同期ハンドラで出力
+- 構造化 + 同期ハンドラ（全件）
+- 構造化 + QueueHandler（全件 / サンプリング）
+- ログ出力なし（WARNING レベル、上限の目安）
+
+ログはいずれも一時ファイルに出力します。QueueHandler の場合はイベントループ側の
+スループットを計測し、キューに残ったログの出力完了までの時間は含みません。
+
+実行方法（backend ディレクトリで）:
+    python -m benchmarks.logging_overhead --count 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from app.core.logging_config import configure_logging, shutdown_logging
+from app.models.schemas import DamageCalculationRequest
+from app.services.character_service import CharacterService
+from app.services.damage_calculator import DamageCalculatorService
+from app.services.damage_coefficients import compile_character
+
+from .synthetic import make_raw_catalog
+
+logger = logging.getLogger("app.services.damage_calculator")
+
+
+async def _throughput(count: int, legacy: bool) -> float:
+    """ダメージ計算を count 回実行し、1秒あたりの計算回数を返す"""
+    character = CharacterService()._normalize_character_data(
+        make_raw_catalog(1, skills_per_character=4)[0]
+    )
+    coefficients = compile_character(character)
+    calculator = DamageCalculatorService(memo_max_entries=0)
+    request = DamageCalculationRequest(
+        character_id=character.id,
+        def_stat=15000,
+        leader_skill_multiplier=1.7,
+        enemy_attack=50000,
+        attack_count=3
+    )
+
+    started = time.perf_counter()
+    for _ in range(count):
+        if legacy:
+            logger.info(f"ダメージ計算開始: キャラクター={character.name}, DEF={request.def_stat}")
+        result = await calculator.calculate_damage(request, character, coefficients)
+        if legacy:
+            logger.info(
+                f"ダメージ計算完了: 実効防御力={result.effective_defense}, 受けるダメージ={result.damage_received}"
+            )
+    return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ログ出力オーバーヘッドベンチマーク")
+    parser.add_argument("--count", type=int, default=20000, help="計算回数")
+    parser.add_argument("--sample-rate", type=float, default=0.01, help="サンプリング時の出力割合")
+    args = parser.parse_args()
+
+    # (表示名, ログレベル, サンプリング割合, QueueHandler, 従来のログ出力)
+    cases = [
+        ("従来（f-string 2行・同期）", "INFO", 0.0, False, True),
+        ("構造化・同期・全件", "INFO", 1.0, False, False),
+        ("構造化・QueueHandler・全件", "INFO", 1.0, True, False),
+        (f"構造化・QueueHandler・{args.sample_rate:.0%}", "INFO", args.sample_rate, True, False),
+        ("ログ出力なし", "WARNING", 1.0, True, False),
+    ]
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for label, level, rate, use_queue, legacy in cases:
+            path = os.path.join(directory, "bench.log")
+            with open(path, "w", encoding="utf-8") as stream:
+                configure_logging(
+                    level=level, request_sample_rate=rate, use_queue=use_queue, stream=stream
+                )
+                throughput = asyncio.run(_throughput(args.count, legacy))
+                shutdown_logging()
+            results.append((label, throughput, os.path.getsize(path)))
+
+    configure_logging(level="WARNING")
+    baseline = results[0][1]
+    print(f"{'方式':<32}{'計算/秒':>12}{'従来比':>8}{'ログ(KiB)':>12}")
+    for label, throughput, size in results:
+        print(f"{label:<32}{throughput:>12,.0f}{throughput / baseline:>7.2f}x{size / 1024:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - メトリクス計測オーバーヘッドベンチマーク
+
+同じ空のエンドポイントを、計測なしの APIRoute と MetricsRoute のルーターに登録し、
+ASGI アプリケーションを直接（交互に）呼び出して1リクエストあたりの所要時間を比較します。
+メトリクスの個別操作（カウンター加算・ヒストグラム観測）の所要時間も計測します。
+
+実行方法（backend ディレクトリで）:
+    python -m benchmarks.metrics_overhead --repeat 20000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import timeit
+from typing import List
+
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+
+from app.core.metrics import Counter, Histogram, MetricsRoute
+
+
+def _make_app(route_class: type) -> FastAPI:
+    """空のエンドポイントを1つ持つアプリケーションを生成する"""
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def _measure(apps: List[FastAPI], repeat: int) -> List[float]:
+    """
+    ASGI アプリケーションを交互に repeat 回ずつ呼び出し、それぞれの所要時間の中央値（マイクロ秒）を返す
+
+    交互に呼び出すことで、計測中の CPU 周波数や他プロセスの負荷の変化が両方に同じように影響します。
+    """
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/a",
+        "raw_path": b"/items/a",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    timings: List[List[float]] = [[] for _ in apps]
+    for _ in range(repeat):
+        for app, app_timings in zip(apps, timings):
+            started = time.perf_counter()
+            await app(dict(scope), receive, send)
+            app_timings.append((time.perf_counter() - started) * 1_000_000)
+    return [statistics.median(app_timings) for app_timings in timings]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="メトリクス計測オーバーヘッドベンチマーク")
+    parser.add_argument("--repeat", type=int, default=20000, help="計測回数")
+    args = parser.parse_args()
+
+    plain, instrumented = asyncio.run(
+        _measure([_make_app(APIRoute), _make_app(MetricsRoute)], args.repeat)
+    )
+    print(f"{'ルート':<24}{'中央値(us)':>12}")
+    print(f"{'APIRoute':<24}{plain:>12.2f}")
+    print(f"{'MetricsRoute':<24}{instrumented:>12.2f}")
+    print(f"{'差分':<24}{instrumented - plain:>12.2f}")
+
+    counter = Counter("bench_counter", "ベンチマーク用", ("path",))
+    histogram = Histogram("bench_histogram", "ベンチマーク用", ("method", "route"))
+    number = 1_000_000
+    inc = timeit.timeit(lambda: counter.inc("scalar"), number=number) / number * 1e9
+    observe = timeit.timeit(lambda: histogram.observe(0.003, "GET", "/items"), number=number) / number * 1e9
+    print(f"\nCounter.inc: {inc:.0f} ns, Histogram.observe: {observe:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - キャラクター名検索ベンチマーク
+
+合成キャラクター名に対する n-gram 索引の構築時間・差分更新時間と、
+代表的なクエリの検索レイテンシ（中央値・p99）を計測します。
+
+実行方法（backend ディレクトリで）:
+    python -m benchmarks.name_search --size 50000
+"""
+
+import argparse
+import statistics
+import time
+
+from app.services.name_search import NameEntry, NameIndex
+
+from .synthetic import make_raw_catalog
+
+# 計測するクエリ（前方一致・部分一致・表記揺れ・該当なし・あいまい一致）
+QUERIES = [
+    "孫悟空",
+    "ソンゴクウ",
+    "身勝手",
+    "べじーた",
+    "ﾌﾞﾛﾘｰ",
+    "ベジータ(超サイヤ人",
+    "超サイヤ人ブルー",
+    "#4999",
+    "セル完全体",
+    "フリーザ最終覚醒",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="キャラクター名検索ベンチマーク")
+    parser.add_argument("--size", type=int, default=50000, help="キャラクター数")
+    parser.add_argument("--repeat", type=int, default=1000, help="クエリごとの計測回数")
+    parser.add_argument("--changes", type=int, default=100, help="差分更新で入れ替えるキャラクター数")
+    parser.add_argument("--limit", type=int, default=10, help="検索結果の最大件数")
+    args = parser.parse_args()
+
+    entries = [
+        NameEntry(raw["id"], raw["name"], raw["type"], raw["rarity"])
+        for raw in make_raw_catalog(args.size, skills_per_character=0)
+    ]
+
+    index = NameIndex()
+    started = time.perf_counter()
+    index.update(entries)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # 一部を削除・改名・追加した一覧で差分更新する
+    updated = entries[args.changes:]
+    updated[:args.changes] = [
+        entry._replace(name=f"{entry.name}（改）") for entry in updated[:args.changes]
+    ]
+    updated += [
+        NameEntry(f"added_{i}", f"新キャラクター{i}", "AGL", 6) for i in range(args.changes)
+    ]
+    started = time.perf_counter()
+    changed, removed = index.update(updated)
+    update_ms = (time.perf_counter() - started) * 1000
+
+    print(f"キャラクター数: {args.size:,}")
+    print(f"初回構築      : {build_ms:8.1f} ms")
+    print(f"差分更新      : {update_ms:8.1f} ms（追加・変更 {changed} 件, 削除 {removed} 件）")
+    print()
+    print(f"{'クエリ':<24}{'件数':>6}{'中央値(us)':>12}{'p99(us)':>10}  先頭の結果")
+
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            hits = index.search(query, args.limit)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        top = f"{hits[0].entry.name}（{hits[0].match}）" if hits else "-"
+        print(f"{query:<24}{len(hits):>6}{statistics.median(timings):>12.1f}{p99:>10.1f}  {top}")
+
+
+if __name__ == "__main__":
+    main()
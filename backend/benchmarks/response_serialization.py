@@ -0,0 +1,114 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - レスポンスシリアライズベンチマーク
+
+ダメージ計算・キャラクター一覧のレスポンス生成について、
+FastAPI 既定の経路（response_model による再検証 + 標準 json）と、
+orjson で直接シリアライズする経路の1リクエストあたりの所要時間を比較します。
+ダメージ計算は detail（none / summary / full）ごとの計算時間も含みます。
+
+実行方法（backend ディレクトリで）:
+    python -m benchmarks.response_serialization --repeat 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.json_response import FastJSONResponse
+from app.models.schemas import CharacterListResponse, DamageCalculationRequest, DamageCalculationResult
+from app.services.character_service import CharacterService
+from app.services.damage_calculator import DamageCalculatorService
+from app.services.damage_coefficients import compile_character
+
+from .synthetic import make_raw_catalog
+
+
+async def _measure(func: Callable[[], Awaitable[Any]], repeat: int) -> float:
+    """関数を repeat 回実行し、所要時間の中央値（マイクロ秒）を返す"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(timings)
+
+
+async def run(repeat: int, page_size: int) -> None:
+    # 計算ログの出力時間は計測に含めない
+    logging.getLogger("app.services.damage_calculator").setLevel(logging.WARNING)
+
+    service = CharacterService()
+    characters = [
+        service._normalize_character_data(raw)
+        for raw in make_raw_catalog(page_size, skills_per_character=4)
+    ]
+    character = characters[0]
+    coefficients = compile_character(character)
+    # 1リクエストあたりの計算・シリアライズ時間を計測するため、計算結果のメモは無効化する
+    calculator = DamageCalculatorService(memo_max_entries=0)
+    request = DamageCalculationRequest(
+        character_id=character.id,
+        def_stat=15000,
+        leader_skill_multiplier=1.7,
+        enemy_attack=50000,
+        attack_count=3
+    )
+
+    result_field = create_response_field(name="Response", type_=DamageCalculationResult)
+    list_field = create_response_field(name="Response", type_=CharacterListResponse)
+
+    async def calculate_default():
+        result = await calculator.calculate_damage(request, character, coefficients)
+        content = await serialize_response(field=result_field, response_content=result)
+        return JSONResponse(content).body
+
+    def calculate_fast(detail: str):
+        async def run_once():
+            result = await calculator.calculate_damage(request, character, coefficients, detail)
+            return FastJSONResponse(result.model_dump(exclude_none=detail != "full")).body
+        return run_once
+
+    async def list_default():
+        page = CharacterListResponse(
+            items=[c.model_dump() for c in characters], total=len(characters), next_cursor=None
+        )
+        content = await serialize_response(field=list_field, response_content=page)
+        return JSONResponse(content).body
+
+    async def list_fast():
+        page = {"items": [c.model_dump() for c in characters], "total": len(characters), "next_cursor": None}
+        return FastJSONResponse(page).body
+
+    cases = [
+        ("ダメージ計算 既定（full）", calculate_default),
+        ("ダメージ計算 orjson full", calculate_fast("full")),
+        ("ダメージ計算 orjson summary", calculate_fast("summary")),
+        ("ダメージ計算 orjson none", calculate_fast("none")),
+        (f"キャラクター一覧 既定（{page_size}件）", list_default),
+        (f"キャラクター一覧 orjson（{page_size}件）", list_fast),
+    ]
+
+    print(f"{'経路':<36}{'中央値(us)':>12}{'ボディ(B)':>12}")
+    for label, func in cases:
+        body = await func()
+        elapsed = await _measure(func, repeat)
+        print(f"{label:<36}{elapsed:>12.1f}{len(body):>12,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="レスポンスシリアライズベンチマーク")
+    parser.add_argument("--repeat", type=int, default=2000, help="計測回数")
+    parser.add_argument("--page-size", type=int, default=50, help="キャラクター一覧の1ページの件数")
+    args = parser.parse_args()
+    asyncio.run(run(args.repeat, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - スナップショット起動ベンチマーク
+
+外部APIから取得した生データを正規化してカタログを構築する通常の起動（コールド）と、
+カタログスナップショットから復元する起動の所要時間を比較します。
+コールド起動の時間には外部APIの通信時間は含みません。
+スナップショット起動は Character を参照時に生成するため、全件を生成した場合の
+時間（一覧エンドポイント初回相当）も併せて表示します。
+
+実行方法（backend ディレクトリで）:
+    python -m benchmarks.snapshot_startup --size 20000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from app.services.catalog_snapshot import read_snapshot, write_snapshot
+from app.services.character_catalog import CharacterCatalog
+from app.services.character_service import CharacterService
+
+from .synthetic import make_raw_catalog
+
+
+def _measure(func, repeat: int) -> float:
+    """関数を repeat 回実行し、所要時間の中央値（ミリ秒）を返す"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="カタログスナップショット起動ベンチマーク")
+    parser.add_argument("--size", type=int, default=20000, help="キャラクター数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測回数")
+    args = parser.parse_args()
+
+    raw_catalog = make_raw_catalog(args.size)
+    service = CharacterService()
+
+    def cold_start():
+        characters = [service._normalize_character_data(raw) for raw in raw_catalog]
+        CharacterCatalog(characters)
+
+    characters = [service._normalize_character_data(raw) for raw in raw_catalog]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog_snapshot.bin")
+        write_ms = _measure(lambda: write_snapshot(path, characters), args.repeat)
+        size_kib = os.path.getsize(path) / 1024
+
+        def snapshot_start():
+            snapshot = read_snapshot(path)
+            return CharacterCatalog.lazy(snapshot.ids, snapshot.character_at)
+
+        cold_ms = _measure(cold_start, args.repeat)
+        snapshot_ms = _measure(snapshot_start, args.repeat)
+        materialize_ms = _measure(lambda: snapshot_start().characters, args.repeat)
+
+    print(f"キャラクター数        : {args.size:,}")
+    print(f"スナップショットサイズ: {size_kib:,.0f} KiB")
+    print(f"スナップショット保存  : {write_ms:8.1f} ms")
+    print(f"コールド起動（正規化）: {cold_ms:8.1f} ms（+ 外部API通信時間）")
+    print(f"スナップショット起動  : {snapshot_ms:8.1f} ms")
+    print(f"  （全件生成まで含む）: {materialize_ms:8.1f} ms")
+    print(f"短縮率                : {cold_ms / snapshot_ms:8.1f} 倍")
+
+
+if __name__ == "__main__":
+    main()
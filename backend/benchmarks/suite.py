@@ -0,0 +1,416 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - ベンチマークスイート
+
+主要な処理の所要時間を計測し、JSON のベースラインとして保存・比較します。
+
+- calculate_damage: パッシブスキル数 0〜50 の合成キャラクターでの単体計算（メモ無効）
+- normalize: 件数を変えた合成カタログの _normalize_character_data
+- cache: CharacterService のキャッシュの取得（ヒット / ミス）と保存
+- asgi: ASGI トランスポート経由の FastAPI アプリケーションへのリクエスト（プロセス内）
+
+各ケースは1ラウンドで number 回実行し、rounds ラウンドの1回あたりの所要時間の
+中央値を比較に用います。ベースラインは計測したマシンに固有のため、
+比較は同じマシンで保存したベースラインに対して行ってください。
+
+実行方法（backend ディレクトリで）:
+    python -m benchmarks.suite --save                 # 計測してベースラインを保存
+    python -m benchmarks.suite --compare              # ベースラインと比較（劣化があれば終了コード1）
+    python -m benchmarks.suite --compare --threshold 0.1 --filter calculate_damage
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import httpx
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.database import create_database_engine
+from app.models.orm import Base
+from app.models.schemas import DamageCalculationRequest
+from app.repositories.character_repository import CharacterRepository
+from app.services.character_service import CharacterService, get_character_service
+from app.services.damage_calculator import DamageCalculatorService, get_damage_calculator_service
+from app.services.damage_coefficients import compile_character
+
+from .synthetic import make_raw_catalog
+
+DEFAULT_BASELINE_PATH = os.path.join(".cache", "benchmarks", "baseline.json")
+# ベースラインの形式のバージョン（形式を変更した場合に上げる）
+BASELINE_FORMAT = 1
+
+# 1回分の処理（同期関数またはコルーチン関数）
+Operation = Union[Callable[[], Any], Callable[[], Awaitable[Any]]]
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    ベンチマークケース
+
+    setup はケースごとの準備を行い、計測する1回分の処理を返します
+    （is_async の場合はコルーチン関数）。
+    """
+    name: str
+    setup: Callable[["SuiteContext"], Awaitable[Operation]]
+    number: int
+    is_async: bool = False
+
+
+@dataclass
+class CaseResult:
+    """
+    ベンチマークケースの計測結果（時間はマイクロ秒）
+    """
+    name: str
+    number: int
+    rounds: int
+    median_us: float
+    min_us: float
+    max_us: float
+
+
+class SuiteContext:
+    """
+    ケース間で共有する準備済みのデータ（ASGI アプリケーションなど）
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.character_service: Optional[CharacterService] = None
+        self.client: Optional[httpx.AsyncClient] = None
+        self._engine: Optional[Engine] = None
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """
+        ASGI トランスポートの HTTP クライアントを取得する（初回のみアプリケーションを準備）
+
+        キャラクターサービスは一時ディレクトリのデータベースを用い、
+        計算結果のメモは計算経路の所要時間を計測するため無効化します。
+        """
+        if self.client is None:
+            from main import app
+
+            self._engine = create_database_engine(f"sqlite:///{os.path.join(self.directory, 'bench.db')}")
+            Base.metadata.create_all(self._engine)
+            repository = CharacterRepository(
+                sessionmaker(bind=self._engine, class_=Session, expire_on_commit=False)
+            )
+            self.character_service = CharacterService(repository=repository)
+            await self.character_service.start()
+
+            calculator = DamageCalculatorService(memo_max_entries=0)
+            app.dependency_overrides[get_character_service] = lambda: self.character_service
+            app.dependency_overrides[get_damage_calculator_service] = lambda: calculator
+            self.client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+            )
+        return self.client
+
+    async def close(self) -> None:
+        """準備したクライアントとサービスを閉じる"""
+        if self.client is not None:
+            await self.client.aclose()
+        if self.character_service is not None:
+            await self.character_service.close()
+        if self._engine is not None:
+            self._engine.dispose()
+
+
+def _calculate_damage_case(skill_count: int) -> Callable[[SuiteContext], Awaitable[Operation]]:
+    """パッシブスキル数を指定した単体計算のケースを生成する"""
+    async def setup(context: SuiteContext) -> Operation:
+        character = CharacterService()._normalize_character_data(
+            make_raw_catalog(1, skills_per_character=skill_count, seed=skill_count)[0]
+        )
+        coefficients = compile_character(character)
+        calculator = DamageCalculatorService(memo_max_entries=0)
+        request = DamageCalculationRequest(
+            character_id=character.id,
+            def_stat=15000,
+            leader_skill_multiplier=1.7,
+            enemy_attack=50000,
+            attack_count=3
+        )
+        return lambda: calculator.calculate_damage(request, character, coefficients)
+    return setup
+
+
+def _normalize_case(size: int) -> Callable[[SuiteContext], Awaitable[Operation]]:
+    """件数を指定したカタログの正規化のケースを生成する"""
+    async def setup(context: SuiteContext) -> Operation:
+        service = CharacterService()
+        raw_catalog = make_raw_catalog(size)
+        return lambda: [service._normalize_character_data(raw) for raw in raw_catalog]
+    return setup
+
+
+def _cache_case(operation: str) -> Callable[[SuiteContext], Awaitable[Operation]]:
+    """キャッシュの取得・保存のケースを生成する"""
+    async def setup(context: SuiteContext) -> Operation:
+        service = CharacterService()
+        characters = [service._normalize_character_data(raw) for raw in make_raw_catalog(1000)]
+        keys = [f"character_{character.id}" for character in characters]
+        for key, character in zip(keys, characters):
+            service._save_to_cache(key, character)
+
+        if operation == "get_hit":
+            return lambda: service._get_from_cache(keys[500])
+        if operation == "get_miss":
+            return lambda: service._get_from_cache("character_missing")
+        return lambda: service._save_to_cache(keys[500], characters[500])
+    return setup
+
+
+def _asgi_case(
+    method: str,
+    path: str,
+    body: Optional[Dict[str, Any]] = None
+) -> Callable[[SuiteContext], Awaitable[Operation]]:
+    """ASGI トランスポート経由のリクエストのケースを生成する"""
+    async def setup(context: SuiteContext) -> Operation:
+        client = await context.get_client()
+
+        async def request() -> None:
+            response = await client.request(method, path, json=body)
+            response.raise_for_status()
+
+        # カタログの読み込みなど初回のみの処理を計測から除く
+        await request()
+        return request
+    return setup
+
+
+CASES: List[BenchmarkCase] = [
+    *[
+        BenchmarkCase(
+            f"calculate_damage/skills={count}", _calculate_damage_case(count), number=2000, is_async=True
+        )
+        for count in (0, 1, 5, 10, 25, 50)
+    ],
+    *[
+        BenchmarkCase(f"normalize/catalog={size}", _normalize_case(size), number=max(1, 10000 // size))
+        for size in (10, 100, 1000, 10000)
+    ],
+    BenchmarkCase("cache/get_hit", _cache_case("get_hit"), number=20000),
+    BenchmarkCase("cache/get_miss", _cache_case("get_miss"), number=20000),
+    BenchmarkCase("cache/set", _cache_case("set"), number=5000),
+    BenchmarkCase(
+        "asgi/calculate_damage",
+        _asgi_case("POST", "/api/calculate-damage", {
+            "character_id": "goku_ui",
+            "def_stat": 15000,
+            "leader_skill_multiplier": 1.7,
+            "enemy_attack": 50000,
+            "attack_count": 3
+        }),
+        number=200,
+        is_async=True
+    ),
+    BenchmarkCase(
+        "asgi/characters_list", _asgi_case("GET", "/api/characters?limit=50"), number=200, is_async=True
+    ),
+    BenchmarkCase(
+        "asgi/character_detail", _asgi_case("GET", "/api/characters/goku_ui"), number=200, is_async=True
+    ),
+    BenchmarkCase("asgi/health", _asgi_case("GET", "/health"), number=200, is_async=True),
+    BenchmarkCase(
+        "asgi/simulation/trials=1000000,attacks=3",
+        _asgi_case("POST", "/api/calculate-damage/simulation", {
+            "character_id": "goku_ui",
+            "def_stat": 15000,
+            "leader_skill_multiplier": 1.7,
+            "hp": 150000,
+            "trials": 1000000,
+            "seed": 0,
+            "attacks": [
+                {"attack": 300000, "distribution": "normal", "spread": 30000},
+                {"attack": 300000, "distribution": "normal", "spread": 30000, "guard_chance": 0.3},
+                {"attack": 800000, "distribution": "uniform", "spread": 100000, "probability": 0.25}
+            ]
+        }),
+        number=3,
+        is_async=True
+    ),
+]
+
+
+async def run_case(case: BenchmarkCase, context: SuiteContext, rounds: int) -> CaseResult:
+    """
+    ケースを計測する
+
+    Args:
+        case: ベンチマークケース
+        context: 共有の準備済みデータ
+        rounds: ラウンド数
+
+    Returns:
+        CaseResult: 計測結果
+    """
+    operation = await case.setup(context)
+
+    timings = []
+    for round_index in range(rounds + 1):
+        started = time.perf_counter()
+        if case.is_async:
+            for _ in range(case.number):
+                await operation()
+        else:
+            for _ in range(case.number):
+                operation()
+        elapsed_us = (time.perf_counter() - started) / case.number * 1_000_000
+        # 最初のラウンドはウォームアップとして捨てる
+        if round_index > 0:
+            timings.append(elapsed_us)
+
+    return CaseResult(
+        name=case.name,
+        number=case.number,
+        rounds=rounds,
+        median_us=statistics.median(timings),
+        min_us=min(timings),
+        max_us=max(timings)
+    )
+
+
+async def run_suite(cases: List[BenchmarkCase], rounds: int) -> List[CaseResult]:
+    """
+    ケースを順に計測する
+
+    Args:
+        cases: ベンチマークケース一覧
+        rounds: ラウンド数
+
+    Returns:
+        List[CaseResult]: 計測結果
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        context = SuiteContext(directory)
+        try:
+            for case in cases:
+                result = await run_case(case, context, rounds)
+                print(
+                    f"{result.name:<32}{result.median_us:>14,.2f}{result.min_us:>14,.2f}{result.max_us:>14,.2f}",
+                    flush=True
+                )
+                results.append(result)
+        finally:
+            await context.close()
+    return results
+
+
+def save_baseline(path: str, results: List[CaseResult]) -> None:
+    """計測結果をベースラインとして JSON に保存する"""
+    payload = {
+        "format": BASELINE_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.name: asdict(result) for result in results},
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    ベースラインを読み込む
+
+    Raises:
+        ValueError: ベースラインの形式が異なる場合
+    """
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+    if payload.get("format") != BASELINE_FORMAT:
+        raise ValueError(f"ベースラインの形式が異なります: {payload.get('format')} != {BASELINE_FORMAT}")
+    return payload["results"]
+
+
+def compare(
+    results: List[CaseResult],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float
+) -> List[str]:
+    """
+    計測結果をベースラインと比較して表示する
+
+    Args:
+        results: 計測結果
+        baseline: ベースラインの計測結果（ケース名 → 結果）
+        threshold: 劣化と判定する中央値の増加率（0.2 で 20% 以上遅くなった場合）
+
+    Returns:
+        List[str]: 劣化したケース名
+    """
+    regressions = []
+    print(f"\n{'ケース':<32}{'ベースライン(us)':>16}{'今回(us)':>14}{'変化':>10}")
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            print(f"{result.name:<32}{'-':>16}{result.median_us:>14,.2f}{'新規':>10}")
+            continue
+        change = result.median_us / base["median_us"] - 1
+        mark = ""
+        if change > threshold:
+            regressions.append(result.name)
+            mark = "  劣化"
+        print(f"{result.name:<32}{base['median_us']:>16,.2f}{result.median_us:>14,.2f}{change:>+10.1%}{mark}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ベンチマークスイート")
+    parser.add_argument("--rounds", type=int, default=7, help="ラウンド数（各ラウンドで number 回実行）")
+    parser.add_argument("--filter", default=None, help="名前にこの文字列を含むケースのみ実行")
+    parser.add_argument(
+        "--save", nargs="?", const=DEFAULT_BASELINE_PATH, default=None,
+        help=f"計測結果をベースラインとして保存（既定: {DEFAULT_BASELINE_PATH}）"
+    )
+    parser.add_argument(
+        "--compare", nargs="?", const=DEFAULT_BASELINE_PATH, default=None,
+        help=f"ベースラインと比較し、劣化があれば終了コード1で終了（既定: {DEFAULT_BASELINE_PATH}）"
+    )
+    parser.add_argument("--threshold", type=float, default=0.2, help="劣化と判定する中央値の増加率")
+    args = parser.parse_args()
+
+    # ログ出力の時間は計測に含めない
+    logging.disable(logging.WARNING)
+
+    cases = [case for case in CASES if not args.filter or args.filter in case.name]
+    if not cases:
+        parser.error(f"'{args.filter}' に一致するケースがありません")
+
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    print(f"{'ケース':<32}{'中央値(us)':>14}{'最小(us)':>14}{'最大(us)':>14}")
+    results = asyncio.run(run_suite(cases, args.rounds))
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"\nベースラインを保存: {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}件のケースが {args.threshold:.0%} を超えて劣化しました: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n劣化したケースはありません")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - ベンチマーク用合成データ
+
+外部APIの生データ形式に合わせた合成キャラクターデータを生成します。
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+SKILL_TYPES = ["defense_boost", "damage_reduction", "guard", "infinite_stacking"]
+CHARACTER_TYPES = ["AGL", "TEQ", "INT", "STR", "PHY"]
+NAME_BASES = [
+    "孫悟空", "ベジータ", "孫悟飯", "ピッコロ", "トランクス", "フリーザ", "セル", "魔人ブウ",
+    "ブロリー", "ゴテンクス", "ゴジータ", "ベジット", "人造人間18号", "クリリン", "ジレン",
+]
+NAME_FORMS = ["身勝手の極意", "超サイヤ人", "超サイヤ人ブルー", "進化の極限", "最終形態", "覚醒", "フルパワー"]
+
+
+def make_raw_character(index: int, skill_count: int, rng: random.Random) -> Dict[str, Any]:
+    """
+    合成キャラクター1体分の生データを生成する
+
+    Args:
+        index: 通し番号（ID と名前の一意化に使用）
+        skill_count: パッシブスキル数
+        rng: 乱数生成器
+
+    Returns:
+        Dict[str, Any]: 外部APIの生データ形式のキャラクター
+    """
+    return {
+        "id": f"synthetic_{index}",
+        "name": f"{rng.choice(NAME_BASES)}（{rng.choice(NAME_FORMS)}）#{index}",
+        "rarity": rng.randint(4, 6),
+        "type": rng.choice(CHARACTER_TYPES),
+        "defense_multiplier": rng.choice([None, round(rng.uniform(50, 200), 1)]),
+        "damage_reduction": rng.choice([None, round(rng.uniform(5, 50), 1)]),
+        "guard_ability": rng.random() < 0.3,
+        "infinite_defense_stacking": rng.random() < 0.2,
+        "passive_skills": [
+            {
+                "id": f"synthetic_{index}_skill_{j}",
+                "type": rng.choice(SKILL_TYPES),
+                "value": round(rng.uniform(5, 120), 1),
+                "condition": rng.choice([None, "HP 80%以上時", "攻撃時", "ターン開始時"]),
+                "stackable": rng.random() < 0.3,
+            }
+            for j in range(skill_count)
+        ],
+    }
+
+
+def make_raw_catalog(
+    size: int,
+    skills_per_character: Optional[int] = None,
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    合成キャラクター一覧の生データを生成する
+
+    Args:
+        size: キャラクター数
+        skills_per_character: 1体あたりのパッシブスキル数（省略時は0〜6のランダム）
+        seed: 乱数シード
+
+    Returns:
+        List[Dict[str, Any]]: 外部APIの生データ形式のキャラクター一覧
+    """
+    rng = random.Random(seed)
+    return [
+        make_raw_character(
+            i,
+            skills_per_character if skills_per_character is not None else rng.randint(0, 6),
+            rng,
+        )
+        for i in range(size)
+    ]
@@ -4,13 +4,20 @@
 FastAPI アプリケーションの初期化とルーティング設定を行います。
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import logging
 
-from app.api.routes import api_router, health_router
+from app.api.routes import api_router, admin_router, health_router
 from app.core.config import get_settings
+from app.core.logging_config import configure_logging
+from app.services.character_service import get_character_service
+from app.services.sweep_jobs import get_sweep_job_manager
+from app.services.warmup import WARMUP_SKIPPED, get_warmup_state, run_warmup
 
 # 環境変数の読み込み
 load_dotenv()
@@ -18,20 +25,55 @@ load_dotenv()
 # 設定の取得
 settings = get_settings()
 
-# ログ設定
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# ログ設定（整形・出力はバックグラウンドスレッドで行う）
+configure_logging(
+    level=settings.log_level,
+    log_format=settings.log_format,
+    request_sample_rate=settings.log_request_sample_rate,
+    use_queue=settings.log_queue_enabled
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    アプリケーションのライフスパン管理
+    
+    プロセス共有のキャラクターサービスの HTTP クライアント（コネクションプール）を
+    起動時に生成し、終了時に閉じます。
+    起動時にはカタログの読み込みと各計算経路の初回実行（ウォームアップ）を行い、
+    完了後に /ready がトラフィックを受け付ける状態を返します。
+    終了時には実行中のスイープジョブを中断し、プロセスプールを終了します。
+    """
+    async with get_character_service() as character_service:
+        warmup_state = get_warmup_state()
+        warmup_task = None
+        if settings.warmup_mode == "blocking":
+            await run_warmup(app, character_service, warmup_state, settings.warmup_timeout)
+        elif settings.warmup_mode == "background":
+            warmup_task = asyncio.create_task(
+                run_warmup(app, character_service, warmup_state, settings.warmup_timeout)
+            )
+        else:
+            warmup_state.status = WARMUP_SKIPPED
+        try:
+            yield
+        finally:
+            if warmup_task is not None and not warmup_task.done():
+                warmup_task.cancel()
+                await asyncio.gather(warmup_task, return_exceptions=True)
+            await get_sweep_job_manager().shutdown()
+
+
 # FastAPI アプリケーションの初期化
 app = FastAPI(
     title=settings.app_name,
     description="ドラゴンボール Z ドッカンバトルのダメージ計算を行うAPI",
     version=settings.app_version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS設定 - フロントエンドからのアクセスを許可
@@ -46,6 +88,7 @@ app.add_middleware(
 # ルーターの登録
 app.include_router(health_router)
 app.include_router(api_router)
+app.include_router(admin_router)
 
 logger.info(f"アプリケーション初期化完了: {settings.app_name} v{settings.app_version}")
 
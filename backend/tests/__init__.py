@@ -0,0 +1 @@
+# テストパッケージの初期化
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+ドッカンバトル ダメージ計算アプリケーション - テスト共通設定
+
+アプリケーションの設定は import 時に環境変数から読み込まれるため、
+app を import する前にテスト用の値を設定します。
+"""
+
+import os
+import tempfile
+
+_TEST_DIR = tempfile.mkdtemp(prefix="dokkan-tests-")
+
+# 作業ディレクトリにデータベース・スナップショット・プロファイルを作らない
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}")
+os.environ.setdefault("SWEEP_JOB_RESULT_DIR", os.path.join(_TEST_DIR, "sweep_jobs"))
+os.environ.setdefault("PROFILE_DIR", os.path.join(_TEST_DIR, "profiles"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import pytest  # noqa: E402
+
+from app.models.schemas import Character, PassiveSkill  # noqa: E402
+
+
+@pytest.fixture
+def characters():
+    """
+    ガード・DEF無限上昇・ダメージ軽減の有無を組み合わせたキャラクター一覧
+    """
+    return [
+        Character(
+            id="guard_reduction",
+            name="ガード・軽減あり",
+            rarity=6,
+            type="AGL",
+            passive_skills=[
+                PassiveSkill(id="boost", type="defense_boost", value=120.0),
+                PassiveSkill(id="reduction", type="damage_reduction", value=30.0),
+            ],
+            damage_reduction=30.0,
+            guard_ability=True,
+            infinite_defense_stacking=False
+        ),
+        Character(
+            id="stacking",
+            name="DEF無限上昇",
+            rarity=6,
+            type="STR",
+            passive_skills=[
+                PassiveSkill(id="stack", type="infinite_stacking", value=30.0, stackable=True),
+            ],
+            damage_reduction=20.0,
+            guard_ability=False,
+            infinite_defense_stacking=True
+        ),
+        Character(
+            id="stacking_guard",
+            name="DEF無限上昇・ガード",
+            rarity=5,
+            type="PHY",
+            passive_skills=[
+                PassiveSkill(id="boost", type="defense_boost", value=50.0),
+                PassiveSkill(id="stack", type="infinite_stacking", value=12.5, stackable=True),
+            ],
+            guard_ability=True,
+            infinite_defense_stacking=True
+        ),
+        Character(
+            id="plain",
+            name="スキルなし",
+            rarity=4,
+            type="INT",
+            guard_ability=None,
+            infinite_defense_stacking=None
+        ),
+    ]
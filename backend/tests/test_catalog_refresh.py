@@ -0,0 +1,105 @@
+"""
+CharacterService のカタログ再取得のテスト
+
+大量のキャラクターでもイベントループを止めないよう、正規化・カタログの構築が
+ワーカースレッドで行われ、完成したカタログがループ上で差し替えられることを確認します。
+"""
+
+import threading
+
+import pytest
+
+from app.services import character_service as character_service_module
+from app.services.character_service import CharacterService
+from app.services.name_search import NameIndex
+
+
+def _raw_character(character_id, name, rarity=5):
+    return {"id": character_id, "name": name, "rarity": rarity, "type": "AGL", "passive_skills": []}
+
+
+class _NullRepository:
+    """同期を無視するリポジトリ（データベースを使わない）"""
+
+    def sync_catalog(self, characters, catalog_version=None):
+        pass
+
+
+class _StaticUpstream:
+    """差し替え可能なキャラクター一覧を返す外部APIの代わり"""
+
+    def __init__(self, characters):
+        self.characters = characters
+
+    async def fetch_characters(self):
+        return [dict(raw) for raw in self.characters]
+
+
+def _make_service(characters):
+    upstream = _StaticUpstream(characters)
+    service = CharacterService(repository=_NullRepository())
+    service._fetch_characters_from_api = upstream.fetch_characters
+    return service, upstream
+
+
+@pytest.mark.asyncio
+async def test_refresh_builds_catalog_off_the_event_loop(monkeypatch):
+    service, upstream = _make_service([_raw_character("a", "孫悟空"), _raw_character("b", "ベジータ")])
+    await service.get_characters()
+    old_catalog, old_version = service._catalog, service.catalog_version
+
+    loop_thread = threading.get_ident()
+    threads = {}
+    normalize = service._normalize_character_data
+    build_catalog = character_service_module.CharacterCatalog
+
+    def record_normalize(raw):
+        threads["normalize"] = threading.get_ident()
+        return normalize(raw)
+
+    def record_catalog(characters):
+        threads["catalog"] = threading.get_ident()
+        return build_catalog(characters)
+
+    monkeypatch.setattr(service, "_normalize_character_data", record_normalize)
+    monkeypatch.setattr(character_service_module, "CharacterCatalog", record_catalog)
+
+    upstream.characters = [_raw_character("b", "ベジータ"), _raw_character("c", "トランクス", rarity=6)]
+    await service._refresh_catalog()
+
+    assert set(threads) == {"normalize", "catalog"}
+    assert loop_thread not in threads.values()
+    assert service._catalog is not old_catalog
+    assert service.catalog_version != old_version
+    assert [c.id for c in await service.get_characters()] == ["b", "c"]
+    assert (await service.get_character("c")).rarity == 6
+
+
+@pytest.mark.asyncio
+async def test_refresh_diffs_name_index_off_the_event_loop(monkeypatch):
+    service, upstream = _make_service([_raw_character("a", "孫悟空"), _raw_character("b", "ベジータ")])
+    assert [hit.entry.id for hit in await service.search_characters("悟空", 10)] == ["a"]
+    index = service._name_index
+
+    loop_thread = threading.get_ident()
+    diff_threads = []
+    diff = NameIndex.diff
+
+    def record_diff(self, entries):
+        diff_threads.append(threading.get_ident())
+        return diff(self, entries)
+
+    monkeypatch.setattr(NameIndex, "diff", record_diff)
+
+    upstream.characters = [
+        _raw_character("b", "ベジータ", rarity=6),
+        _raw_character("c", "孫悟飯"),
+    ]
+    await service._refresh_catalog()
+
+    assert len(diff_threads) == 1 and diff_threads[0] != loop_thread
+    # 構築済みの索引に差分が反映される（作り直さない）
+    assert service._name_index is index
+    assert len(index) == 2
+    assert [hit.entry.id for hit in await service.search_characters("孫", 10)] == ["c"]
+    assert [hit.entry.rarity for hit in await service.search_characters("ベジータ", 10)] == [6]
@@ -0,0 +1,62 @@
+"""
+一括ダメージ計算（calculate_damage_batch）が単体計算と同一の結果を返すことのテスト
+"""
+
+import itertools
+
+import pytest
+
+from app.models.schemas import DamageCalculationRequest
+from app.services.damage_calculator import DamageCalculatorService
+from app.services.damage_coefficients import compile_character
+
+
+def _requests(characters):
+    """キャラクター・DEF・リーダースキル倍率・敵攻撃値・攻撃回数を組み合わせたリクエスト一覧"""
+    return [
+        DamageCalculationRequest(
+            character_id=character.id,
+            def_stat=def_stat,
+            leader_skill_multiplier=leader_skill_multiplier,
+            enemy_attack=enemy_attack,
+            attack_count=attack_count
+        )
+        for character, def_stat, leader_skill_multiplier, enemy_attack, attack_count in itertools.product(
+            characters,
+            (0, 8000, 15000),
+            (1.0, 1.7, 2.25),
+            (0, 50000, 120000, 1_000_000),
+            (None, 0, 1, 3, 10)
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_scalar_row_by_row(characters):
+    calculator = DamageCalculatorService(memo_max_entries=0)
+    by_id = {character.id: character for character in characters}
+    coefficients = {character.id: compile_character(character) for character in characters}
+    requests = _requests(characters)
+
+    batch = await calculator.calculate_damage_batch(requests, coefficients)
+
+    assert batch.count == len(requests)
+    for i, request in enumerate(requests):
+        scalar = await calculator.calculate_damage(
+            request, by_id[request.character_id], coefficients[request.character_id]
+        )
+        assert batch.effective_defense[i] == scalar.effective_defense, request
+        assert batch.damage_received[i] == scalar.damage_received, request
+
+
+@pytest.mark.asyncio
+async def test_batch_rows_are_independent_of_order(characters):
+    calculator = DamageCalculatorService(memo_max_entries=0)
+    coefficients = {character.id: compile_character(character) for character in characters}
+    requests = _requests(characters)
+
+    forward = await calculator.calculate_damage_batch(requests, coefficients)
+    backward = await calculator.calculate_damage_batch(requests[::-1], coefficients)
+
+    assert backward.damage_received[::-1] == forward.damage_received
+    assert backward.effective_defense[::-1] == forward.effective_defense
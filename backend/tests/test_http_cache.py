@@ -0,0 +1,136 @@
+"""
+カタログ系エンドポイントの ETag・条件付き GET（304 Not Modified）のテスト
+
+304 は存在するリソースにのみ返し、存在しない ID・不正なパラメータには
+If-None-Match の値にかかわらずエラーを返すことを確認します。
+"""
+
+import httpx
+import pytest
+
+from app.core.http_cache import get_response_cache, make_etag
+from app.services.character_service import CharacterService, get_character_service
+from app.services.upstream import UpstreamError
+
+
+class _NullRepository:
+    """同期を無視するリポジトリ（データベースを使わない）"""
+
+    def sync_catalog(self, characters, catalog_version=None):
+        pass
+
+
+@pytest.fixture
+def app():
+    """組み込みのモックデータを返す CharacterService に差し替えたアプリケーション"""
+    from main import app
+
+    service = CharacterService(repository=_NullRepository())
+    app.dependency_overrides[get_character_service] = lambda: service
+    get_response_cache().clear()
+    yield app
+    app.dependency_overrides.pop(get_character_service, None)
+    get_response_cache().clear()
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_known_character_returns_304_for_matching_etag(app):
+    async with _client(app) as client:
+        response = await client.get("/api/characters/goku_ui")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        for if_none_match in (etag, f"W/{etag}", "*"):
+            response = await client.get("/api/characters/goku_ui", headers={"If-None-Match": if_none_match})
+            assert response.status_code == 304
+            assert response.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_known_character_returns_304_before_response_is_cached(app):
+    async with _client(app) as client:
+        response = await client.get("/api/characters/goku_ui")
+        etag = response.headers["etag"]
+        get_response_cache().clear()
+
+        response = await client.get("/api/characters/goku_ui", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("guess_etag", [False, True])
+async def test_unknown_character_returns_404_regardless_of_if_none_match(app, guess_etag):
+    async with _client(app) as client:
+        # カタログを読み込み、バージョンを確定させる
+        assert (await client.get("/api/characters/goku_ui")).status_code == 200
+        service = app.dependency_overrides[get_character_service]()
+        if_none_match = (
+            make_etag(service.catalog_version, "characters/unknown_id") if guess_etag else "*"
+        )
+
+        for _ in range(2):
+            response = await client.get("/api/characters/unknown_id", headers={"If-None-Match": if_none_match})
+            assert response.status_code == 404
+            assert response.json()["detail"]["code"] == "CHARACTER_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("upstream_available", [True, False])
+async def test_character_outside_catalog_is_not_cached_or_given_etag(app, upstream_available):
+    service = app.dependency_overrides[get_character_service]()
+    fetch_characters = service._fetch_characters_from_api
+    raw_goku = next(raw for raw in await fetch_characters() if raw["id"] == "goku_ui")
+
+    async def fetch_catalog_without_goku():
+        return [raw for raw in await fetch_characters() if raw["id"] != "goku_ui"]
+
+    async def fetch_goku(character_id):
+        # 外部APIが使えない場合はモックデータへのフォールバックになる
+        if not upstream_available:
+            raise UpstreamError("upstream unavailable")
+        return raw_goku
+
+    service._fetch_characters_from_api = fetch_catalog_without_goku
+    service._fetch_character_from_api = fetch_goku
+
+    async with _client(app) as client:
+        for if_none_match in (None, "*"):
+            headers = {"If-None-Match": if_none_match} if if_none_match else {}
+            response = await client.get("/api/characters/goku_ui", headers=headers)
+            assert response.status_code == 200
+            assert response.json()["id"] == "goku_ui"
+            assert "etag" not in response.headers
+
+        # カタログに含まれるキャラクターは引き続き ETag 付きで返す
+        assert "etag" in (await client.get("/api/characters/vegeta_evolution")).headers
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_returns_400_regardless_of_if_none_match(app):
+    async with _client(app) as client:
+        response = await client.get(
+            "/api/characters", params={"cursor": "not-a-cursor"}, headers={"If-None-Match": "*"}
+        )
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["code"] == "INVALID_CURSOR"
+
+
+@pytest.mark.asyncio
+async def test_list_returns_304_for_matching_etag(app):
+    async with _client(app) as client:
+        response = await client.get("/api/characters", params={"limit": 1})
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        response = await client.get("/api/characters", params={"limit": 1}, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        # クエリが異なれば ETag も異なる
+        response = await client.get("/api/characters", params={"limit": 2}, headers={"If-None-Match": etag})
+        assert response.status_code == 200
@@ -0,0 +1,33 @@
+"""
+起動時の import 時間の予算のテスト（benchmarks.import_time と同じ検査）
+
+新しいプロセスで `import main` を計測し、中央値が予算以内であること、
+初回使用時に読み込むモジュール（SQLAlchemy など）が起動時に読み込まれないことを確認します。
+予算は環境変数 IMPORT_TIME_BUDGET_MS で変更できます（低速な CI 環境向け）。
+"""
+
+import os
+
+import pytest
+
+from benchmarks.import_time import DEFAULT_BUDGET_MS, check_import_time
+
+# 計測回数（テストの実行時間を抑えるため、スクリプトの既定値より少なくする）
+RUNS = 3
+
+
+@pytest.fixture(scope="module")
+def report():
+    budget_ms = float(os.environ.get("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS))
+    return check_import_time(RUNS, budget_ms)
+
+
+def test_deferred_modules_are_not_imported_at_startup(report):
+    assert report.deferred == []
+
+
+def test_import_main_is_within_budget(report):
+    assert not report.over_budget, (
+        f"import main の中央値 {report.median:,.0f}ms が予算 {report.budget_ms:,.0f}ms を超えています"
+        f"（各回: {', '.join(f'{t:,.0f}ms' for t in report.timings)}）"
+    )
@@ -0,0 +1,248 @@
+"""
+シングルフライト（SingleFlight）と CharacterService のキャッシュミス時の同時取得のテスト
+
+カタログの有効期限切れ・一覧外の ID の取得で同時に発生したキャッシュミスが
+外部APIの1回の取得を共有すること、待機側のキャンセルが共有の取得に伝播しないことを確認します。
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import get_settings
+from app.core.singleflight import SingleFlight
+from app.services.character_service import CATALOG_KEY, CharacterService
+
+CONCURRENCY = 20
+
+RAW_CHARACTERS = [
+    {
+        "id": "goku_ui",
+        "name": "孫悟空（身勝手の極意）",
+        "rarity": 6,
+        "type": "AGL",
+        "damage_reduction": 30.0,
+        "guard_ability": True,
+        "passive_skills": [{"id": "ui_defense", "type": "defense_boost", "value": 120.0}]
+    },
+    {
+        "id": "vegeta_evolution",
+        "name": "ベジータ（進化の極限）",
+        "rarity": 6,
+        "type": "STR",
+        "infinite_defense_stacking": True,
+        "passive_skills": [{"id": "stacking", "type": "infinite_stacking", "value": 30.0, "stackable": True}]
+    },
+]
+
+
+class _NullRepository:
+    """同期を記録するだけのリポジトリ（データベースを使わない）"""
+
+    def __init__(self):
+        self.synced = 0
+
+    def sync_catalog(self, characters, catalog_version=None):
+        self.synced += 1
+
+
+class _CountingUpstream:
+    """呼び出し回数を数え、release されるまで応答を保留する外部APIの代わり"""
+
+    def __init__(self):
+        self.list_calls = 0
+        self.detail_calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def fetch_characters(self):
+        self.list_calls += 1
+        self.started.set()
+        await self.release.wait()
+        return [dict(raw) for raw in RAW_CHARACTERS]
+
+    async def fetch_character(self, character_id):
+        self.detail_calls += 1
+        self.started.set()
+        await self.release.wait()
+        return {**RAW_CHARACTERS[0], "id": character_id, "name": f"個別取得 {character_id}"}
+
+
+def _make_service():
+    """外部APIの取得を差し替えた CharacterService と、その呼び出しを数える外部APIの代わり"""
+    upstream = _CountingUpstream()
+    service = CharacterService(repository=_NullRepository())
+    service._fetch_characters_from_api = upstream.fetch_characters
+    service._fetch_character_from_api = upstream.fetch_character
+    return service, upstream
+
+
+def _expire_catalog(service):
+    """カタログを強制有効期限切れにする（stale-while-revalidate で返さず、再取得を待たせる）"""
+    expired_by = get_settings().cache_hard_ttl + 1
+    service._catalog.fetched_at -= expired_by
+    service._synced_at -= expired_by
+
+
+async def _load(service, upstream):
+    """カタログを1回読み込み、外部APIの代わりを初期状態に戻す"""
+    upstream.release.set()
+    await service.get_characters()
+    assert upstream.list_calls == 1
+    upstream.list_calls = 0
+    upstream.started.clear()
+    upstream.release.clear()
+
+
+async def _load_then_expire(service, upstream):
+    """カタログを1回読み込んでから期限切れにする"""
+    await _load(service, upstream)
+    _expire_catalog(service)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "result"
+
+    waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(CONCURRENCY)]
+    await asyncio.sleep(0)
+    assert flight.in_flight("key")
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["result"] * CONCURRENCY
+    assert calls == 1
+    assert not flight.in_flight("key")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_exception_to_all_waiters():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        raise RuntimeError("upstream failed")
+
+    waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(CONCURRENCY)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_catalog_is_fetched_once_for_concurrent_callers():
+    service, upstream = _make_service()
+    await _load_then_expire(service, upstream)
+
+    lists = [asyncio.create_task(service.get_characters()) for _ in range(CONCURRENCY)]
+    details = [asyncio.create_task(service.get_character("goku_ui")) for _ in range(CONCURRENCY)]
+    await upstream.started.wait()
+    assert service._single_flight.in_flight(CATALOG_KEY)
+    upstream.release.set()
+
+    list_results = await asyncio.gather(*lists)
+    detail_results = await asyncio.gather(*details)
+
+    assert upstream.list_calls == 1
+    assert upstream.detail_calls == 0
+    assert all([c.id for c in result] == ["goku_ui", "vegeta_evolution"] for result in list_results)
+    assert all(character.id == "goku_ui" for character in detail_results)
+    assert service._catalog.age() < get_settings().cache_ttl
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_catalog_fetch():
+    service, upstream = _make_service()
+    await _load_then_expire(service, upstream)
+
+    waiters = [asyncio.create_task(service.get_characters()) for _ in range(CONCURRENCY)]
+    await upstream.started.wait()
+
+    waiters[0].cancel()
+    await asyncio.sleep(0)
+    assert service._single_flight.in_flight(CATALOG_KEY)
+    upstream.release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiters[0]
+    results = await asyncio.gather(*waiters[1:])
+
+    assert upstream.list_calls == 1
+    assert all(len(result) == len(RAW_CHARACTERS) for result in results)
+    assert service._catalog.age() < get_settings().cache_ttl
+
+
+@pytest.mark.asyncio
+async def test_catalog_fetch_completes_when_every_waiter_is_cancelled():
+    service, upstream = _make_service()
+    await _load_then_expire(service, upstream)
+
+    waiters = [asyncio.create_task(service.get_characters()) for _ in range(CONCURRENCY)]
+    await upstream.started.wait()
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+
+    upstream.release.set()
+    while service._single_flight.in_flight(CATALOG_KEY):
+        await asyncio.sleep(0)
+
+    # 共有の取得は完了しており、次の呼び出しは外部APIを呼ばずに新しいカタログを返す
+    assert service._catalog.age() < get_settings().cache_ttl
+    assert len(await service.get_characters()) == len(RAW_CHARACTERS)
+    assert upstream.list_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_uncatalogued_character_is_fetched_once_for_concurrent_callers():
+    service, upstream = _make_service()
+    await _load(service, upstream)
+
+    waiters = [asyncio.create_task(service.get_character("new_character")) for _ in range(CONCURRENCY)]
+    await upstream.started.wait()
+    waiters[0].cancel()
+    upstream.release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiters[0]
+    results = await asyncio.gather(*waiters[1:])
+
+    assert upstream.detail_calls == 1
+    assert all(character.id == "new_character" for character in results)
+    # 取得結果はキャッシュされ、以降の呼び出しは外部APIを呼ばない
+    assert (await service.get_character("new_character")).id == "new_character"
+    assert upstream.detail_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_in_flight_catalog_fetch():
+    service, upstream = _make_service()
+    await _load_then_expire(service, upstream)
+
+    service.refresh_in_background()
+    waiter = asyncio.create_task(service.get_characters())
+    await upstream.started.wait()
+    in_flight = service._single_flight.tasks()
+    assert len(in_flight) == 1
+
+    # 待機側だけでなく共有の取得もキャンセルされ、終了後に外部APIの応答を処理しない
+    await service.close()
+
+    assert in_flight[0].cancelled()
+    assert len(service._single_flight) == 0
+    assert not service._background_tasks
+    await asyncio.gather(waiter, return_exceptions=True)
+    upstream.release.set()
+    await asyncio.sleep(0)
+    assert service._catalog.age() > get_settings().cache_hard_ttl
@@ -0,0 +1,162 @@
+"""
+スイープジョブ（SweepJobManager）のテスト
+
+プロセスプールの代わりにスレッドプールを使い、チャンクの計算を外部から進めることで、
+キャンセル・失敗時に実行中のチャンクの終了を待ってから結果ファイルを削除することを確認します。
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.models.schemas import SweepRange
+from app.services import sweep_jobs
+from app.services.damage_coefficients import compile_character
+from app.services.damage_kernel import build_character_arrays, calculate_damage_arrays
+from app.services.sweep_jobs import JOB_CANCELLED, JOB_COMPLETED, JOB_FAILED, SweepJobManager
+from app.services.sweep_worker import RESULT_DTYPE, compute_sweep_chunk
+
+LEADER = SweepRange(start=1.5, stop=2.0, step=0.5)
+DEF_STAT = SweepRange(start=10000, stop=12000, step=1000)
+ENEMY_ATTACK = SweepRange(start=0, stop=200000, step=10000)
+
+
+class GatedChunks:
+    """
+    compute_sweep_chunk の代わり（開始を記録し、release されるまで計算しない）
+
+    fail_rows に含まれる行から始まるチャンクは、release ではなく fail を待って例外を送出します。
+    """
+
+    def __init__(self, fail_rows=()):
+        self.release = threading.Event()
+        self.fail = threading.Event()
+        self.started = threading.Semaphore(0)
+        self.fail_rows = set(fail_rows)
+        self.errors = []
+        self.finished = 0
+
+    def __call__(self, task):
+        self.started.release()
+        if task.row_start in self.fail_rows:
+            self.fail.wait(timeout=10)
+            raise RuntimeError(f"chunk at row {task.row_start} failed")
+        self.release.wait(timeout=10)
+        try:
+            return compute_sweep_chunk(task)
+        except Exception as e:
+            self.errors.append(e)
+            raise
+        finally:
+            self.finished += 1
+
+    async def wait_started(self, count):
+        for _ in range(count):
+            assert await asyncio.to_thread(self.started.acquire, True, 10)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """スレッドプールで実行する SweepJobManager（1チャンク = 敵攻撃値の軸2本分）"""
+    manager = SweepJobManager(
+        result_dir=str(tmp_path),
+        max_workers=2,
+        chunk_cells=2 * ENEMY_ATTACK.count(),
+        retention=3600.0
+    )
+    manager._executor = ThreadPoolExecutor(max_workers=2)
+    yield manager
+    manager._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _submit(manager, characters):
+    return manager.submit(
+        [character.id for character in characters],
+        [compile_character(character) for character in characters],
+        LEADER,
+        DEF_STAT,
+        ENEMY_ATTACK,
+        attack_count=2
+    )
+
+
+@pytest.mark.asyncio
+async def test_completed_job_matches_kernel(manager, characters):
+    job = _submit(manager, characters)
+    await job.task
+
+    assert job.status == JOB_COMPLETED
+    assert job.completed_chunks == job.chunk_count
+    data = b"".join([await manager.read_chunk(job.job_id, i) for i in range(job.chunk_count)])
+    grid = np.frombuffer(data, dtype=RESULT_DTYPE).reshape(job.shape)
+
+    arrays = build_character_arrays([compile_character(character) for character in characters])
+    axis = lambda r: r.start + r.step * np.arange(r.count(), dtype=np.float64)
+    _, expected = calculate_damage_arrays(
+        arrays,
+        np.arange(len(characters))[:, None, None, None],
+        axis(DEF_STAT)[None, None, :, None],
+        axis(LEADER)[None, :, None, None],
+        axis(ENEMY_ATTACK)[None, None, None, :],
+        2
+    )
+    np.testing.assert_array_equal(grid, expected.astype(RESULT_DTYPE))
+
+
+@pytest.mark.asyncio
+async def test_cancel_keeps_result_file_until_running_chunks_finish(manager, characters, monkeypatch):
+    chunks = GatedChunks()
+    monkeypatch.setattr(sweep_jobs, "compute_sweep_chunk", chunks)
+    job = _submit(manager, characters)
+    await chunks.wait_started(2)
+
+    manager.cancel(job.job_id)
+    assert job.status == JOB_CANCELLED
+    await asyncio.sleep(0.05)
+    # 実行中のチャンクが書き込む結果ファイルは、まだ削除しない
+    assert os.path.exists(job.path)
+    assert not job.task.done()
+
+    chunks.release.set()
+    await asyncio.gather(job.task, return_exceptions=True)
+
+    assert chunks.finished == 2
+    assert chunks.errors == []
+    assert not os.path.exists(job.path)
+    assert job.status == JOB_CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_waits_for_other_running_chunks(manager, characters, monkeypatch):
+    chunks = GatedChunks(fail_rows={0})
+    monkeypatch.setattr(sweep_jobs, "compute_sweep_chunk", chunks)
+    job = _submit(manager, characters)
+    await chunks.wait_started(2)
+    chunks.fail.set()
+    while not job.finished:
+        await asyncio.sleep(0.01)
+
+    assert job.status == JOB_FAILED
+    assert os.path.exists(job.path)
+    assert not job.task.done()
+
+    chunks.release.set()
+    await job.task
+
+    assert "chunk at row 0 failed" in job.error
+    assert chunks.errors == []
+    assert not os.path.exists(job.path)
+
+
+@pytest.mark.asyncio
+async def test_cancel_before_job_starts_removes_result_file(manager, characters):
+    job = _submit(manager, characters)
+    manager.cancel(job.job_id)
+    await asyncio.gather(job.task, return_exceptions=True)
+
+    assert job.status == JOB_CANCELLED
+    assert not os.path.exists(job.path)
@@ -0,0 +1,74 @@
+"""
+スイープ軸の範囲指定（SweepRange）のバリデーションと、グリッドが大きすぎる場合の応答のテスト
+"""
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import SWEEP_AXIS_MAX_POINTS, SweepRange
+
+SWEEP_PATHS = ("/api/calculate-damage/sweep", "/api/sweep-jobs")
+
+
+def _sweep_body(path, enemy_attack):
+    """エンドポイントに応じたスイープのリクエストボディ"""
+    body = {
+        "def_stat": {"start": 10000, "stop": 11000, "step": 1000},
+        "enemy_attack": enemy_attack,
+        "leader_skill_multiplier": {"start": 1.5, "stop": 2.0, "step": 0.5},
+    }
+    if path == "/api/sweep-jobs":
+        return {**body, "character_ids": ["goku_ui"]}
+    return {**body, "character_id": "goku_ui"}
+
+
+def test_count_includes_stop():
+    assert SweepRange(start=0, stop=10, step=1).count() == 11
+    assert SweepRange(start=1.5, stop=2.0, step=0.1).count() == 6
+    assert SweepRange(start=5, stop=5, step=1).count() == 1
+
+
+@pytest.mark.parametrize("values", [
+    {"start": 0, "stop": 1e308, "step": 1e-308},
+    {"start": 0, "stop": 1e300, "step": 1e-10},
+    {"start": 0, "stop": SWEEP_AXIS_MAX_POINTS, "step": 1},
+    {"start": 0, "stop": float("inf"), "step": 1},
+    {"start": 0, "stop": 10, "step": float("nan")},
+    {"start": float("nan"), "stop": 10, "step": 1},
+])
+def test_rejects_unbounded_point_count(values):
+    with pytest.raises(ValidationError):
+        SweepRange(**values)
+
+
+def test_accepts_point_count_below_limit():
+    assert SweepRange(start=0, stop=SWEEP_AXIS_MAX_POINTS - 1, step=1).count() == SWEEP_AXIS_MAX_POINTS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", SWEEP_PATHS)
+@pytest.mark.parametrize("enemy_attack", [
+    {"start": 0, "stop": 1e308, "step": 1e-308},
+    {"start": 0, "stop": "Infinity", "step": 1},
+])
+async def test_extreme_range_returns_422(path, enemy_attack):
+    from main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(path, json=_sweep_body(path, enemy_attack))
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_large_grid_returns_413():
+    from main import app
+
+    path = "/api/calculate-damage/sweep"
+    enemy_attack = {"start": 0, "stop": SWEEP_AXIS_MAX_POINTS - 1, "step": 1}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(path, json=_sweep_body(path, enemy_attack))
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["code"] == "SWEEP_TOO_LARGE"
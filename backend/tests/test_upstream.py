@@ -0,0 +1,306 @@
+"""
+外部API クライアント（UpstreamClient）のリトライとサーキットブレーカーのテスト
+
+httpx.MockTransport で遅延・接続エラー・エラーステータスを注入する外部APIの代わりを用意し、
+再試行回数・待ち時間の上限・サーキットブレーカーの状態遷移を確認します。
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from app.services import upstream as upstream_module
+from app.services.upstream import UpstreamClient, UpstreamError
+
+BASE_URL = "http://upstream.test"
+
+
+class FakeClock:
+    """手動で進める時計（サーキットブレーカーの遮断時間の経過に使用）"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeUpstream:
+    """
+    応答を順に返す外部APIの代わり
+
+    応答は httpx.Response・送出する例外・(遅延秒数, httpx.Response) のいずれかで、
+    一覧を使い切った後は最後の応答を繰り返します。
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        response = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        if isinstance(response, Exception):
+            raise response
+        if isinstance(response, tuple):
+            delay, response = response
+            await asyncio.sleep(delay)
+        return response
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """再試行の待ち時間を記録し、実際には待たない"""
+    delays = []
+
+    async def record(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(upstream_module, "asyncio", SimpleNamespace(sleep=record))
+    return delays
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _client(clock, failure_threshold=100, retry_count=3, backoff_base=0.2, backoff_max=2.0):
+    """テスト用の UpstreamClient（ジッターの乱数は固定シード）"""
+    breaker = CircuitBreaker(
+        "test_api", failure_threshold=failure_threshold, recovery_timeout=30.0, clock=clock
+    )
+    return UpstreamClient(
+        BASE_URL,
+        breaker,
+        retry_count=retry_count,
+        backoff_base=backoff_base,
+        backoff_max=backoff_max,
+        rng=random.Random(0)
+    )
+
+
+def _status(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers, json={"error": status_code})
+
+
+def _ok(data=None):
+    return httpx.Response(200, json=data if data is not None else [{"id": "goku_ui"}])
+
+
+def _request_error():
+    return httpx.ConnectError("connection refused")
+
+
+async def _trip_breaker(client):
+    """外部APIの連続失敗でサーキットブレーカーを OPEN にする"""
+    fake = FakeUpstream(_status(503))
+    async with fake.client() as http_client:
+        while client.breaker.state is CircuitState.CLOSED:
+            with pytest.raises((UpstreamError, CircuitOpenError)):
+                await client.get_json(http_client, "/characters")
+    assert fake.calls == client.breaker.failure_threshold
+    assert client.breaker.state is CircuitState.OPEN
+
+
+async def _open_breaker(client, clock):
+    """連続失敗で OPEN にしてから遮断時間を経過させ、HALF_OPEN にする"""
+    await _trip_breaker(client)
+    clock.advance(client.breaker.recovery_timeout)
+    assert client.breaker.state is CircuitState.HALF_OPEN
+
+
+@pytest.mark.asyncio
+async def test_retries_retryable_status_until_attempts_are_exhausted(clock, sleeps):
+    client = _client(clock, retry_count=3)
+    fake = FakeUpstream(_status(503))
+
+    async with fake.client() as http_client:
+        with pytest.raises(UpstreamError) as excinfo:
+            await client.get_json(http_client, "/characters")
+
+    assert excinfo.value.status_code == 503
+    assert fake.calls == 4
+    assert len(sleeps) == 3
+
+
+@pytest.mark.asyncio
+async def test_recovers_after_transient_errors_and_latency(clock, sleeps):
+    client = _client(clock, retry_count=3)
+    fake = FakeUpstream(
+        _request_error(),
+        httpx.ReadTimeout("read timed out"),
+        (0.01, _status(502)),
+        (0.01, _ok()),
+    )
+
+    async with fake.client() as http_client:
+        data = await client.get_json(http_client, "/characters")
+
+    assert data == [{"id": "goku_ui"}]
+    assert fake.calls == 4
+    assert client.breaker.state is CircuitState.CLOSED
+    assert client.breaker.snapshot()["consecutive_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backoff_is_jittered_below_exponential_ceiling(clock, sleeps):
+    client = _client(clock, retry_count=6, backoff_base=0.2, backoff_max=1.0)
+    fake = FakeUpstream(_request_error())
+
+    async with fake.client() as http_client:
+        with pytest.raises(UpstreamError):
+            await client.get_json(http_client, "/characters")
+
+    assert len(sleeps) == 6
+    for attempt, delay in enumerate(sleeps):
+        assert 0 <= delay <= min(1.0, 0.2 * 2 ** attempt)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("retry_after, expected", [("0.5", 0.5), ("120", 2.0), ("0", 0.0)])
+async def test_retry_after_is_honored_up_to_backoff_max(clock, sleeps, retry_after, expected):
+    client = _client(clock, retry_count=1, backoff_max=2.0)
+    fake = FakeUpstream(_status(429, {"Retry-After": retry_after}), _ok())
+
+    async with fake.client() as http_client:
+        await client.get_json(http_client, "/characters")
+
+    assert sleeps == [expected]
+
+
+@pytest.mark.asyncio
+async def test_not_found_returns_none_without_retry(clock, sleeps):
+    client = _client(clock)
+    fake = FakeUpstream(_status(404))
+
+    async with fake.client() as http_client:
+        assert await client.get_json(http_client, "/characters/missing") is None
+
+    assert fake.calls == 1
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code", [400, 401, 403])
+async def test_client_error_is_not_retried_or_counted(clock, sleeps, status_code):
+    client = _client(clock, failure_threshold=3)
+    fake = FakeUpstream(_status(503), _status(status_code))
+
+    async with fake.client() as http_client:
+        with pytest.raises(UpstreamError) as excinfo:
+            await client.get_json(http_client, "/characters")
+
+    assert excinfo.value.status_code == status_code
+    assert fake.calls == 2
+    # 直前の 503 の失敗は残り、4xx で成功扱いにリセットされない
+    assert client.breaker.snapshot()["consecutive_failures"] == 1
+    assert client.breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_rejects_then_closes_after_successful_probe(clock, sleeps):
+    client = _client(clock, failure_threshold=2, retry_count=0)
+    await _trip_breaker(client)
+
+    # OPEN の間は外部APIを呼ばずに即座に失敗する
+    fake = FakeUpstream(_ok())
+    async with fake.client() as http_client:
+        clock.advance(client.breaker.recovery_timeout - 1)
+        with pytest.raises(CircuitOpenError):
+            await client.get_json(http_client, "/characters")
+        assert fake.calls == 0
+        assert client.breaker.snapshot()["total_rejections"] == 1
+
+        clock.advance(1)
+
+        clock.advance(client.breaker.recovery_timeout)
+        assert client.breaker.state is CircuitState.HALF_OPEN
+        assert await client.get_json(http_client, "/characters") == [{"id": "goku_ui"}]
+
+    assert fake.calls == 1
+    assert client.breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_breaker_without_retry(clock, sleeps):
+    client = _client(clock, failure_threshold=2, retry_count=3)
+    await _open_breaker(client, clock)
+    sleeps.clear()
+
+    fake = FakeUpstream(_status(503))
+    async with fake.client() as http_client:
+        with pytest.raises(CircuitOpenError):
+            await client.get_json(http_client, "/characters")
+
+    # 試行の失敗で OPEN に戻り、再試行は遮断される
+    assert fake.calls == 1
+    assert client.breaker.state is CircuitState.OPEN
+    assert client.breaker.snapshot()["open_count"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code", [400, 401, 403])
+async def test_client_error_during_half_open_does_not_close_breaker(clock, sleeps, status_code):
+    client = _client(clock, failure_threshold=2, retry_count=0)
+    await _open_breaker(client, clock)
+
+    fake = FakeUpstream(_status(status_code), _status(503))
+    async with fake.client() as http_client:
+        with pytest.raises(UpstreamError):
+            await client.get_json(http_client, "/characters")
+
+        # 回復は確認できていないため HALF_OPEN のままで、試行枠は返却されている
+        assert client.breaker.state is CircuitState.HALF_OPEN
+
+        with pytest.raises(UpstreamError):
+            await client.get_json(http_client, "/characters")
+
+    assert fake.calls == 2
+    assert client.breaker.state is CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_half_open_admits_one_probe_while_it_is_in_flight(clock, sleeps):
+    client = _client(clock, failure_threshold=2, retry_count=0)
+    await _open_breaker(client, clock)
+
+    fake = FakeUpstream((0.05, _ok()))
+    async with fake.client() as http_client:
+        probe = asyncio.create_task(client.get_json(http_client, "/characters"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(CircuitOpenError):
+            await client.get_json(http_client, "/characters")
+        await probe
+
+    assert fake.calls == 1
+    assert client.breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_slot(clock, sleeps):
+    client = _client(clock, failure_threshold=2, retry_count=0)
+    await _open_breaker(client, clock)
+
+    fake = FakeUpstream((10.0, _ok()), _ok())
+    async with fake.client() as http_client:
+        probe = asyncio.create_task(client.get_json(http_client, "/characters"))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert client.breaker.state is CircuitState.HALF_OPEN
+        assert await client.get_json(http_client, "/characters") == [{"id": "goku_ui"}]
+
+    assert client.breaker.state is CircuitState.CLOSED